@@ -1,47 +1,12 @@
 import cmd
-from typing import Dict, Literal
-
-NUM_NAMES: Dict[int, str] = {
-    # 0: 'zero',
-    1: 'one',
-    2: 'two',
-    3: 'three',
-    4: 'four',
-    5: 'five',
-    6: 'six',
-    7: 'seven',
-    8: 'eight',
-    9: 'nine',
-    10: 'ten',
-    11: 'eleven',
-    12: 'twelve',
-    13: 'thirteen',
-    14: 'fourteen',
-    15: 'fifteen',
-    16: 'sixteen',
-    17: 'seventeen',
-    18: 'eighteen',
-    19: 'nineteen',
-    20: 'twenty',
-    30: 'thirty',
-    40: 'forty',
-    50: 'fifty',
-    60: 'sixty',
-    70: 'seventy',
-    80: 'eighty',
-    90: 'ninety'
-}
-POWER_NAMES: Dict[int, str] = {
-    2: "hundred",
-    3: "thousand",
-    6: "million",
-    9: "billion",
-    12: "trillion",
-    15: "quadrillion",
-    18: "quintillion",
-    21: "hexillion",
-    24: "heptillion"
-}
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, Iterable, List, Literal, NamedTuple, Tuple
+
+from scripts.script import Rounding, SpellReport, Speller, _check_rounding, to_cents
+
+# re-exported, the vocabularies live in scripts.vocab
+from scripts.vocab import NUM_NAMES, POWER_NAMES
 
 
 def get_time_of_day() -> str:
@@ -65,32 +30,211 @@ def get_time_of_day() -> str:
 def parse_num(str_: str, /, *, separator: str = ",", decimal: str = ".") -> float | None:
     """
     Parses any number of the form:\n
-    [0-9$]+<separator>[0-9$]+....<decimal>[0-9$]+
+    [+-]$[+-]<digits><separator><digits>....<decimal><digits> or the same with the $ at the end.\n
+    The separators and "_" may appear anywhere in the integer part, the decimal separator at most once.
+    See parse_amount for the exact value.
     :param str_: the number to be parsed as string
     :param separator: the separator to use while parsing
     :param decimal: the decimal separator to use while parsing
     :returns: float if parsing is successful, None if failed
     """
-    if "$" not in str_: return None
+    if not isinstance(str_, str): raise TypeError(f"The text must be a string, got {type(str_)}")
+    fmt = _amount_format(separator, decimal)
+    # the usual shape <digits and separators><decimal><2 digits>$ is checked without the full scan
+    whole, _, ending = str_.rpartition(decimal)
+    cents = _CENTS.get(ending)
+    if cents is not None:
+        digits = whole.replace(separator, "")
+        if (digits.isdigit() or whole[:1] == "-" and digits[1:].isdigit() and "-" in fmt.signs) and digits.isascii():
+            return float(f"{digits}.{cents}")
 
-    string = str_.replace(separator, "").replace(decimal, ".").replace("$", "")
+    amount = _parse_amount(str_, fmt)
+    return None if amount is None else float(amount)
 
-    try:
-        return float(string)
-    except ValueError:
-        return None
 
+def parse_amount(text: str, /, *, separator: str = ",", decimal: str = ".") -> str | None:
+    """
+    Parses an amount of the form of parse_num exactly, without going through a float.\n
+    I.E.
+        parse_amount("-1,234.525$") -> "-1234.525"
 
-class Shell(cmd.Cmd):
-    available_sep = [',', '.', '-', '–', '_', '&', '/', ':', '|']
+    :param text: The amount to be parsed
+    :param separator: The integer separator
+    :param decimal: The decimal separator
+    :return: The amount as [-]<digits>[.<digits>], that to_cents and Speller.spell take exactly. None if parsing failed
+    """
+    if not isinstance(text, str): raise TypeError(f"The text must be a string, got {type(text)}")
+    return _parse_amount(text, _amount_format(separator, decimal))
 
-    def __init__(self):
-        super().__init__()
-        self.integer_sep = "."
-        self.decimal_sep = ","
 
-    prompt = "> "
-    intro = """
+def parse_cents(
+        text: str,
+        /,
+        *,
+        separator: str = ",",
+        decimal: str = ".",
+        rounding: Rounding = "half_even"
+) -> int | None:
+    """
+    Parses an amount of the form of parse_num into exact integer cents, see parse_amount
+
+    :param text: The amount to be parsed
+    :param separator: The integer separator
+    :param decimal: The decimal separator
+    :param rounding: What to do with more than 2 decimals, see to_cents
+    :return: The amount in cents, None if parsing failed
+    """
+    if not isinstance(text, str): raise TypeError(f"The text must be a string, got {type(text)}")
+    _check_rounding(rounding)
+    return _parse_cents(text, rounding, _amount_format(separator, decimal))
+
+
+def parse_many(
+        texts: Iterable[str],
+        /,
+        *,
+        separator: str = ",",
+        decimal: str = ".",
+        rounding: Rounding = "half_even"
+) -> List[int | None]:
+    """
+    Parses a batch of amounts into exact integer cents, the same as parse_cents on every text.
+    The parser is set up once for the whole batch, the texts can be any iterable, i.e. the lines of a file
+
+    :param texts: The amounts to be parsed
+    :param separator: The integer separator
+    :param decimal: The decimal separator
+    :param rounding: What to do with more than 2 decimals, see to_cents
+    :return: List of the amounts in cents, None for the texts that could not be parsed
+    """
+    if not hasattr(texts, "__iter__"): raise TypeError("The texts must have the __iter__ magic method defined.")
+    _check_rounding(rounding)
+
+    fmt = _amount_format(separator, decimal)
+    return [_parse_cents(text, rounding, fmt) for text in texts]
+
+
+class Separators(NamedTuple):
+    """
+    The separators of the written amounts. Immutable, so a pair can be shared between threads and replaced as a whole
+    """
+    integer: str = ","
+    """Separates the groups of the integer part, i.e. 1,234"""
+    decimal: str = "."
+    """Separates the integer part from the decimals"""
+
+
+# the ending <2 digits>$ of the usual shape of an amount: its 2 decimals, a dict lookup checks the ending in one go
+_CENTS: Dict[str, str] = {f"{cents:02}$": f"{cents:02}" for cents in range(100)}
+
+
+class _AmountFormat(NamedTuple):
+    separator: str
+    decimal: str
+    grouping: str
+    """The characters dropped from the integer part: the separator and "_" (unless it is the decimal separator)"""
+    signs: str
+    """The sign characters, "+" and "-" unless one of them is a separator"""
+
+
+@lru_cache(maxsize=128)
+def _amount_format(separator: str, decimal: str) -> _AmountFormat:
+    """
+    Checks the separators once per pair of them
+    """
+    for name, sep in (("separator", separator), ("decimal", decimal)):
+        if not isinstance(sep, str): raise TypeError(f"The {name} must be a string, got {type(sep)}")
+        if len(sep) != 1 or sep in "0123456789$" or sep.isspace():
+            raise ValueError(f"The {name} must be a single character other than a digit, $ or a space, got {sep!r}")
+    if separator == decimal: raise ValueError("The integer and the decimal separators must differ")
+
+    # why: a separator may be "-" or "_", it is then a separator and not a sign or a digit grouping
+    grouping = separator + ("_" if decimal != "_" else "")
+    signs = "".join(sign for sign in "+-" if sign not in (separator, decimal))
+    return _AmountFormat(separator, decimal, grouping, signs)
+
+
+def _parse_amount(text: str, fmt: _AmountFormat) -> str | None:
+    """
+    See parse_amount
+    """
+    parts = _split_amount(text, fmt)
+    if parts is None: return None
+    negative, whole, decimal = parts
+
+    amount = f"{whole or "0"}.{decimal}" if decimal else whole
+    return "-" + amount if negative else amount
+
+
+def _parse_cents(text: str, rounding: Rounding, fmt: _AmountFormat) -> int | None:
+    """
+    See parse_cents
+    """
+    # the usual shape <digits and separators><decimal><2 digits>$ is checked without the full scan
+    whole, _, ending = text.rpartition(fmt.decimal)
+    cents = _CENTS.get(ending)
+    if cents is not None:
+        digits = whole.replace(fmt.separator, "")
+        if (digits.isdigit() or whole[:1] == "-" and digits[1:].isdigit() and "-" in fmt.signs) and digits.isascii() \
+                and len(digits) < 638:
+            return int(digits + cents)
+
+    parts = _split_amount(text, fmt)
+    if parts is None: return None
+    negative, whole, decimal = parts
+
+    # a single int() of all the digits (640 is the lowest digit limit int() can be set to)
+    if len(decimal) <= 2 and len(whole) < 638:
+        cents = int(whole + decimal.ljust(2, "0"))
+        return -cents if negative else cents
+    return to_cents(f"{"-" if negative else ""}{whole or "0"}.{decimal or "0"}", rounding=rounding)
+
+
+def _split_amount(text: str, fmt: _AmountFormat) -> Tuple[bool, str, str] | None:
+    """
+    Scans an amount [+-]$[+-]<number> or [+-]<number>$, where the $ may be preceded by separators.
+    Every step is a single str method, that runs in C, instead of a regex or a loop over the characters.
+    :return: Tuple of whether the amount is negative, the digits of the integer part and of the decimal part.
+    None if the text is not an amount
+    """
+    head, dollar, tail = text.strip().partition("$")
+    if not dollar or "$" in tail: return None
+
+    signs = fmt.signs
+    signed = negative = False
+    if tail:
+        # $ first, before it only a sign and separators
+        if head:
+            if head[0] in signs:
+                signed, negative = True, head[0] == "-"
+                head = head[1:]
+            if head.strip(fmt.grouping): return None
+        number = tail
+    else:
+        number = head
+
+    if number and number[0] in signs:
+        if signed: return None
+        negative = number[0] == "-"
+        number = number[1:]
+
+    whole, _, decimal = number.partition(fmt.decimal)
+
+    if not (whole.isdigit() and whole.isascii()):
+        for char in fmt.grouping:
+            whole = whole.replace(char, "")
+        if whole and not (whole.isdigit() and whole.isascii()): return None
+
+    if decimal and not (decimal.isdigit() and decimal.isascii()):
+        if fmt.decimal != "_":
+            decimal = decimal.replace("_", "")
+        if decimal and not (decimal.isdigit() and decimal.isascii()): return None
+
+    if not (whole or decimal): return None
+    return negative, whole, decimal
+
+
+_INTRO: str = """
     Good {time}!
     This script spells every money amount between -10^27 and 10^27 (ends excluded).
 
@@ -119,34 +263,82 @@ class Shell(cmd.Cmd):
 
         -\033[92m exit\033[0m: 
             Exits the script
-    """.format(time=get_time_of_day(), sep_list=" ".join(available_sep))
+    """
+
+
+@lru_cache(maxsize=1)
+def shell_speller() -> Speller:
+    """
+    :return: The speller of the shell and of the one-shot commands, compiled on the first call and shared afterward
+    """
+    return Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="warn")
+
+
+class Shell(cmd.Cmd):
+    available_sep = [',', '.', '-', '–', '_', '&', '/', ':', '|']
+
+    def __init__(self):
+        super().__init__()
+        self._intro: str | None = None
+        self.separators: Separators = Separators(integer=".", decimal=",")
+
+    prompt = "> "
+
+    @property
+    def intro(self) -> str:
+        """
+        The banner, built on the first use, so that making a Shell (or importing the module) does not build it
+        """
+        if self._intro is None:
+            self._intro = _INTRO.format(time=get_time_of_day(), sep_list=" ".join(self.available_sep))
+        return self._intro
+
+    @intro.setter
+    def intro(self, intro: str) -> None:
+        # cmd.Cmd.cmdloop(intro) assigns the intro
+        self._intro = intro
+
+    # why: the separators are replaced as a whole, so a command never sees a half switched pair
+    @property
+    def integer_sep(self) -> str:
+        return self.separators.integer
+
+    @integer_sep.setter
+    def integer_sep(self, sep: str) -> None:
+        self.separators = self.separators._replace(integer=sep)
+
+    @property
+    def decimal_sep(self) -> str:
+        return self.separators.decimal
+
+    @decimal_sep.setter
+    def decimal_sep(self, sep: str) -> None:
+        self.separators = self.separators._replace(decimal=sep)
 
     def _change_separator(self, new_sep: str, _tp: Literal["decimal", "integer"]) -> str:
         if _tp not in ["decimal", "integer"]:
             raise ValueError("The type (tp) must be either 'integer' or 'decimal'."
                              f"Given '{_tp}'.")
 
-        tp = _tp + "_sep"
+        separators = self.separators
+        current = getattr(separators, _tp)
 
         if not new_sep:
-            return f"Current {_tp} separator: '{self.__getattribute__(tp)}'"
+            return f"Current {_tp} separator: '{current}'"
 
         if new_sep not in self.available_sep:
             return (f"Invalid {_tp} separator '{new_sep}'.\n"
                     f"The available {_tp} separators are: {" ".join(self.available_sep)}")
 
-        disjunct_type = {"integer_sep": "decimal_sep", "decimal_sep": "integer_sep"}[tp]
-        if new_sep == self.__getattribute__(disjunct_type):
-            # Set the disjunct type to the current separator
-            self.__setattr__(disjunct_type, self.__getattribute__(tp))
-
-            # set the current separator to the new separator
-            self.__setattr__(tp, new_sep)
+        disjunct_type = {"integer": "decimal", "decimal": "integer"}[_tp]
+        if new_sep == getattr(separators, disjunct_type):
+            # the disjunct type gets the current separator
+            self.separators = separators._replace(**{_tp: new_sep, disjunct_type: current})
             return ("Switched the separators around.\n"
                     f"New decimal separator: {self.decimal_sep}\n"
                     f"New integer separator: {self.integer_sep}")
 
-        self.__setattr__(tp, new_sep)
+        self.separators = separators._replace(**{_tp: new_sep})
         return f"Changed the {_tp} separator to: {new_sep}"
 
     def do_separator(self, sep: str):
@@ -168,14 +360,24 @@ class Shell(cmd.Cmd):
         Money amounts with more than 2 decimals will be rounded to 2 decimals
         To simplify the input, the usage of "_" and the defined separator is permitted to separate the number.
         """
-        from scripts.script import currency_speller
-
-        num: float | None = parse_num(_num, separator=self.integer_sep, decimal=self.decimal_sep)
+        separators = self.separators
+        amount: str | None = parse_amount(_num, separator=separators.integer, decimal=separators.decimal)
+        # the amount is spelled as a Decimal, so that i.e. 2,675$ is not rounded by its float value
+        num: Decimal | None = None if amount is None else Decimal(amount)
         if not num:
             print("Invalid input.")
             return
 
-        print("-> " + currency_speller(num, num_names=NUM_NAMES, power_names=POWER_NAMES))
+        report = SpellReport()
+        try:
+            spelled = shell_speller().spell(num, report=report)
+        except ValueError:
+            # out of the range of the speller
+            print("Invalid input.")
+            return
+        for warning in report.warnings:
+            print(warning)
+        print("-> " + spelled)
 
     def do_exit(self, *args):
         """
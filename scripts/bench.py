@@ -0,0 +1,231 @@
+"""
+Benchmarks of the speller and the parser hot paths.
+
+    python -m scripts.bench --save baseline.json
+    python -m scripts.bench --baseline baseline.json
+
+Every case is timed call by call, the results are the throughput and the p50/p99 latency.
+With --baseline the run fails (exit code 1) if a case got slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from scripts.app import NUM_NAMES, POWER_NAMES, parse_cents, parse_num
+from scripts.currency import CURRENCIES, spell_mixed
+from scripts.script import IncrementalSpeller, Speller, assemble, batched, break_down, currency_speller, split_decimal
+
+# name: generator of the inputs, every distribution is seeded, so the runs are comparable
+DISTRIBUTIONS: Dict[str, Callable[[random.Random], int | float]] = {
+    "small_prices": lambda rng: rng.randint(1, 99_999) / 100,
+    "payroll": lambda rng: rng.randint(100_000, 50_000_000) / 100,
+    "near_limit": lambda rng: rng.randint(10 ** 26, 10 ** 27 - 1),
+    "with_cents": lambda rng: rng.randint(-10 ** 12, 10 ** 12) / 100,
+}
+
+# name: (the first amount, the step), a run of amounts that differ only in the low digits, i.e. a running balance
+SEQUENCES: Dict[str, Callable[[random.Random], Tuple[int | float, int | float]]] = {
+    "monotone_payroll": lambda rng: (rng.randint(100_000, 50_000_000) / 100, 0.37),
+    "monotone_large": lambda rng: (rng.randint(10 ** 23, 10 ** 24), 1),
+}
+
+
+def _cases(n: int, seed: int) -> List[Tuple[str, Callable[[Any], Any], List[Any]]]:
+    """
+    :return: List of (case name, function of one argument, the inputs)
+    """
+    speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+    incremental = IncrementalSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+    cases = []
+
+    for dist_name, dist in DISTRIBUTIONS.items():
+        rng = random.Random(f"{seed}-{dist_name}")
+        amounts = [dist(rng) for _ in range(n)]
+        # split_decimal goes through str(float), it can not split the floats written in the scientific notation
+        splittable = all(abs(x) < 10 ** 15 for x in amounts)
+        integers = [abs(int(x)) for x in amounts]
+        texts = [f"{x:,.2f}$".replace(",", " ").replace(".", ",").replace(" ", ".") for x in amounts]
+
+        cases += [
+            (f"currency_speller/{dist_name}",
+             lambda x: currency_speller(x, power_names=POWER_NAMES, num_names=NUM_NAMES), amounts),
+            (f"Speller.spell/{dist_name}", speller.spell, amounts),
+            (f"break_down/{dist_name}", lambda x: break_down(x, 3), integers),
+            (f"batched/{dist_name}", lambda x: list(batched(str(x), 3, backwards=True)), integers),
+            (f"assemble/{dist_name}", assemble, [break_down(x, 3) for x in integers]),
+            (f"parse_num/{dist_name}", lambda x: parse_num(x, separator=".", decimal=","), texts),
+            (f"parse_cents/{dist_name}", lambda x: parse_cents(x, separator=".", decimal=","), texts),
+        ]
+        if splittable:
+            cases.append((f"split_decimal/{dist_name}", split_decimal, amounts))
+
+    for sequence_name, sequence in SEQUENCES.items():
+        first, step = sequence(random.Random(f"{seed}-{sequence_name}"))
+        amounts = [round(first + index * step, 2) for index in range(n)]
+        cases += [
+            (f"Speller.spell/{sequence_name}", speller.spell, amounts),
+            (f"IncrementalSpeller.spell/{sequence_name}", incremental.spell, amounts),
+        ]
+
+    # payroll amounts in all the currencies, spelled in batches of 100, every batch makes its spellers of the currencies
+    rng = random.Random(f"{seed}-mixed_currencies")
+    codes = list(CURRENCIES)
+    pairs = [(DISTRIBUTIONS["payroll"](rng), rng.choice(codes)) for _ in range(n)]
+    cases.append(("spell_mixed/mixed_currencies", lambda batch: spell_mixed(batch, speller=speller),
+                  list(batched(pairs, 100))))
+
+    return cases
+
+
+def _percentile(sorted_values: Sequence[int], q: float) -> int:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run(n: int = 10_000, *, seed: int = 0, repeat: int = 3) -> Dict[str, Dict[str, float]]:
+    """
+    Runs all the benchmark cases
+
+    :param n: The number of inputs per case
+    :param seed: The seed of the inputs
+    :param repeat: How many times each case is run, the fastest run counts
+    :return: {case name : {"ops_per_sec": float, "p50_ns": int, "p99_ns": int}}
+    """
+    if not isinstance(n, int): raise TypeError(f"n must be a positive integer, got {type(n)}")
+    if n < 1: raise ValueError(f"n must be at least one, got {n}")
+    if not isinstance(repeat, int): raise TypeError(f"repeat must be a positive integer, got {type(repeat)}")
+    if repeat < 1: raise ValueError(f"repeat must be at least one, got {repeat}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, fn, inputs in _cases(n, seed):
+        best: List[int] | None = None
+        for _ in range(repeat):
+            latencies = []
+            for value in inputs:
+                start = perf_counter_ns()
+                fn(value)
+                latencies.append(perf_counter_ns() - start)
+            if best is None or sum(latencies) < sum(best):
+                best = latencies
+
+        best.sort()
+        results[name] = {
+            "ops_per_sec": len(best) / (sum(best) / 1e9 or 1e-9),
+            "p50_ns": _percentile(best, 0.50),
+            "p99_ns": _percentile(best, 0.99),
+        }
+    return results
+
+
+def thread_scaling(n: int = 100_000, *, threads: int = 4, seed: int = 0) -> Dict[int, float]:
+    """
+    Spells the same amounts with one shared speller from 1, 2, 4, ... up to threads threads at once.
+    The throughput grows with the threads only on the free-threaded builds of Python, with the GIL it stays flat
+
+    :param n: The number of amounts, split evenly between the threads
+    :param threads: The max number of threads
+    :param seed: The seed of the amounts
+    :return: {number of threads : amounts per second}
+    """
+    if not isinstance(threads, int): raise TypeError(f"threads must be a positive integer, got {type(threads)}")
+    if threads < 1: raise ValueError(f"threads must be at least one, got {threads}")
+
+    speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+    rng = random.Random(f"{seed}-threads")
+    amounts = [DISTRIBUTIONS["payroll"](rng) for _ in range(n)]
+
+    counts = [1 << power for power in range(threads.bit_length()) if 1 << power < threads] + [threads]
+    results: Dict[int, float] = {}
+    for count in counts:
+        shares = [amounts[index::count] for index in range(count)]
+        # all the threads start spelling at the same time, the clock runs from the start to the last one done
+        barrier = threading.Barrier(count + 1)
+
+        def _spell(share: List[float]) -> None:
+            barrier.wait()
+            speller.spell_many(share)
+
+        workers = [threading.Thread(target=_spell, args=(share,)) for share in shares]
+        for worker in workers:
+            worker.start()
+        barrier.wait()
+        start = perf_counter_ns()
+        for worker in workers:
+            worker.join()
+        results[count] = n / ((perf_counter_ns() - start) / 1e9 or 1e-9)
+    return results
+
+
+def compare(
+        results: Dict[str, Dict[str, float]],
+        baseline: Dict[str, Dict[str, float]],
+        *,
+        tolerance: float = 0.1
+) -> List[str]:
+    """
+    Compares the throughput of a run against a baseline run
+
+    :param results: The results of run
+    :param baseline: The results of an earlier run
+    :param tolerance: The allowed relative drop of the throughput, i.e. 0.1 for 10%
+    :return: A message for every case that regressed, empty if none did
+    """
+    if not 0 <= tolerance < 1: raise ValueError(f"The tolerance must be within 0 <= x < 1, got {tolerance}")
+
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline: continue
+        was, now = baseline[name]["ops_per_sec"], result["ops_per_sec"]
+        if now < was * (1 - tolerance):
+            regressions.append(f"{name}: {now:,.0f} ops/s, baseline {was:,.0f} ops/s ({now / was - 1:+.1%})")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-n", type=int, default=10_000, help="inputs per case (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the inputs (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the fastest counts (default: %(default)s)")
+    parser.add_argument("--save", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against the results saved by --save")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed relative throughput drop against the baseline (default: %(default)s)")
+    parser.add_argument("--threads", type=int, metavar="N",
+                        help="also spell from up to N threads sharing one speller and report how the throughput scales")
+    args = parser.parse_args(argv)
+
+    results = run(args.n, seed=args.seed, repeat=args.repeat)
+
+    print(f"{'case':<40}{'ops/s':>14}{'p50 ns':>10}{'p99 ns':>10}")
+    for name, result in results.items():
+        print(f"{name:<40}{result['ops_per_sec']:>14,.0f}{result['p50_ns']:>10}{result['p99_ns']:>10}")
+
+    if args.threads:
+        gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+        print(f"\n{'threads' + (' (GIL)' if gil else ' (free-threaded)'):<40}{'ops/s':>14}{'speedup':>10}")
+        scaling = thread_scaling(args.n, threads=args.threads, seed=args.seed)
+        for count, ops in scaling.items():
+            print(f"{count:<40}{ops:>14,.0f}{ops / scaling[1]:>10.2f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"python": platform.python_version(), "n": args.n, "seed": args.seed, "results": results},
+                      file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, tolerance=args.tolerance)
+        for message in regressions:
+            print("REGRESSION " + message, file=sys.stderr)
+        if regressions: return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,314 @@
+import argparse
+import io
+import os
+import sys
+from typing import IO, Iterable, List, Tuple
+
+from scripts.app import NUM_NAMES, POWER_NAMES, Shell, parse_amount, shell_speller
+from scripts.instrument import InstrumentedSpeller, JsonSink, Recorder
+from scripts.parallel import CHUNK_SIZE, imap_ordered, make_pool, worker_speller
+from scripts.script import SpellReport, Speller, batched
+
+# how many spelled lines are collected before they are written out at once
+WRITE_BATCH: int = 4096
+
+
+def stream(
+        infile: Iterable[str],
+        outfile: IO[str],
+        *,
+        speller: Speller | InstrumentedSpeller,
+        separator: str = ".",
+        decimal: str = ",",
+        report: SpellReport | None = None,
+        recorder: Recorder | None = None
+) -> int:
+    """
+    Spells every line of the infile into a line of the outfile, in the same order.\n
+    The lines are read one by one and written in batches, so the memory use does not depend on the size of the input.
+    Lines that can not be parsed (see parse_amount) or spelled (i.e. out of the range of the speller)
+    are written as empty lines, to keep the lines of both files aligned.
+    The amounts are spelled exactly as written, without going through a float.
+
+    :param infile: The lines with the amounts, i.e. an open file or sys.stdin
+    :param outfile: Where to write the spelled amounts
+    :param speller: The speller to spell the amounts with
+    :param separator: The integer separator of the amounts
+    :param decimal: The decimal separator of the amounts
+    :param report: Where to count the rounded amounts, see SpellReport
+    :param recorder: Where to record the parsing of the lines as the "parse" stage, see scripts.instrument.
+    Pass an InstrumentedSpeller with the same recorder to record the spelling as well
+    :return: The number of lines that could not be parsed or spelled
+    """
+    invalid = 0
+    batch: List[str] = []
+    parse = parse_amount if recorder is None else recorder.timed("parse", parse_amount)
+    spell = speller.spell
+
+    for line in infile:
+        amount: str | None = parse(line, separator=separator, decimal=decimal)
+        spelled: str | None = None
+        if amount is not None:
+            try:
+                spelled = spell(amount, report=report)
+            except ValueError:
+                # the amount parsed, but the speller can not spell it, i.e. 10^27 and above
+                pass
+        if spelled is None:
+            invalid += 1
+            batch.append("\n")
+        else:
+            batch.append(spelled + "\n")
+
+        if len(batch) >= WRITE_BATCH:
+            outfile.writelines(batch)
+            batch.clear()
+
+    outfile.writelines(batch)
+    return invalid
+
+
+def _spell_lines(task: Tuple[Tuple[str, ...], str, str]) -> Tuple[str, int, int]:
+    """
+    The task of a worker of stream_parallel
+    :return: Tuple of the spelled lines joined together, the number of lines that could not be parsed
+    and the number of rounded amounts
+    """
+    lines, separator, decimal = task
+    out = io.StringIO()
+    report = SpellReport()
+    invalid = stream(lines, out, speller=worker_speller(), separator=separator, decimal=decimal, report=report)
+    return out.getvalue(), invalid, report.rounded
+
+
+def stream_parallel(
+        infile: Iterable[str],
+        outfile: IO[str],
+        *,
+        workers: int,
+        separator: str = ".",
+        decimal: str = ",",
+        chunk_size: int = CHUNK_SIZE,
+        report: SpellReport | None = None
+) -> int:
+    """
+    Same as stream, but the lines are parsed and spelled in chunks by a pool of worker processes.
+    The output keeps the order of the input and only a few chunks per worker are held in memory at a time.
+
+    :param infile: The lines with the amounts, i.e. an open file or sys.stdin
+    :param outfile: Where to write the spelled amounts
+    :param workers: The number of worker processes
+    :param separator: The integer separator of the amounts
+    :param decimal: The decimal separator of the amounts
+    :param chunk_size: The number of lines sent to a worker at once
+    :param report: Where to count the rounded amounts, see SpellReport
+    :return: The number of lines that could not be parsed or spelled
+    """
+    invalid = 0
+    tasks = ((lines, separator, decimal) for lines in batched(iter(infile), chunk_size))
+
+    with make_pool(workers, power_names=POWER_NAMES, num_names=NUM_NAMES) as pool:
+        for text, chunk_invalid, chunk_rounded in imap_ordered(pool, _spell_lines, tasks, window=2 * workers):
+            outfile.write(text)
+            invalid += chunk_invalid
+            if report is not None:
+                report.rounded += chunk_rounded
+
+    return invalid
+
+
+def spell_once(text: str, *, separator: str = ".", decimal: str = ",") -> int:
+    """
+    Spells a single amount to stdout, the one-shot form of the spell command of the shell.
+    Warnings about the rounding go to stderr.
+
+    :param text: The amount, as typed in the shell
+    :param separator: The integer separator of the amount
+    :param decimal: The decimal separator of the amount
+    :return: The exit code, 1 if the amount could not be parsed or spelled
+    """
+    amount: str | None = parse_amount(text, separator=separator, decimal=decimal)
+    if amount is None:
+        print("Invalid input.", file=sys.stderr)
+        return 1
+
+    report = SpellReport()
+    try:
+        spelled = shell_speller().spell(amount, report=report)
+    except ValueError:
+        # out of the range of the speller
+        print("Invalid input.", file=sys.stderr)
+        return 1
+    for warning in report.warnings:
+        print(warning, file=sys.stderr)
+    print(spelled)
+    return 0
+
+
+def _convert(args: argparse.Namespace) -> int:
+    """
+    The convert command, see scripts.jobs.convert_fixed
+    """
+    # why: imported here, so the other modes do not load mmap
+    from scripts.jobs import convert_fixed
+
+    speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+    outfile = sys.stdout.buffer if args.output == "-" else None
+    report = SpellReport()
+    try:
+        # a missing or unreadable input fails before the output is created or truncated
+        with open(args.input, "rb"):
+            pass
+        if outfile is None:
+            outfile = open(args.output, "wb", buffering=1 << 20)
+        invalid = convert_fixed(args.input, outfile, speller=speller, start=args.start, width=args.width,
+                                separator=args.separator, decimal=args.decimal, report=report)
+        outfile.flush()
+    except (OSError, ValueError) as error:
+        print(f"run convert: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if outfile not in (None, sys.stdout.buffer): outfile.close()
+
+    if invalid:
+        print(f"{invalid} line(s) could not be parsed or spelled and were left empty", file=sys.stderr)
+    if report.rounded:
+        print(f"{report.rounded} amount(s) had more than 2 decimals and were rounded", file=sys.stderr)
+    return 0
+
+
+def _convert_csv(args: argparse.Namespace) -> int:
+    """
+    The csv command, see scripts.jobs.convert_csv
+    """
+    from scripts.jobs import convert_csv
+
+    speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+    infile = sys.stdin if args.input == "-" else None
+    outfile = sys.stdout if args.output == "-" else None
+    report = SpellReport()
+    try:
+        if infile is None:
+            infile = open(args.input, encoding="utf-8", newline="", buffering=1 << 20)
+        if outfile is None:
+            outfile = open(args.output, "w", encoding="utf-8", newline="", buffering=1 << 20)
+        stats = convert_csv(infile, outfile, speller=speller, column=args.column, spelled_column=args.spelled_column,
+                            separator=args.separator, decimal=args.decimal, delimiter=args.delimiter,
+                            chunk_rows=args.chunk_rows, report=report)
+        outfile.flush()
+    except (OSError, ValueError) as error:
+        print(f"run csv: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if infile not in (None, sys.stdin): infile.close()
+        if outfile not in (None, sys.stdout): outfile.close()
+
+    print(f"{stats.rows} row(s) in {stats.seconds:.2f} s ({stats.rows_per_sec:,.0f} rows/s)", file=sys.stderr)
+    if stats.invalid:
+        print(f"{stats.invalid} row(s) could not be parsed or spelled and were left without the spelled amount", file=sys.stderr)
+    if report.rounded:
+        print(f"{report.rounded} amount(s) had more than 2 decimals and were rounded", file=sys.stderr)
+    return 0
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    Entry point of the `run` script.\n
+    Without arguments starts the interactive shell, with --stream spells the amounts from stdin (or --input) line by line,
+    on --jobs worker processes. `run spell <amount>` spells a single amount and exits,
+    `run convert <file>` spells a fixed-layout file and `run csv <file>` adds a spelled column to a CSV file,
+    see scripts.jobs.
+    :return: The exit code
+    """
+    parser = argparse.ArgumentParser(prog="run", description="Spells money amounts")
+    parser.add_argument("--no-banner", action="store_true", help="start the interactive shell without the banner")
+    parser.add_argument("--stream", action="store_true",
+                        help="spell one amount per line from the input to the output, without the interactive shell")
+    parser.add_argument("-i", "--input", default="-", help="input file of the --stream mode, '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file of the --stream mode, '-' for stdout")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes of the --stream mode, 0 for all the CPU cores (default: 1)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="append the time spent per stage of the --stream mode to PATH as a JSON line, "
+                             "'-' for stderr")
+    parser.add_argument("--separator", default=".", choices=Shell.available_sep,
+                        help="the integer separator of the amounts (default: %(default)s)")
+    parser.add_argument("--decimal", default=",", choices=Shell.available_sep,
+                        help="the decimal separator of the amounts (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    spell = commands.add_parser("spell", help="spell a single amount and exit, i.e. run spell 1.234,52$")
+    spell.add_argument("amount", help="the amount, written the same way as in the shell")
+    convert = commands.add_parser("convert", help="spell the amount field of every line of a fixed-layout file, "
+                                                  "through a memory map")
+    convert.add_argument("input", help="the fixed-layout file")
+    convert.add_argument("-o", "--output", default="-", help="output file, '-' for stdout (default: %(default)s)")
+    convert.add_argument("--start", type=int, default=0,
+                         help="byte column where the amount field starts (default: %(default)s)")
+    convert.add_argument("--width", type=int, help="width of the amount field in bytes (default: the rest of the line)")
+    table = commands.add_parser("csv", help="add a column with the spelled amounts to a CSV file")
+    table.add_argument("input", help="the CSV file with a header row, '-' for stdin")
+    table.add_argument("-o", "--output", default="-", help="output CSV file, '-' for stdout (default: %(default)s)")
+    table.add_argument("--column", required=True, help="name of the column of the amounts")
+    table.add_argument("--spelled-column", default="spelled", help="name of the added column (default: %(default)s)")
+    table.add_argument("--delimiter", default=",", help="delimiter of the CSV fields (default: %(default)s)")
+    table.add_argument("--chunk-rows", type=int, default=8192,
+                       help="rows read, spelled and written at once (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.separator == args.decimal:
+        parser.error("the integer and the decimal separators must differ")
+
+    if args.command == "spell":
+        return spell_once(args.amount, separator=args.separator, decimal=args.decimal)
+    if args.command == "convert":
+        return _convert(args)
+    if args.command == "csv":
+        return _convert_csv(args)
+
+    if not args.stream:
+        Shell().cmdloop(intro="" if args.no_banner else None)
+        return 0
+
+    if args.jobs < 0:
+        parser.error("the number of jobs must not be negative")
+    jobs: int = args.jobs or os.cpu_count() or 1
+    if args.profile and jobs > 1:
+        parser.error("--profile records the stages of a single process, it can not be used with --jobs")
+
+    speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+    infile = sys.stdin if args.input == "-" else None
+    outfile = sys.stdout if args.output == "-" else None
+
+    recorder: Recorder | None = None
+    if args.profile:
+        recorder = Recorder(JsonSink(sys.stderr if args.profile == "-" else args.profile))
+        speller = InstrumentedSpeller(speller, recorder)
+
+    report = SpellReport()
+    try:
+        if infile is None:
+            infile = open(args.input, encoding="utf-8", buffering=1 << 20)
+        if outfile is None:
+            outfile = open(args.output, "w", encoding="utf-8", buffering=1 << 20)
+        if jobs > 1:
+            invalid = stream_parallel(infile, outfile, workers=jobs, separator=args.separator, decimal=args.decimal,
+                                      report=report)
+        else:
+            invalid = stream(infile, outfile, speller=speller, separator=args.separator, decimal=args.decimal,
+                             report=report, recorder=recorder)
+        outfile.flush()
+    except OSError as error:
+        print(f"run: {error}", file=sys.stderr)
+        return 1
+    finally:
+        if infile not in (None, sys.stdin): infile.close()
+        if outfile not in (None, sys.stdout): outfile.close()
+
+    if recorder is not None:
+        recorder.count("invalid", invalid)
+        recorder.flush()
+    if invalid:
+        print(f"{invalid} line(s) could not be parsed or spelled and were left empty", file=sys.stderr)
+    if report.rounded:
+        print(f"{report.rounded} amount(s) had more than 2 decimals and were rounded", file=sys.stderr)
+    return 0
@@ -0,0 +1,205 @@
+"""
+Compact storage of many spelled amounts, for keeping hundreds of millions of them in memory at once.
+
+A spelled amount is stored as token IDs (2 or 4 bytes per word) into the vocabulary of the speller,
+instead of as a string of 60-120 bytes plus the overhead of a Python object. The strings are built on demand.
+
+    store = SpelledStore(speller)
+    store.extend(amounts)
+    store[0] -> "One thousand two hundred thirty-four dollars and fifty-two cents"
+    store.to_bytes() -> b"One thousand ...\\nTwo dollars\\n..."
+"""
+from array import array
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Tuple, overload
+
+from scripts.illions import power_name
+from scripts.script import SpellReport, Speller, _int_to_digits, _is_long_scale
+
+
+class SpelledStore:
+    """
+    An append-only list of spelled amounts, stored as token IDs, the strings are the same as of speller.spell.\n
+    The vocabulary is made of the words of the compiled tables of the speller: the spelled 3-digit groups, split
+    into words, the power names and the words around them ("minus", "dollars", "and", "cents", ...).
+    The amounts are spelled straight into the IDs, without making their strings.
+    The IDs of all the amounts are kept in a single array, with the offset of every amount in a second one,
+    so a stored amount costs 2 bytes per word (4 if the speller is unbounded) plus 8 bytes.
+    """
+    __slots__ = ("speller", "words", "_index", "_triplet_ids", "_power_ids", "_fixed_ids", "_ids", "_offsets")
+
+    def __init__(self, speller: Speller):
+        """
+        :param speller: The speller whose vocabulary and settings are used
+        """
+        if not isinstance(speller, Speller): raise TypeError(f"The speller must be a Speller, got {type(speller)}")
+
+        self.speller: Speller = speller
+        self.words: List[str] = []
+        """The vocabulary, the word of every token ID"""
+        self._index: Dict[str, int] = {}
+
+        # split with " " and not with the whitespace, so that joining the words with " " gives back the exact text
+        self._triplet_ids: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(self._token(word) for word in words.split(" ")) if words else () for words in speller.triplets
+        )
+        self._power_ids: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(self._token(word) for word in power[1:].split(" ")) if power else () for power in speller.powers
+        )
+        # the words put around the numbers by the speller, see _spell_cents
+        currency = speller.currency
+        self._fixed_ids: Tuple[int, ...] = tuple(
+            self._token(word) for word in ("minus", *currency.major, "and", *currency.minor)
+        )
+
+        # why: the illions of an unbounded speller are added on demand, there can be more than fit into 2 bytes
+        self._ids: array = array("I" if speller.unbounded else "H")
+        self._offsets: array = array("Q", [0])
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} amounts, {len(self.words)} words, {self.nbytes} bytes)"
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | List[str]:
+        """
+        :return: The spelled amount (or the list of the amounts of a slice), built from its tokens
+        """
+        if isinstance(index, slice):
+            return [self._text(position) for position in range(*index.indices(len(self)))]
+        if not isinstance(index, int): raise TypeError(f"The index must be an integer or a slice, got {type(index)}")
+
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count: raise IndexError(f"The index {index} is out of range of {count} amounts")
+        return self._text(index)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(len(self)):
+            yield self._text(position)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory taken by the stored tokens and offsets, without the vocabulary"""
+        return len(self._ids) * self._ids.itemsize + len(self._offsets) * self._offsets.itemsize
+
+    def append(self, number: int | float | Decimal | str, /, *, report: SpellReport | None = None) -> None:
+        """
+        Spells a number as a dollar amount into the store, see Speller.spell
+
+        :param number: The amount to be spelled
+        :param report: Where to count the rounded amounts, see SpellReport
+        """
+        negative, cents, _ = self.speller._convert(number, report)
+        self._encode(cents, negative)
+
+    def append_cents(self, cents: int, /) -> None:
+        """
+        Spells an integer number of cents as a dollar amount into the store, see Speller.spell_cents
+        """
+        if not isinstance(cents, int): raise TypeError(f"The cents must be an integer, got {type(cents)}")
+        self._encode(abs(cents), cents < 0)
+
+    def extend(
+            self,
+            amounts: Iterable[int | float | Decimal | str],
+            /,
+            *,
+            report: SpellReport | None = None
+    ) -> None:
+        """
+        Spells a batch of numbers as dollar amounts into the store, in their order
+
+        :param amounts: The amounts to be spelled
+        :param report: Where to count the rounded amounts of the batch, see SpellReport
+        """
+        if not hasattr(amounts, "__iter__"): raise TypeError("The amounts must have the __iter__ magic method defined.")
+        append = self.append
+        for number in amounts:
+            append(number, report=report)
+
+    def to_bytes(self, *, separator: str = "\n", encoding: str = "utf-8") -> bytes:
+        """
+        :param separator: Put between the amounts
+        :param encoding: The encoding of the text
+        :return: All the stored amounts as a single text, i.e. to be written to a file at once
+        """
+        if not isinstance(separator, str): raise TypeError(f"The separator must be a string, got {type(separator)}")
+        return separator.join(self).encode(encoding)
+
+    def _token(self, word: str) -> int:
+        token = self._index.get(word)
+        if token is None:
+            token = self._index[word] = len(self.words)
+            self.words.append(word)
+        return token
+
+    def _text(self, position: int) -> str:
+        words = self.words
+        text = " ".join([words[token] for token in self._ids[self._offsets[position]:self._offsets[position + 1]]])
+        return text.capitalize() if self.speller.capitalize else text
+
+    def _encode(self, cents: int, negative: bool) -> None:
+        """
+        Appends the tokens of the words of _spell_cents
+        """
+        triplet_ids, power_ids = self._triplet_ids, self._power_ids
+        minus, dollar, dollars, and_, cent, cents_id = self._fixed_ids
+        integer, decimal = divmod(cents, self.speller.units.scale)
+
+        tokens: List[int] = [minus] if negative else []
+        if integer < 10 ** 27:
+            groups: List[Tuple[int, ...]] = []
+            whole = integer
+            group = 0
+            while whole:
+                whole, value = divmod(whole, 1000)
+                if value:
+                    groups.append(triplet_ids[value] + power_ids[group])
+                group += 1
+            for group_ids in reversed(groups):
+                tokens.extend(group_ids)
+        elif self.speller.unbounded:
+            self._encode_large_groups(integer, tokens)
+        else:
+            raise ValueError("The |num| must be less than 1e27")
+
+        if integer > 1:
+            tokens.append(dollars)
+        if integer == 1:
+            tokens.append(dollar)
+
+        if decimal:
+            tokens.append(and_)
+            tokens.extend(triplet_ids[decimal])
+            tokens.append(cent if decimal == 1 else cents_id)
+
+        self._ids.extend(tokens)
+        self._offsets.append(len(self._ids))
+
+    def _encode_large_groups(self, integer: int, tokens: List[int]) -> None:
+        """
+        Appends the tokens of the groups of an integer of any size, see _spell_large_groups
+        """
+        long_scale = _is_long_scale(self.speller.powers)
+        digits = _int_to_digits(integer)
+        digits = digits.zfill(len(digits) + -len(digits) % 3)
+        count = len(digits) // 3
+
+        for index in range(count):
+            value = int(digits[3 * index:3 * index + 3])
+            if value:
+                group = count - 1 - index
+                tokens.extend(self._triplet_ids[value])
+                if group < len(self._power_ids):
+                    tokens.extend(self._power_ids[group])
+                else:
+                    tokens.append(self._token(power_name(3 * group, long_scale=long_scale)))
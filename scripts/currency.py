@@ -0,0 +1,76 @@
+"""
+The currencies known by their code, and the spelling of batches that mix currencies.
+
+    speller = Speller(..., currency=get_currency("GBP"))
+    speller.spell(2.01) -> "Two pounds and one penny"
+    spell_mixed([(12.5, "EUR"), (1000, "JPY"), (1.005, "KWD")], speller=speller)
+    -> ["Twelve euros and fifty cents", "One thousand yen", "One dinar and five fils"]
+"""
+import threading
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from scripts.script import USD, Currency, SpellReport, Speller, _check_currency
+
+EUR: Currency = Currency("EUR", "€", ("euro", "euros"), ("cent", "cents"))
+GBP: Currency = Currency("GBP", "£", ("pound", "pounds"), ("penny", "pence"))
+JPY: Currency = Currency("JPY", "¥", ("yen", "yen"), ("", ""), digits=0)
+KWD: Currency = Currency("KWD", "KD ", ("dinar", "dinars"), ("fils", "fils"), digits=3)
+
+# the registered currencies, a Currency is immutable, so it can be read from any thread
+CURRENCIES: Dict[str, Currency] = {currency.code: currency for currency in (USD, EUR, GBP, JPY, KWD)}
+
+# guards the changes of CURRENCIES, the lookups go without it
+_lock = threading.Lock()
+
+
+def register_currency(currency: Currency) -> None:
+    """
+    Checks the currency and makes it available to get_currency under its code, replacing a currency of the same code
+    """
+    _check_currency(currency)
+    # the names may come as lists, a registered currency is made of tuples only
+    frozen = currency._replace(major=tuple(currency.major), minor=tuple(currency.minor))
+    with _lock:
+        CURRENCIES[currency.code] = frozen
+
+
+def get_currency(code: str) -> Currency:
+    """
+    :param code: The code of a registered currency, i.e. "EUR"
+    :return: The currency
+    """
+    currency = CURRENCIES.get(code)
+    if currency is None: raise ValueError(f"Unknown currency {code!r}, the currencies are: {", ".join(CURRENCIES)}")
+    return currency
+
+
+def spell_mixed(
+        amounts: Iterable[Tuple[int | float | Decimal | str, str]],
+        /,
+        *,
+        speller: Speller,
+        report: SpellReport | None = None
+) -> List[str]:
+    """
+    Spells a batch of (amount, currency code) pairs, the currency can change from one amount to the next.\n
+    The speller of a currency is made from the passed one on the first amount of the currency
+    (see Speller.with_currency), so the vocabulary is compiled once for the batch and the unit words once per currency.
+    The amounts of the currency of the passed speller are spelled by the speller itself.
+
+    :param amounts: The pairs of the amount to be spelled and the code of its currency, see get_currency
+    :param speller: The speller whose vocabulary and settings are used
+    :param report: Where to count the rounded amounts of the batch, see SpellReport
+    :return: List of spelled amounts, in the order of the amounts
+    """
+    if not hasattr(amounts, "__iter__"): raise TypeError("The amounts must have the __iter__ magic method defined.")
+    if not isinstance(speller, Speller): raise TypeError(f"The speller must be a Speller, got {type(speller)}")
+
+    spells: Dict[str, Callable[..., str]] = {speller.currency.code: speller.spell}
+    spelled: List[str] = []
+    for number, code in amounts:
+        spell = spells.get(code)
+        if spell is None:
+            spell = spells[code] = speller.with_currency(get_currency(code)).spell
+        spelled.append(spell(number, report=report))
+    return spelled
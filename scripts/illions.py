@@ -0,0 +1,114 @@
+"""
+Names of arbitrarily large powers of 10 in the short scale, by the Conway–Wechsler system.
+
+    illion_name(1) -> "million"          10^6
+    illion_name(8) -> "octillion"        10^27
+    illion_name(23) -> "tresvigintillion"  10^72
+    illion_name(1000) -> "millinillion"  10^3003
+
+In the long scale the n-th illion is 10^(6n) and the "-illiard" in between is 10^(6n + 3):
+
+    power_name(27, long_scale=True) -> "quadrilliard"
+    power_name(30, long_scale=True) -> "quintillion"
+
+The names are built from Latin prefixes on request and cached, there is no fixed table to run out of.
+"""
+from functools import lru_cache
+from typing import List, Tuple
+
+# the illions below 10, that have their own names
+_FIRST: Tuple[str, ...] = ("", "m", "b", "tr", "quadr", "quint", "sext", "sept", "oct", "non")
+
+# the same, as a 3-digit part of a bigger illion
+_SMALL_PARTS: Tuple[str, ...] = ("nilli", "milli", "billi", "trilli", "quadrilli", "quintilli", "sextilli",
+                                 "septilli", "octilli", "nonilli")
+
+_UNITS: Tuple[str, ...] = ("", "un", "duo", "tre", "quattuor", "quinqua", "se", "septe", "octo", "nove")
+
+# (prefix, the marks it puts on the unit before it)
+_TENS: Tuple[Tuple[str, str], ...] = (
+    ("", ""), ("deci", "n"), ("viginti", "ms"), ("triginta", "ns"), ("quadraginta", "ns"), ("quinquaginta", "ns"),
+    ("sexaginta", "n"), ("septuaginta", "n"), ("octoginta", "mx"), ("nonaginta", "")
+)
+_HUNDREDS: Tuple[Tuple[str, str], ...] = (
+    ("", ""), ("centi", "nx"), ("ducenti", "n"), ("trecenti", "ns"), ("quadringenti", "ns"), ("quingenti", "ns"),
+    ("sescenti", "n"), ("septingenti", "n"), ("octingenti", "mx"), ("nongenti", "")
+)
+
+# unit: {mark of the next prefix: the letter added to the unit}
+_UNIT_MARKS = {
+    3: {"s": "s", "x": "s"},  # tre -> tres
+    6: {"s": "s", "x": "x"},  # se -> ses, sex
+    7: {"m": "m", "n": "n"},  # septe -> septem, septen
+    9: {"m": "m", "n": "n"},  # nove -> novem, noven
+}
+
+
+def illion_name(n: int) -> str:
+    """
+    The name of the n-th illion, 10^(3n + 3)
+
+    :param n: The number of the illion, 1 for million
+    :return: The name, i.e. "million"
+    """
+    if not isinstance(n, int): raise TypeError(f"The n must be an integer, got {type(n)}")
+    if n < 1: raise ValueError(f"The n must be at least one, got {n}")
+    return _illion_name(n)
+
+
+def power_name(power: int, *, long_scale: bool = False) -> str:
+    """
+    The name of a power of 10 that starts a 3-digit group
+
+    :param power: The power of 10, a multiple of 3 and at least 3
+    :param long_scale: Whether to name the power in the long scale, i.e. "milliard" for 9, "billion" for 12
+    :return: The name, i.e. "thousand" for 3, "million" for 6
+    """
+    if not isinstance(power, int): raise TypeError(f"The power must be an integer, got {type(power)}")
+    if power < 3 or power % 3: raise ValueError(f"The power must be a multiple of 3 and at least 3, got {power}")
+    if power == 3: return "thousand"
+    if not long_scale: return _illion_name(power // 3 - 1)
+
+    n, rest = divmod(power, 6)
+    name = _illion_name(n)
+    return name[:-len("on")] + "ard" if rest else name
+
+
+@lru_cache(maxsize=4096)
+def _illion_name(n: int) -> str:
+    if n < 10:
+        return _FIRST[n] + "illion"
+
+    # the 3-digit parts of n, most significant first
+    parts: List[int] = []
+    while n:
+        n, part = divmod(n, 1000)
+        parts.append(part)
+
+    return "".join(_part_prefix(part) for part in reversed(parts)) + "on"
+
+
+@lru_cache(maxsize=1000)
+def _part_prefix(part: int) -> str:
+    """
+    :return: The prefix of a 3-digit part of an illion, ending with "illi"
+    """
+    if part < 10:
+        return _SMALL_PARTS[part]
+
+    hundreds, rest = divmod(part, 100)
+    tens, units = divmod(rest, 10)
+    tens_prefix, tens_marks = _TENS[tens]
+    hundreds_prefix, hundreds_marks = _HUNDREDS[hundreds]
+
+    unit = _UNITS[units]
+    # the unit is changed by the first prefix after it
+    marks = tens_marks if tens else hundreds_marks
+    for mark, letter in _UNIT_MARKS.get(units, {}).items():
+        if mark in marks:
+            unit += letter
+            break
+
+    prefix = unit + tens_prefix + hundreds_prefix
+    # the last vowel of the prefix makes way for the "illi"
+    return prefix[:-1] + "illi"
@@ -0,0 +1,268 @@
+"""
+Opt-in instrumentation of the speller pipeline: per-stage timers and counters, sent to pluggable sinks.
+
+    recorder = Recorder(JsonSink("profile.jsonl"))
+    speller = InstrumentedSpeller(Speller(...), recorder)
+    ...
+    recorder.flush()
+
+The stages are "parse" (the text into digits, see Recorder.timed), "convert" (the amount into cents, see to_cents)
+and "spell" (the cents into words: the 3-digit groups and the assembly of the text).
+Nothing is measured unless a speller is wrapped, the plain Speller and the functions are not changed,
+so the instrumentation costs nothing while it is not used.
+"""
+from decimal import Decimal
+from functools import wraps
+from time import perf_counter_ns
+from typing import IO, Callable, Dict, Iterable, List, TypeVar
+
+from scripts.script import CachedSpeller, SpellReport, Speller
+
+F = TypeVar("F", bound=Callable)
+
+# a sink gets every snapshot flushed by the recorder
+Sink = Callable[[Dict[str, object]], None]
+
+
+class Recorder:
+    """
+    Collects the time spent in every stage and named counters (i.e. the rounded amounts),
+    a snapshot of them is sent to the sinks on flush.\n
+    A recorder is meant for one thread, the same as a SpellReport.
+    """
+    __slots__ = ("sinks", "counters", "_calls", "_total_ns", "_max_ns", "_gauges")
+
+    def __init__(self, *sinks: Sink):
+        """
+        :param sinks: Where to send the snapshots, any callable taking the snapshot, i.e. MemorySink or JsonSink
+        """
+        for sink in sinks:
+            if not callable(sink): raise TypeError(f"The sinks must be callable, got {type(sink)}")
+
+        self.sinks: List[Sink] = list(sinks)
+        self.counters: Dict[str, int] = {}
+        """{name : count}, see count"""
+        self._calls: Dict[str, int] = {}
+        self._total_ns: Dict[str, int] = {}
+        self._max_ns: Dict[str, int] = {}
+        self._gauges: List[Callable[[], Dict[str, int]]] = []
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(stages={list(self._calls)}, counters={self.counters})"
+
+    def record(self, stage: str, elapsed_ns: int, calls: int = 1) -> None:
+        """
+        Adds the time spent in a stage
+
+        :param stage: The name of the stage
+        :param elapsed_ns: The time spent, in nanoseconds
+        :param calls: The number of calls the time was spent on
+        """
+        if stage in self._calls:
+            self._calls[stage] += calls
+            self._total_ns[stage] += elapsed_ns
+            if elapsed_ns > self._max_ns[stage]:
+                self._max_ns[stage] = elapsed_ns
+        else:
+            self._calls[stage] = calls
+            self._total_ns[stage] = elapsed_ns
+            self._max_ns[stage] = elapsed_ns
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Adds n to the counter of the name
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_gauge(self, gauge: Callable[[], Dict[str, int]]) -> None:
+        """
+        Adds counters that are read when a snapshot is taken instead of being counted, i.e. the hits of a cache
+
+        :param gauge: Returns {name : count}, called on every snapshot
+        """
+        if not callable(gauge): raise TypeError(f"The gauge must be callable, got {type(gauge)}")
+        self._gauges.append(gauge)
+
+    def timed(self, stage: str, fn: F) -> F:
+        """
+        Wraps a function, so that its calls are recorded as the stage
+
+        :param stage: The name of the stage
+        :param fn: The function to time, i.e. parse_amount
+        :return: The wrapped function
+        """
+        if not callable(fn): raise TypeError(f"The fn must be callable, got {type(fn)}")
+        record = self.record
+
+        @wraps(fn)
+        def _timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage, perf_counter_ns() - start)
+
+        return _timed
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        :return: {"stages": {stage: {"calls", "total_ns", "mean_ns", "max_ns"}}, "counters": {name: count}},
+        a plain dictionary, that can be dumped to JSON as is
+        """
+        stages = {
+            stage: {
+                "calls": calls,
+                "total_ns": self._total_ns[stage],
+                "mean_ns": self._total_ns[stage] // calls if calls else 0,
+                "max_ns": self._max_ns[stage],
+            }
+            for stage, calls in self._calls.items()
+        }
+        counters = dict(self.counters)
+        for gauge in self._gauges:
+            counters.update(gauge())
+        return {"stages": stages, "counters": counters}
+
+    def flush(self) -> Dict[str, object]:
+        """
+        Sends a snapshot to all the sinks
+
+        :return: The snapshot
+        """
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink(snapshot)
+        return snapshot
+
+    def reset(self) -> None:
+        """
+        Drops the recorded times and counters, the gauges are kept
+        """
+        self.counters.clear()
+        self._calls.clear()
+        self._total_ns.clear()
+        self._max_ns.clear()
+
+
+class MemorySink:
+    """
+    Keeps the flushed snapshots in memory, i.e. for the tests or to be looked at from a debugger
+    """
+    __slots__ = ("snapshots",)
+
+    def __init__(self):
+        self.snapshots: List[Dict[str, object]] = []
+
+    def __call__(self, snapshot: Dict[str, object]) -> None:
+        self.snapshots.append(snapshot)
+
+    @property
+    def last(self) -> Dict[str, object] | None:
+        """The last flushed snapshot, None before the first flush"""
+        return self.snapshots[-1] if self.snapshots else None
+
+
+class JsonSink:
+    """
+    Writes every flushed snapshot as a line of JSON (JSON Lines), to a file path or an open text file
+    """
+    __slots__ = ("target",)
+
+    def __init__(self, target: str | IO[str]):
+        """
+        :param target: The path of the file to append to, or an open text file, i.e. sys.stderr
+        """
+        if not isinstance(target, str) and not hasattr(target, "write"):
+            raise TypeError(f"The target must be a path or a text file, got {type(target)}")
+        self.target = target
+
+    def __call__(self, snapshot: Dict[str, object]) -> None:
+        import json
+
+        line = json.dumps(snapshot, sort_keys=True) + "\n"
+        if isinstance(self.target, str):
+            with open(self.target, "a", encoding="utf-8") as file:
+                file.write(line)
+        else:
+            self.target.write(line)
+            self.target.flush()
+
+
+class InstrumentedSpeller:
+    """
+    Wraps a speller and records the stages of every amount it spells, the output is the same as of the speller.\n
+    Counters: "amounts" spelled and "rounded" amounts, and for a CachedSpeller the "cache_hits" and "cache_misses"
+    since the wrapping (read from its cache_info, so the cache itself is not slowed down).
+    """
+    __slots__ = ("speller", "recorder")
+
+    def __init__(self, speller: Speller, recorder: Recorder):
+        """
+        :param speller: The speller to spell with
+        :param recorder: Where to record the stages and the counters
+        """
+        if not isinstance(speller, Speller): raise TypeError(f"The speller must be a Speller, got {type(speller)}")
+        if not isinstance(recorder, Recorder): raise TypeError(f"The recorder must be a Recorder, got {type(recorder)}")
+
+        self.speller: Speller = speller
+        self.recorder: Recorder = recorder
+        if isinstance(speller, CachedSpeller):
+            recorder.add_gauge(_cache_gauge(speller))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.speller!r}, {self.recorder!r})"
+
+    def spell(self, number: int | float | Decimal | str, /, *, report: SpellReport | None = None) -> str:
+        """
+        Spells a number as a dollar amount, see Speller.spell
+        """
+        speller, recorder = self.speller, self.recorder
+
+        start = perf_counter_ns()
+        negative, cents, rounded = speller._convert(number, report)
+        converted = perf_counter_ns()
+        # counted once the rounding policy let the amount through
+        if rounded: recorder.count("rounded")
+        spelled = speller._spell(cents, negative)
+        end = perf_counter_ns()
+
+        recorder.record("convert", converted - start)
+        recorder.record("spell", end - converted)
+        recorder.count("amounts")
+        return spelled
+
+    def spell_cents(self, cents: int, /) -> str:
+        """
+        Spells an integer number of cents as a dollar amount, see Speller.spell_cents
+        """
+        if not isinstance(cents, int): raise TypeError(f"The cents must be an integer, got {type(cents)}")
+
+        start = perf_counter_ns()
+        spelled = self.speller._spell(abs(cents), cents < 0)
+        self.recorder.record("spell", perf_counter_ns() - start)
+        self.recorder.count("amounts")
+        return spelled
+
+    def spell_many(
+            self,
+            amounts: Iterable[int | float | Decimal | str],
+            /,
+            *,
+            report: SpellReport | None = None
+    ) -> List[str]:
+        """
+        Spells a batch of numbers as dollar amounts, see Speller.spell_many
+        """
+        if not hasattr(amounts, "__iter__"): raise TypeError("The amounts must have the __iter__ magic method defined.")
+        spell = self.spell
+        return [spell(number, report=report) for number in amounts]
+
+
+def _cache_gauge(speller: CachedSpeller) -> Callable[[], Dict[str, int]]:
+    baseline = speller.cache_info()
+
+    def _gauge() -> Dict[str, int]:
+        info = speller.cache_info()
+        return {"cache_hits": info.hits - baseline.hits, "cache_misses": info.misses - baseline.misses}
+
+    return _gauge
@@ -0,0 +1,229 @@
+"""
+Bulk conversion jobs, that spell the amounts of whole files at once.
+
+    python run convert ledger.txt -o words.txt --start 24 --width 18
+    python run csv payments.csv -o checks.csv --column amount
+
+convert_fixed reads fixed-layout files (the amount at the same byte columns of every line) through a memory map,
+one window at a time, so the memory use stays flat however big the file is.
+convert_csv adds a column with the spelled amounts to a CSV file, reading and writing it in chunks of rows.
+"""
+import csv
+import mmap
+import os
+from time import perf_counter
+from typing import IO, BinaryIO, Iterable, List, NamedTuple
+
+from scripts.app import parse_amount
+from scripts.script import SpellReport, Speller, batched
+
+# bytes of the input mapped at once, the peak memory use is about a window, whatever the size of the file
+WINDOW: int = 64 << 20
+
+# spelled lines collected before they are written out at once
+WRITE_BATCH: int = 8192
+
+# rows of a CSV file read, spelled and written at once
+CHUNK_ROWS: int = 8192
+
+
+class JobStats(NamedTuple):
+    """What a job did"""
+    rows: int
+    """The number of rows (or lines) processed"""
+    invalid: int
+    """The number of rows whose amount could not be parsed or spelled"""
+    seconds: float
+    """The time the job took"""
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / (self.seconds or 1e-9)
+
+
+def convert_fixed(
+        path: str,
+        outfile: BinaryIO,
+        *,
+        speller: Speller,
+        start: int = 0,
+        width: int | None = None,
+        separator: str = ".",
+        decimal: str = ",",
+        report: SpellReport | None = None,
+        window: int = WINDOW
+) -> int:
+    """
+    Spells the amount field of every line of a fixed-layout file into a line of the outfile, in the same order.\n
+    The file is memory-mapped one window at a time and the lines are found in the mapped bytes,
+    only the amount field of a line is copied out and decoded, the rest of the line is never turned into a str.
+    The spelled lines are written in batches of WRITE_BATCH lines, as UTF-8.
+    Lines whose field can not be parsed (see parse_amount) or spelled (i.e. out of the range of the speller)
+    are written as empty lines, to keep the lines of both files aligned, the same as in the --stream mode.
+
+    :param path: The path of the input file
+    :param outfile: Where to write the spelled amounts, a binary file, i.e. open(..., "wb") or sys.stdout.buffer
+    :param speller: The speller to spell the amounts with
+    :param start: The byte column where the amount field starts, 0 for the start of the line
+    :param width: The width of the amount field in bytes, None for the rest of the line
+    :param separator: The integer separator of the amounts
+    :param decimal: The decimal separator of the amounts
+    :param report: Where to count the rounded amounts, see SpellReport
+    :param window: The bytes mapped at once, a line must fit into a window
+    :return: The number of lines that could not be parsed or spelled
+    """
+    if not isinstance(start, int): raise TypeError(f"The start must be an integer, got {type(start)}")
+    if start < 0: raise ValueError(f"The start must not be negative, got {start}")
+    if width is not None:
+        if not isinstance(width, int): raise TypeError(f"The width must be an integer, got {type(width)}")
+        if width < 1: raise ValueError(f"The width must be at least one, got {width}")
+    if not isinstance(window, int): raise TypeError(f"The window must be an integer, got {type(window)}")
+    if window < mmap.ALLOCATIONGRANULARITY:
+        raise ValueError(f"The window must be at least {mmap.ALLOCATIONGRANULARITY} bytes, got {window}")
+    # fails early on bad separators, instead of on the first line
+    parse_amount("", separator=separator, decimal=decimal)
+
+    invalid = 0
+    batch: List[str] = []
+    spell = speller.spell
+
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        # offset of the window in the file, a multiple of the granularity, and of the first line in the window
+        offset = 0
+        line_start = 0
+
+        while offset < size:
+            # the window is counted from the first line, the bytes before it are only there for the alignment
+            length = min(line_start + window, size - offset)
+            last = offset + length == size
+            first_line = line_start
+            with mmap.mmap(file.fileno(), length, access=mmap.ACCESS_READ, offset=offset) as buffer:
+                find = buffer.find
+                while line_start < length:
+                    line_end = find(b"\n", line_start)
+                    if line_end == -1:
+                        if not last: break
+                        # the last line of the file, without a newline
+                        line_end = length
+
+                    field_start = line_start + start
+                    field_end = line_end if width is None else min(line_end, field_start + width)
+                    # why: latin-1 maps every byte to a character, so the decoding never fails,
+                    # anything else than ASCII digits and separators is rejected by the parser
+                    text = buffer[field_start:field_end].decode("latin-1") if field_start < field_end else ""
+
+                    amount: str | None = parse_amount(text, separator=separator, decimal=decimal)
+                    spelled: str | None = None
+                    if amount is not None:
+                        try:
+                            spelled = spell(amount, report=report)
+                        except ValueError:
+                            # the amount parsed, but the speller can not spell it, i.e. 10^27 and above
+                            pass
+                    if spelled is None:
+                        invalid += 1
+                        batch.append("")
+                    else:
+                        batch.append(spelled)
+
+                    if len(batch) >= WRITE_BATCH:
+                        _write_lines(outfile, batch)
+                        batch.clear()
+                    line_start = line_end + 1
+
+            if last:
+                break
+            if line_start == first_line:
+                raise ValueError(f"The line at the byte {offset + line_start} does not fit into the window "
+                                 f"of {window} bytes")
+
+            # the next window starts with the first line that did not fit, aligned down as mmap requires
+            next_line = offset + line_start
+            offset = next_line - next_line % mmap.ALLOCATIONGRANULARITY
+            line_start = next_line - offset
+
+    _write_lines(outfile, batch)
+    return invalid
+
+
+def _write_lines(outfile: BinaryIO, lines: List[str]) -> None:
+    if lines:
+        outfile.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+def convert_csv(
+        infile: Iterable[str],
+        outfile: IO[str],
+        *,
+        speller: Speller,
+        column: str,
+        spelled_column: str = "spelled",
+        separator: str = ".",
+        decimal: str = ",",
+        delimiter: str = ",",
+        chunk_rows: int = CHUNK_ROWS,
+        report: SpellReport | None = None
+) -> JobStats:
+    """
+    Copies a CSV file with a header row and appends a column with the spelled amounts of one of its columns.\n
+    The amounts are parsed the same way as in the shell (see parse_amount) with the given separators.
+    The rows are read, spelled and written chunk_rows at a time, so only a chunk is held in memory.
+    Rows whose amount can not be parsed or spelled (i.e. out of the range of the speller) get an empty spelled cell,
+    rows shorter than the header are padded and the fields past the header are dropped,
+    so the spelled cell is always under the spelled column.
+
+    :param infile: The CSV file, opened with newline=""
+    :param outfile: Where to write the CSV file with the spelled column, opened with newline=""
+    :param speller: The speller to spell the amounts with
+    :param column: The name of the column of the amounts, in the header row
+    :param spelled_column: The name of the appended column
+    :param separator: The integer separator of the amounts
+    :param decimal: The decimal separator of the amounts
+    :param delimiter: The delimiter of the CSV fields
+    :param chunk_rows: The number of rows processed at once
+    :param report: Where to count the rounded amounts, see SpellReport
+    :return: The number of rows, of the rows that could not be parsed or spelled and the time taken, see JobStats
+    """
+    if not isinstance(chunk_rows, int): raise TypeError(f"The chunk_rows must be an integer, got {type(chunk_rows)}")
+    if chunk_rows < 1: raise ValueError(f"The chunk_rows must be at least one, got {chunk_rows}")
+    # fails early on bad separators, instead of on the first row
+    parse_amount("", separator=separator, decimal=decimal)
+
+    start = perf_counter()
+    reader = csv.reader(infile, delimiter=delimiter)
+    writer = csv.writer(outfile, delimiter=delimiter, lineterminator="\n")
+
+    header = next(reader, None)
+    if header is None: raise ValueError("The CSV file is empty, it must start with a header row")
+    if column not in header: raise ValueError(f"No column {column!r} in the header: {header}")
+    if spelled_column in header: raise ValueError(f"The column {spelled_column!r} is already in the header")
+    index = header.index(column)
+    width = len(header)
+    writer.writerow(header + [spelled_column])
+
+    rows = invalid = 0
+    spell = speller.spell
+    for chunk in batched(reader, chunk_rows):
+        for row in chunk:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+            elif len(row) > width:
+                del row[width:]
+            amount: str | None = parse_amount(row[index], separator=separator, decimal=decimal)
+            spelled: str | None = None
+            if amount is not None:
+                try:
+                    spelled = spell(amount, report=report)
+                except ValueError:
+                    # the amount parsed, but the speller can not spell it, i.e. 10^27 and above
+                    pass
+            if spelled is None:
+                invalid += 1
+                row.append("")
+            else:
+                row.append(spelled)
+        writer.writerows(chunk)
+        rows += len(chunk)
+
+    return JobStats(rows=rows, invalid=invalid, seconds=perf_counter() - start)
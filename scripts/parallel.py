@@ -0,0 +1,136 @@
+import os
+from collections import deque
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, Iterator, List, TypeVar
+
+from scripts.script import Rounding, Speller, batched
+
+# why: concurrent.futures pulls in multiprocessing, it is imported when a pool is made,
+# so that importing this module (i.e. by the cli) stays cheap
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# amounts per task, big enough for the pickling and the inter-process round trip to be a small share of the work
+CHUNK_SIZE: int = 8192
+
+# the speller of the current worker process, set up once by the pool initializer
+_worker_speller: Speller | None = None
+
+
+def _init_worker(speller: Speller) -> None:
+    global _worker_speller
+    _worker_speller = speller
+
+
+def worker_speller() -> Speller:
+    """
+    :return: The speller of the current worker process of a pool made by make_pool
+    """
+    if _worker_speller is None: raise RuntimeError("Not running inside a pool made by make_pool")
+    return _worker_speller
+
+
+def make_pool(
+        workers: int | None = None,
+        *,
+        power_names: Dict[int, str],
+        num_names: Dict[int, str],
+        capitalize: bool = True,
+        rounding: Rounding = "half_even"
+) -> "ProcessPoolExecutor":
+    """
+    Makes a process pool, in which every worker gets its own Speller once at the start (see worker_speller).
+    The speller is compiled in the parent and sent pickled with its tables, so the workers do not compile it again
+
+    :param workers: The number of worker processes, all the CPU cores by default
+    :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+    :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+    :param capitalize: Whether to capitalize the output or not
+    :param rounding: What to do with more than 2 decimals, see to_cents
+    :return: The pool, to be used as a context manager
+    """
+    if workers is not None:
+        if not isinstance(workers, int): raise TypeError(f"The workers must be an integer, got {type(workers)}")
+        if workers < 1: raise ValueError(f"The workers must be at least one, got {workers}")
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    speller = Speller(power_names=power_names, num_names=num_names, capitalize=capitalize, rounding=rounding)
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, initializer=_init_worker,
+                               initargs=(speller,))
+
+
+def imap_ordered(pool: "ProcessPoolExecutor", fn: Callable[[T], R], tasks: Iterable[T], *, window: int) -> Iterator[R]:
+    """
+    Same as pool.map, but only up to window tasks are submitted ahead of the consumer,
+    so the tasks can be a stream of any length and the memory use stays bounded.
+
+    :param pool: The pool to run the tasks in
+    :param fn: The (picklable) function to apply to each task
+    :param tasks: The arguments of fn
+    :param window: The max number of tasks in flight
+    :return: The results, in the order of the tasks
+    """
+    if window < 1: raise ValueError(f"The window must be at least one, got {window}")
+
+    in_flight: Deque["Future"] = deque()
+    for task in tasks:
+        if len(in_flight) >= window:
+            yield in_flight.popleft().result()
+        in_flight.append(pool.submit(fn, task))
+
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def _spell_chunk(amounts: tuple) -> List[str]:
+    return worker_speller().spell_many(amounts)
+
+
+def spell_parallel(
+        amounts: Iterable[int | float | Decimal | str],
+        *,
+        power_names: Dict[int, str],
+        num_names: Dict[int, str],
+        capitalize: bool = True,
+        rounding: Rounding = "half_even",
+        workers: int | None = None,
+        chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Spells the amounts as dollar amounts on all the CPU cores, the output is the same as of spell_many.\n
+    The amounts are sent to the workers in chunks and are consumed lazily, the results keep the order of the amounts.
+
+    :param amounts: The amounts to be spelled, every amount must be within -10^27 < x < 10^27
+    :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+    :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+    :param capitalize: Whether to capitalize the output or not
+    :param rounding: What to do with more than 2 decimals, see to_cents.
+    "warn" has no effect here, the warnings would be issued inside the workers
+    :param workers: The number of worker processes, all the CPU cores by default
+    :param chunk_size: The number of amounts sent to a worker at once
+    :return: Generator of the spelled amounts
+    """
+    if not hasattr(amounts, "__iter__"): raise TypeError("The amounts must have the __iter__ magic method defined.")
+    if not isinstance(chunk_size, int): raise TypeError(f"The chunk_size must be an integer, got {type(chunk_size)}")
+    if chunk_size < 1: raise ValueError(f"The chunk_size must be at least one, got {chunk_size}")
+    if workers is not None:
+        if not isinstance(workers, int): raise TypeError(f"The workers must be an integer, got {type(workers)}")
+        if workers < 1: raise ValueError(f"The workers must be at least one, got {workers}")
+    # checking the vocabulary in the parent, so the errors are not raised from inside the pool
+    Speller(power_names=power_names, num_names=num_names, capitalize=capitalize, rounding=rounding)
+
+    workers = workers or os.cpu_count() or 1
+
+    def _generator_obj_wrapper():
+        with make_pool(workers, power_names=power_names, num_names=num_names, capitalize=capitalize,
+                       rounding=rounding) as pool:
+            # two tasks per worker, so that no worker waits for the next one while the results are consumed
+            window = 2 * workers
+            for spelled in imap_ordered(pool, _spell_chunk, batched(iter(amounts), chunk_size), window=window):
+                yield from spelled
+
+    return _generator_obj_wrapper()
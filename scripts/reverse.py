@@ -0,0 +1,207 @@
+"""
+The inverse of the speller: reads a spelled dollar amount back into the amount, i.e. to reconcile the words
+written on a document with the number next to them.
+
+    "One thousand two hundred thirty-four dollars and fifty-two cents" -> Decimal("1234.52")
+
+The words are looked up in an index of every word the vocabulary can produce (see WordsParser),
+so reading an amount is one dictionary lookup per word.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+
+from scripts.script import _check_names
+
+# the kinds of the words in the index
+_NUMBER, _HUNDRED, _POWER, _MINUS, _AND, _DOLLAR, _CENT = range(7)
+
+# the words put around the numbers by the speller, see _spell_cents
+_FIXED_WORDS: Dict[str, Tuple[int, int]] = {
+    "minus": (_MINUS, 0),
+    "and": (_AND, 0),
+    "dollar": (_DOLLAR, 0),
+    "dollars": (_DOLLAR, 0),
+    "cent": (_CENT, 0),
+    "cents": (_CENT, 0),
+}
+
+
+class WordsParser:
+    """
+    Reads dollar amounts spelled by a Speller with the same vocabulary back into amounts.\n
+    Every word the vocabulary can produce is indexed upfront: the names of the numbers, the hyphenated tens
+    ("thirty-four") and the names of the powers, so parsing an amount is a lookup per word and a single pass
+    over the words. The case of the words, the spaces between them, "dollar" vs "dollars" (and "cent" vs "cents")
+    and the British "and" after the hundreds are not checked, the order of the words is.\n
+    Meant to be made once per vocabulary and reused, the same as Speller.
+    """
+    __slots__ = ("power_names", "num_names", "_index")
+
+    def __init__(self, *, power_names: Dict[int, str], num_names: Dict[int, str]):
+        """
+        :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+        :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+        """
+        _check_names(power_names=power_names, num_names=num_names)
+
+        self.power_names: Dict[int, str] = dict(power_names)
+        self.num_names: Dict[int, str] = dict(num_names)
+        self._index: Dict[str, Tuple[int, int]] = _build_index(power_names=self.power_names,
+                                                               num_names=self.num_names)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(power_names={self.power_names}, num_names={self.num_names})"
+
+    def parse(self, text: str, /) -> Decimal:
+        """
+        Reads a spelled dollar amount.
+
+        :param text: The amount, as spelled by the speller
+        :return: The amount, with exactly 2 decimals
+        :raises ValueError: If the text is not a spelled amount
+        """
+        return Decimal(f"{self.parse_cents(text)}e-2")
+
+    def parse_cents(self, text: str, /) -> int:
+        """
+        Reads a spelled dollar amount into an integer number of cents, see parse
+
+        :param text: The amount, as spelled by the speller
+        :return: The amount in cents
+        :raises ValueError: If the text is not a spelled amount
+        """
+        if not isinstance(text, str): raise TypeError(f"The text must be a string, got {type(text)}")
+        return _parse_words(text, self._index)
+
+    def parse_many(self, texts: Iterable[str], /) -> List[int | None]:
+        """
+        Reads a batch of spelled dollar amounts into cents.
+
+        :param texts: The amounts, as spelled by the speller
+        :return: List of the amounts in cents, in the order of the texts, None for the texts that are not amounts
+        """
+        if not hasattr(texts, "__iter__"): raise TypeError("The texts must have the __iter__ magic method defined.")
+
+        index = self._index
+        parsed: List[int | None] = []
+        for text in texts:
+            try:
+                parsed.append(_parse_words(text, index))
+            except (ValueError, AttributeError):
+                parsed.append(None)
+        return parsed
+
+
+def parse_words(text: str, /, *, power_names: Dict[int, str], num_names: Dict[int, str]) -> Decimal:
+    """
+    Reads a spelled dollar amount, the inverse of currency_speller.\n
+    parse_words(currency_speller(1234.52, ...), ...) -> Decimal("1234.52")
+
+    :param text: The amount, as spelled by currency_speller
+    :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+    :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+    :return: The amount, with exactly 2 decimals
+    :raises ValueError: If the text is not a spelled amount
+    """
+    return WordsParser(power_names=power_names, num_names=num_names).parse(text)
+
+
+def _build_index(*, power_names: Dict[int, str], num_names: Dict[int, str]) -> Dict[str, Tuple[int, int]]:
+    """
+    :return: {word in lowercase : (its kind, its value)},
+    the value of a number is the number, the value of a power is its 3-digit group (1 for the thousands)
+    """
+    words: Dict[str, Tuple[int, int]] = dict(_FIXED_WORDS)
+    numbers = {value: name for value, name in num_names.items() if 1 <= value <= 99}
+    for tens in range(20, 100, 10):
+        for units in range(1, 10):
+            numbers[tens + units] = num_names[tens] + "-" + num_names[units]
+
+    entries = [(name, (_NUMBER, value)) for value, name in numbers.items()]
+    entries.append((power_names[2], (_HUNDRED, 0)))
+    entries += [(name, (_POWER, power // 3)) for power, name in power_names.items() if power in range(3, 27, 3)]
+
+    for name, entry in entries:
+        word = name.lower()
+        if len(word.split()) != 1: raise ValueError(f"The names must be single words to be parsed, got {name!r}")
+        if word in words: raise ValueError(f"The name {name!r} is used twice, the words could not be told apart")
+        words[word] = entry
+    return words
+
+
+def _parse_words(text: str, index: Dict[str, Tuple[int, int]]) -> int:
+    """
+    Reads the words in the order _spell_cents puts them:
+    [minus] [<group> [<power>]]... [dollar(s)] [and <1-99> cent(s)]
+
+    :return: The amount in cents
+    """
+    words = text.lower().split()
+    count = len(words)
+    try:
+        kinds = [index[word] for word in words]
+    except KeyError as error:
+        raise ValueError(f"Unknown word {error.args[0]!r} in {text!r}") from None
+
+    position = 0
+    negative = count > 0 and kinds[0][0] == _MINUS
+    if negative:
+        position += 1
+
+    # the 3-digit groups, the most significant first, every group must be below the one before it
+    integer = 0
+    last_group = 9
+    while position < count and kinds[position][0] == _NUMBER:
+        value, position = _parse_triplet(kinds, position, text)
+        group = 0
+        if position < count and kinds[position][0] == _POWER:
+            group = kinds[position][1]
+            position += 1
+        if group >= last_group: raise ValueError(f"The powers are out of order in {text!r}")
+        integer += value * 1000 ** group
+        last_group = group
+        if not group:
+            break
+
+    if integer:
+        if position == count or kinds[position][0] != _DOLLAR: raise ValueError(f"Expected dollars in {text!r}")
+        position += 1
+
+    decimal = 0
+    if position < count and kinds[position][0] == _AND:
+        position += 1
+        if position == count or kinds[position][0] != _NUMBER: raise ValueError(f"Expected the cents in {text!r}")
+        decimal = kinds[position][1]
+        position += 1
+        if position == count or kinds[position][0] != _CENT: raise ValueError(f"Expected cents in {text!r}")
+        position += 1
+
+    if position != count: raise ValueError(f"Unexpected word {words[position]!r} in {text!r}")
+
+    cents = integer * 100 + decimal
+    return -cents if negative else cents
+
+
+def _parse_triplet(kinds: List[Tuple[int, int]], position: int, text: str) -> Tuple[int, int]:
+    """
+    Reads a number between 1 and 999 that starts at the position, the inverse of _spell_triplet
+
+    :return: The number, the position after it
+    """
+    count = len(kinds)
+    value = kinds[position][1]
+    position += 1
+    if position == count or kinds[position][0] != _HUNDRED:
+        return value, position
+
+    if value > 9: raise ValueError(f"Expected a number below 10 before the hundreds in {text!r}")
+    value *= 100
+    position += 1
+    # the British "and" after the hundreds, the "and" before the cents is never followed by a number of dollars
+    if (position + 1 < count and kinds[position][0] == _AND and kinds[position + 1][0] == _NUMBER
+            and not (position + 2 < count and kinds[position + 2][0] == _CENT)):
+        position += 1
+    if position < count and kinds[position][0] == _NUMBER:
+        value += kinds[position][1]
+        position += 1
+    return value, position
@@ -1,4 +1,12 @@
-from typing import Dict, List, Iterable, Tuple
+import sys
+from decimal import ROUND_05UP, Decimal, localcontext
+from functools import lru_cache
+from math import isfinite
+from types import MappingProxyType
+from typing import Dict, List, Iterable, Iterator, Literal, Mapping, NamedTuple, Sequence, Tuple
+from warnings import warn
+
+from scripts.illions import power_name
 
 
 # TODO
@@ -7,6 +15,77 @@ from typing import Dict, List, Iterable, Tuple
 # OPTIONAL
 # reduce the dependency on the NUM_NAMES and POWER_NAMES
 
+Rounding = Literal["half_even", "half_up", "raise", "warn"]
+ROUNDING_POLICIES: Tuple[str, ...] = ("half_even", "half_up", "raise", "warn")
+
+# the max number of digits of the whole part of the Decimal and string amounts of an unbounded speller,
+# checked before the digits are converted, the bounded spellers take 27 at most
+MAX_DIGITS: int = 100_000
+_BOUNDED_DIGITS: int = 27
+
+
+class RoundingWarning(UserWarning):
+    """
+    Issued for amounts rounded to the decimals of their currency (2 for dollars) under the "warn" rounding policy
+    """
+
+
+class SpellReport:
+    """
+    Collects what happened to a batch of amounts, instead of reporting every amount on its own.
+    Pass the same report to all the calls of the batch. A report is not thread-safe, use one per thread.
+    """
+    __slots__ = ("rounded", "warnings")
+
+    def __init__(self):
+        self.rounded: int = 0
+        """The number of amounts that had more decimals than their currency (2 for dollars) and were rounded"""
+        self.warnings: List[str] = []
+        """The messages of the rounded amounts, under the "warn" rounding policy"""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(rounded={self.rounded}, warnings={len(self.warnings)})"
+
+
+class Currency(NamedTuple):
+    """
+    The words of the units of a currency, see Speller.
+
+    I.E.
+        Currency("GBP", "£", ("pound", "pounds"), ("penny", "pence"))\n
+        Currency("JPY", "¥", ("yen", "yen"), ("", ""), digits=0)
+    """
+    code: str
+    """The ISO 4217 code, i.e. "USD" """
+    symbol: str
+    """Put before the amounts in the rounding messages, i.e. "$" """
+    major: Tuple[str, str]
+    """The singular and plural name of the major unit, i.e. ("dollar", "dollars")"""
+    minor: Tuple[str, str]
+    """The singular and plural name of the minor unit, i.e. ("cent", "cents"), empty names if there is none"""
+    digits: int = 2
+    """The number of decimals of the minor unit, 0 if there is none and up to 3 (i.e. 1000 fils to a dinar)"""
+
+
+USD: Currency = Currency("USD", "$", ("dollar", "dollars"), ("cent", "cents"))
+
+
+class _Units(NamedTuple):
+    """The unit words of a currency, in the form the spelling looks them up, see _compile_units"""
+    scale: int
+    """The minor units in a major unit, 10 ** digits"""
+    major: Tuple[str, str]
+    """Indexed by whether the amount is more than one"""
+    minor: Tuple[str, str]
+    """Indexed by whether the amount is more than one"""
+
+
+def _compile_units(currency: Currency) -> _Units:
+    return _Units(scale=10 ** currency.digits, major=tuple(currency.major), minor=tuple(currency.minor))
+
+
+_DOLLARS: _Units = _compile_units(USD)
+
 
 def batched(iterable: Iterable, n: int, *, strict: bool = False, backwards: bool = False) -> Iterable:
     """
@@ -15,9 +94,14 @@ def batched(iterable: Iterable, n: int, *, strict: bool = False, backwards: bool
         batched("hello world", 3, backwards=False) -> "hel", "lo ", "wor", "ld"\n
         batched("hello world", 3, backwards=True) -> "rld", " wo", "llo", "he"
 
+    The iterable is never copied as a whole: sequences (and anything else reversed() accepts) are walked backwards
+    in place and iterators are consumed lazily. Only a one-pass iterator iterated backwards has to be buffered,
+    as its end can not be reached otherwise.
+
     :param iterable: The object to be iterated over (has to have __iter__ method defined)
     :param n: The batch size
-    :param strict: Whether to raise an error if the final batch is less than n
+    :param strict: Whether to raise an error if the final batch is less than n.
+    Checked upfront for iterables with a length, when the last batch is reached otherwise
     :param backwards: Whether to iterate the object starting from the back
     :return: Tuple of the batch
     """
@@ -28,18 +112,27 @@ def batched(iterable: Iterable, n: int, *, strict: bool = False, backwards: bool
 
     if not isinstance(strict, bool):
         raise TypeError(f"Keyword backwards must be a boolean value, got {type(strict)}")
-    if strict and len(list(iterable)) % n != 0:
-        raise ValueError('strict=True, cannot divide iterable into batched')
 
     if not isinstance(backwards, bool):
         raise TypeError(f"Keyword backwards must be a boolean value, got {type(backwards)}")
 
+    if backwards:
+        try:
+            iterator = reversed(iterable)
+        except TypeError:
+            iterable = tuple(iterable)
+            iterator = reversed(iterable)
+    else:
+        iterator = iter(iterable)
+
+    if strict and hasattr(iterable, "__len__") and len(iterable) % n != 0:
+        raise ValueError('strict=True, cannot divide iterable into batched')
+
     # why: as soon as python sees "yield" keyword in a function,
     # it automatically returns a generator object without running line that precede the yield kw
     # so a generator wrapper is need to run the guard clauses AND return the generator object
-    def _generator_obj_wrapper(*, iterable, n, strict, backwards):
+    def _generator_obj_wrapper(*, iterator, n, strict, backwards):
         from itertools import islice
-        iterator = iter(iterable[::-1]) if backwards else iter(iterable)
 
         while batch := tuple(islice(iterator, n)):
             if strict and len(batch) != n:
@@ -50,7 +143,38 @@ def batched(iterable: Iterable, n: int, *, strict: bool = False, backwards: bool
             else:
                 yield batch
 
-    return _generator_obj_wrapper(iterable=iterable, n=n, strict=strict, backwards=backwards)
+    return _generator_obj_wrapper(iterator=iterator, n=n, strict=strict, backwards=backwards)
+
+
+def iter_groups(num: int, power_step: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the groups of digits of a positive integer as (power of 10, integer), the most significant group first.
+    Zero groups are yielded as well, the last group is always the one of power 0.\n
+    I.E.
+        iter_groups(1_000_234, 3) -> (6, 1), (3, 0), (0, 234)
+
+    :param num: The number to be broken down
+    :param power_step: The number of digits in a group
+    :return: Generator of (power of 10, integer)
+    """
+    num = _check_breakable(num, power_step)
+
+    base = 10 ** power_step
+    # the number of digits from the number of bits, corrected by one where the estimate is over
+    digits = max(1, int(num.bit_length() * 0.30102999566398120) + 1)
+    if digits > 1 and 10 ** (digits - 1) > num:
+        digits -= 1
+    top_power = (digits - 1) // power_step * power_step
+
+    def _generator_obj_wrapper(*, num, power, divisor):
+        while power > 0:
+            chunk, num = divmod(num, divisor)
+            yield power, chunk
+            power -= power_step
+            divisor //= base
+        yield 0, num
+
+    return _generator_obj_wrapper(num=num, power=top_power, divisor=10 ** top_power)
 
 
 def break_down(num: int, power_step: int) -> Dict[int, int]:
@@ -60,10 +184,24 @@ def break_down(num: int, power_step: int) -> Dict[int, int]:
     power_step=1 -> {3:int, 2:int, 1:int, 0:int}\n
     power_step=3 -> {9:int, 6:int, 3:int, 0:int}
 
+    Zero groups are left out, except for the power 0, which is always present.
+
     :param num: The number to be broken down
     :param power_step: The step of the power of 10 to use, the first power of 10 is always 0. I.E.
     :return: Dictionary of the form {power of 10 : integer,...}
     """
+    broken_num: Dict[int, int] = {}
+    for power, chunk in iter_groups(num, power_step):
+        if chunk or not power:
+            broken_num[power] = chunk
+    return broken_num
+
+
+def _check_breakable(num: int | float, power_step: int) -> int:
+    """
+    Checks the arguments of break_down and iter_groups
+    :return: The num as an integer
+    """
     if not isinstance(power_step, int): raise TypeError(f"The power_step must be an integer, got {type(power_step)}")
     if power_step < 1: raise ValueError("The power_step must and be >= 1")
 
@@ -71,17 +209,7 @@ def break_down(num: int, power_step: int) -> Dict[int, int]:
     if not num >= 0: raise ValueError(f"The num must be >= 0, got {num}")
     if not int(num) == num: raise ValueError(f"The num must be an integer or a float with no decimals, got {num}")
 
-    num = int(num)
-
-    broken_num: dict = {0: 0}
-    str_num: str = str(num)
-
-    for power, i in enumerate(batched(str_num, power_step, backwards=True)):
-        num_chunk: int = int("".join(i))
-        if num_chunk:
-            broken_num.update({power * power_step: num_chunk})
-
-    return dict(reversed(list(broken_num.items())))
+    return int(num)
 
 
 def assemble(broken_value: Dict[int, int], /) -> int:
@@ -112,93 +240,847 @@ def split_decimal(num: int | float) -> Tuple[int, float]:
     return int(int_), flt
 
 
+def to_cents(number: int | float | Decimal | str, /, *, rounding: Rounding = "half_even") -> int:
+    """
+    Converts a dollar amount into an exact integer number of cents.\n
+    Only integer arithmetic is used, so the conversion is exact for any size of the number.
+    Amounts with more than 2 decimals are rounded according to the rounding policy.
+    Floats are rounded the same way round(number, 2) does it, and give the cents of the rounded float as it prints.
+    Decimals and strings with more than MAX_DIGITS digits in the whole part are rejected before they are converted.\n
+    I.E.
+        to_cents(Decimal("123.455")) -> 12346\n
+        to_cents("-0.5") -> -50
+
+    :param number: The amount, strings must be plain digits with an optional sign and a "." decimal point
+    :param rounding: What to do with more than 2 decimals:
+    "half_even" (banker's rounding), "half_up", "raise" a ValueError or "warn" (RoundingWarning) and round half to even
+    :return: The amount in cents
+    """
+    _check_rounding(rounding)
+    negative, cents, rounded = _to_cents(number, rounding, 100, MAX_DIGITS)
+    if rounded: _handle_rounding(number, cents, negative=negative, rounding=rounding, report=None, stacklevel=3)
+    return -cents if negative else cents
+
+
 def currency_speller(
-        number: int | float,
+        number: int | float | Decimal,
         *,
         power_names: Dict[int, str],
         num_names: Dict[int, str],
-        capitalize: bool = True
+        capitalize: bool = True,
+        rounding: Rounding = "half_even",
+        report: SpellReport | None = None,
+        unbounded: bool = False,
+        currency: Currency = USD
 ) -> str:
     """
-    Spells a number as a dollar amount.
+    Spells a number as a dollar amount, or as an amount of another currency.
 
-    :param number: The amount to be spelled, number must be within -10^27 < x < 10^27
+    :param number: The amount to be spelled, number must be within -10^27 < x < 10^27, unless unbounded
     :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
     :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
     :param capitalize: Whether to capitalize the output or not
-    :return: Spelled dollar amount
+    :param rounding: What to do with more decimals than the currency has, see to_cents
+    :param report: Where to count the rounded amounts, see SpellReport
+    :param unbounded: Whether to spell the amounts of 10^27 and above as well,
+    the powers of 10 past the power_names are named by scripts.illions
+    :param currency: The words of the units, see Currency and scripts.currency
+    :return: Spelled amount
     """
-    if not isinstance(number, (float, int)): raise TypeError(f"The num must be an integer, got {type(number)}")
-    if abs(number) >= 10 ** 27: raise ValueError("The |num| must be less than 1e27")
+    if not isinstance(number, (float, int, Decimal)): raise TypeError(f"The num must be an integer, got {type(number)}")
     if not isinstance(capitalize, bool):
         raise TypeError(f"Keyword capitalize must be a boolean value, got {type(capitalize)}")
+    if not isinstance(unbounded, bool):
+        raise TypeError(f"Keyword unbounded must be a boolean value, got {type(unbounded)}")
+    _check_rounding(rounding)
+    _check_currency(currency)
 
-    if number != round(number, 2):
-        print(f"The the max number of decimal points exceeded. "
-              f"Rounding to the 2 decimal points. New number: ${round(number, 2)}")
+    return _spell_number(number, capitalize=capitalize, rounding=rounding, report=report,
+                         triplets=_Triplets(num_names=num_names, power_names=power_names),
+                         powers=_compile_powers(power_names), unbounded=unbounded, currency=currency)
 
-    integer: int
-    decimal: float
-    integer, decimal = split_decimal(round(number, 2))
 
-    decimal = abs(decimal)
-    spelled_int_li: List[str] = [] if number >= 0 else ["minus"]
-    num_dict: Dict[int, int] = break_down(abs(integer), 3)
+def spell_cents(
+        cents: int,
+        *,
+        power_names: Dict[int, str],
+        num_names: Dict[int, str],
+        capitalize: bool = True,
+        currency: Currency = USD
+) -> str:
+    """
+    Spells an integer number of cents as a dollar amount, i.e. for ledgers that already store cents.\n
+    spell_cents(123452, ...) == currency_speller(1234.52, ...)
+
+    :param cents: The amount in cents (in the minor units of the currency), must be within -10^29 < x < 10^29
+    :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+    :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+    :param capitalize: Whether to capitalize the output or not
+    :param currency: The words of the units, see Currency
+    :return: Spelled amount
+    """
+    if not isinstance(cents, int): raise TypeError(f"The cents must be an integer, got {type(cents)}")
+    if not isinstance(capitalize, bool):
+        raise TypeError(f"Keyword capitalize must be a boolean value, got {type(capitalize)}")
+    _check_currency(currency)
+
+    return _spell_cents(abs(cents), negative=cents < 0, capitalize=capitalize,
+                        triplets=_Triplets(num_names=num_names, power_names=power_names),
+                        powers=_compile_powers(power_names), units=_compile_units(currency))
+
+
+def spell_many(
+        amounts: Iterable[int | float | Decimal | str],
+        *,
+        power_names: Dict[int, str],
+        num_names: Dict[int, str],
+        capitalize: bool = True,
+        rounding: Rounding = "half_even",
+        report: SpellReport | None = None,
+        currency: Currency = USD
+) -> List[str]:
+    """
+    Spells a batch of numbers as dollar amounts.\n
+    Same output as calling currency_speller on every amount, but the vocabulary is checked
+    and compiled (see Speller) once for the whole batch.
+
+    :param amounts: The amounts to be spelled, every amount must be within -10^27 < x < 10^27
+    :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+    :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+    :param capitalize: Whether to capitalize the output or not
+    :param rounding: What to do with more decimals than the currency has, see to_cents
+    :param report: Where to count the rounded amounts of the batch, see SpellReport
+    :param currency: The words of the units, see Currency
+    :return: List of spelled amounts, in the order of the amounts
+    """
+    if not hasattr(amounts, "__iter__"): raise TypeError("The amounts must have the __iter__ magic method defined.")
+    speller = Speller(power_names=power_names, num_names=num_names, capitalize=capitalize, rounding=rounding,
+                      currency=currency)
+    return speller.spell_many(amounts, report=report)
+
+
+class Speller:
+    """
+    Spells dollar amounts with a fixed vocabulary, the output is the same as of currency_speller.
+    Another currency (see Currency) changes the words of the units and the number of decimals.\n
+    The vocabulary is checked and copied once, when the speller is made, so changing the passed dictionaries
+    afterward does not affect the speller. The words of all the 1000 possible 3-digit groups are spelled upfront,
+    so spelling an amount is a lookup per group plus the power names.\n
+    Meant to be made once (i.e. per locale) and reused for the lifetime of the process.
+    Pickling keeps the compiled tables, so a speller sent to another process is not compiled again.\n
+    Thread-safe: spelling does not change the speller and there is no global state,
+    so one speller can be shared by any number of threads. Its attributes must not be changed after it is made.
+    """
+    __slots__ = ("power_names", "num_names", "capitalize", "rounding", "hundred_and", "unbounded", "currency",
+                 "triplets", "powers", "units")
+
+    def __init__(
+            self,
+            *,
+            power_names: Dict[int, str],
+            num_names: Dict[int, str],
+            capitalize: bool = True,
+            rounding: Rounding = "half_even",
+            hundred_and: bool = False,
+            unbounded: bool = False,
+            currency: Currency = USD
+    ):
+        """
+        :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+        :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+        :param capitalize: Whether to capitalize the output or not
+        :param rounding: What to do with more decimals than the currency has, see to_cents
+        :param hundred_and: Whether to put "and" after the hundreds, the British way: "one hundred and five"
+        :param unbounded: Whether to spell the amounts of 10^27 and above as well, see currency_speller
+        :param currency: The words of the units, see Currency and scripts.currency
+        """
+        _check_names(power_names=power_names, num_names=num_names)
+        if not isinstance(capitalize, bool):
+            raise TypeError(f"Keyword capitalize must be a boolean value, got {type(capitalize)}")
+        if not isinstance(hundred_and, bool):
+            raise TypeError(f"Keyword hundred_and must be a boolean value, got {type(hundred_and)}")
+        if not isinstance(unbounded, bool):
+            raise TypeError(f"Keyword unbounded must be a boolean value, got {type(unbounded)}")
+        _check_rounding(rounding)
+        _check_currency(currency)
+
+        self.power_names: Mapping[int, str] = MappingProxyType(dict(power_names))
+        self.num_names: Mapping[int, str] = MappingProxyType(dict(num_names))
+        self.capitalize: bool = capitalize
+        self.rounding: Rounding = rounding
+        self.hundred_and: bool = hundred_and
+        self.unbounded: bool = unbounded
+        self.currency: Currency = currency
+        self.triplets: Tuple[str, ...] = _compile_triplets(num_names=self.num_names, power_names=self.power_names,
+                                                           hundred_and=hundred_and)
+        self.powers: Tuple[str, ...] = _compile_powers(self.power_names)
+        self.units: _Units = _compile_units(currency)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(power_names={dict(self.power_names)}, num_names={dict(self.num_names)}, " \
+               f"capitalize={self.capitalize}, rounding={self.rounding!r}, hundred_and={self.hundred_and}, " \
+               f"unbounded={self.unbounded}, currency={self.currency!r})"
+
+    # why: MappingProxyType can not be pickled, the names are pickled as plain dictionaries and frozen again
+    def __getstate__(self) -> Dict[str, object]:
+        state = {name: getattr(self, name) for name in Speller.__slots__}
+        state["power_names"], state["num_names"] = dict(self.power_names), dict(self.num_names)
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.power_names = MappingProxyType(self.power_names)
+        self.num_names = MappingProxyType(self.num_names)
+
+    def with_currency(self, currency: Currency) -> "Speller":
+        """
+        Makes a speller of the same class, vocabulary and settings for another currency,
+        the compiled tables are shared with this speller, only the unit words are compiled.\n
+        Made for batches that mix currencies, see scripts.currency.spell_mixed
+
+        :param currency: The words of the units, see Currency
+        :return: The new speller, a CachedSpeller starts with an empty cache
+        """
+        _check_currency(currency)
+        state = self.__getstate__()
+        state["currency"], state["units"] = currency, _compile_units(currency)
+        speller = type(self).__new__(type(self))
+        speller.__setstate__(state)
+        return speller
+
+    def spell(self, number: int | float | Decimal | str, /, *, report: SpellReport | None = None) -> str:
+        """
+        Spells a number as an amount of the currency of the speller, dollars by default.
+
+        :param number: The amount to be spelled, number must be within -10^27 < x < 10^27, unless unbounded
+        (then the Decimals and strings must have at most MAX_DIGITS digits in the whole part).
+        Decimals and digit strings (see to_cents) are spelled exactly, without going through a float
+        :param report: Where to count the rounded amounts, see SpellReport
+        :return: Spelled amount
+        """
+        negative, cents, _ = self._convert(number, report)
+        return self._spell(cents, negative)
+
+    def spell_cents(self, cents: int, /) -> str:
+        """
+        Spells an integer number of cents as a dollar amount, see spell_cents
+
+        :param cents: The amount in cents (in the minor units of the currency), must be within -10^29 < x < 10^29
+        :return: Spelled dollar amount
+        """
+        if not isinstance(cents, int): raise TypeError(f"The cents must be an integer, got {type(cents)}")
+        return self._spell(abs(cents), cents < 0)
+
+    def spell_many(
+            self,
+            amounts: Iterable[int | float | Decimal | str],
+            /,
+            *,
+            report: SpellReport | None = None
+    ) -> List[str]:
+        """
+        Spells a batch of numbers as dollar amounts.
+
+        :param amounts: The amounts to be spelled, every amount must be within -10^27 < x < 10^27
+        :param report: Where to count the rounded amounts of the batch, see SpellReport
+        :return: List of spelled dollar amounts, in the order of the amounts
+        """
+        if not hasattr(amounts, "__iter__"): raise TypeError("The amounts must have the __iter__ magic method defined.")
+        spell = self.spell
+        return [spell(number, report=report) for number in amounts]
+
+    def _convert(self, number: int | float | Decimal | str, report: SpellReport | None) -> Tuple[bool, int, bool]:
+        """
+        Converts an amount into cents under the rounding policy of the speller, see spell
+        :return: Tuple of whether the amount is negative, the absolute amount in cents and whether it was rounded
+        """
+        negative, cents, rounded = _to_cents(number, self.rounding, self.units.scale,
+                                             MAX_DIGITS if self.unbounded else _BOUNDED_DIGITS)
+        if rounded:
+            _handle_rounding(number, cents, negative=negative, rounding=self.rounding, report=report,
+                             currency=self.currency)
+        return negative, cents, rounded
+
+    def _spell(self, cents: int, negative: bool) -> str:
+        return _spell_cents(cents, negative=negative, capitalize=self.capitalize,
+                            triplets=self.triplets, powers=self.powers, unbounded=self.unbounded, units=self.units)
+
+
+class CachedSpeller(Speller):
+    """
+    Speller with a bounded LRU cache of the spelled amounts, for workloads where the same amounts repeat a lot.\n
+    The cache is keyed by the amount in cents, normalized by to_cents, so 9.99, Decimal("9.990") and "9.99"
+    share an entry. The vocabulary and capitalize are fixed per speller, so every cache is for one of them only.\n
+    The cache is safe to use from multiple threads.
+    """
+    __slots__ = ("_cached",)
+
+    def __init__(
+            self,
+            *,
+            power_names: Dict[int, str],
+            num_names: Dict[int, str],
+            capitalize: bool = True,
+            rounding: Rounding = "half_even",
+            hundred_and: bool = False,
+            unbounded: bool = False,
+            currency: Currency = USD,
+            maxsize: int = 4096
+    ):
+        """
+        :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+        :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+        :param capitalize: Whether to capitalize the output or not
+        :param rounding: What to do with more decimals than the currency has, see to_cents
+        :param hundred_and: Whether to put "and" after the hundreds, see Speller
+        :param unbounded: Whether to spell the amounts of 10^27 and above as well, see currency_speller
+        :param currency: The words of the units, see Currency
+        :param maxsize: The max number of the amounts kept, the least recently used are dropped first
+        """
+        if not isinstance(maxsize, int): raise TypeError(f"The maxsize must be an integer, got {type(maxsize)}")
+        if maxsize < 1: raise ValueError(f"The maxsize must be at least one, got {maxsize}")
+
+        super().__init__(power_names=power_names, num_names=num_names, capitalize=capitalize, rounding=rounding,
+                         hundred_and=hundred_and, unbounded=unbounded, currency=currency)
+        self._cached = lru_cache(maxsize=maxsize)(super()._spell)
+
+    # the cache itself is not pickled, the copy starts with an empty cache of the same size
+    def __getstate__(self) -> Dict[str, object]:
+        state = super().__getstate__()
+        state["maxsize"] = self._cached.cache_info().maxsize
+        return state
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        maxsize = state.pop("maxsize")
+        super().__setstate__(state)
+        self._cached = lru_cache(maxsize=maxsize)(super()._spell)
+
+    def cache_info(self):
+        """
+        :return: Named tuple of hits, misses, maxsize and currsize, the same as of functools.lru_cache
+        """
+        return self._cached.cache_info()
+
+    def cache_clear(self) -> None:
+        """
+        Drops all the cached amounts and resets the statistics
+        """
+        self._cached.cache_clear()
+
+    def _spell(self, cents: int, negative: bool) -> str:
+        return self._cached(cents, negative)
+
+
+class IncrementalSpeller(Speller):
+    """
+    Speller for runs of amounts that differ only in the low digits, i.e. amortization schedules and running balances.
+    The output is the same as of Speller.\n
+    The words of the groups above the thousands of the last amount are kept, an amount with the same groups
+    reuses them and spells only its last 3-digit group, its dollars and its cents.
+    The amounts can come in any order, only the amounts next to each other that share the groups are faster.\n
+    Thread-safe, the same as Speller: the kept words are replaced as a whole, a thread never sees a half updated pair.
+    Threads spelling unrelated runs with a shared speller replace each other's words, give them a speller each.
+    """
+    __slots__ = ("_last",)
+
+    def __init__(
+            self,
+            *,
+            power_names: Dict[int, str],
+            num_names: Dict[int, str],
+            capitalize: bool = True,
+            rounding: Rounding = "half_even",
+            hundred_and: bool = False,
+            unbounded: bool = False,
+            currency: Currency = USD
+    ):
+        """
+        :param power_names: The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24
+        :param num_names: The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90
+        :param capitalize: Whether to capitalize the output or not
+        :param rounding: What to do with more decimals than the currency has, see to_cents
+        :param hundred_and: Whether to put "and" after the hundreds, see Speller
+        :param unbounded: Whether to spell the amounts of 10^27 and above as well, see currency_speller
+        :param currency: The words of the units, see Currency
+        """
+        super().__init__(power_names=power_names, num_names=num_names, capitalize=capitalize, rounding=rounding,
+                         hundred_and=hundred_and, unbounded=unbounded, currency=currency)
+        # (the amount of thousands, the words of its groups)
+        self._last: Tuple[int, str] = (0, "")
+
+    # the kept words are not pickled, the copy starts without them
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        super().__setstate__(state)
+        self._last = (0, "")
+
+    def _spell(self, cents: int, negative: bool) -> str:
+        units = self.units
+        integer, decimal = divmod(cents, units.scale)
+        if integer >= 10 ** 27:
+            return super()._spell(cents, negative)
 
-    for power, value in num_dict.items():
-        if not value: continue
+        triplets = self.triplets
+        thousands, value = divmod(integer, 1000)
+        last_thousands, high_words = self._last
+        if thousands != last_thousands:
+            high_words = _spell_thousands(thousands, triplets=triplets, powers=self.powers)
+            self._last = (thousands, high_words)
 
-        broken_value = break_down(value, 1)
+        # the same words as _spell_cents puts together
+        spelled_li: List[str] = ["minus"] if negative else []
+        if high_words:
+            spelled_li.append(high_words)
+        if value:
+            spelled_li.append(triplets[value])
 
-        # extracting 100s
-        if assemble(broken_value) >= 100:
-            hundreds = broken_value[2]
-            spelled_int_li.extend([num_names[hundreds], power_names[2]])
-            broken_value.pop(2)
+        if integer:
+            spelled_li.append(units.major[integer > 1])
 
-        # extracting 10s
-        if 21 <= assemble(broken_value) <= 99:
-            spelled_int_li.append(num_names[broken_value[1] * 10])
-            if broken_value[0] in num_names.keys():
-                spelled_int_li[-1] = spelled_int_li[-1] + "-" + num_names[broken_value[0]]
+        if decimal:
+            spelled_li.extend(["and", triplets[decimal], units.minor[decimal > 1]])
 
-        # special 0-20
+        return_text = " ".join(spelled_li)
+        return return_text.capitalize() if self.capitalize else return_text
+
+
+def _to_cents(
+        number: int | float | Decimal | str,
+        rounding: Rounding = "half_even",
+        scale: int = 100,
+        max_digits: int = _BOUNDED_DIGITS,
+        /
+) -> Tuple[bool, int, bool]:
+    """
+    See to_cents, "raise" and "warn" are left to the caller, the rounding itself is half to even for both
+    :param scale: The minor units in a major unit, see _Units
+    :param max_digits: The max number of digits of the whole part of the Decimals and strings,
+    checked before they are converted, so that i.e. Decimal("1e10000000") is not turned into an integer first
+    :return: Tuple of whether the amount is negative, the absolute amount in cents and whether it was rounded
+    """
+    # the amount is turned into an exact fraction numerator / denominator
+    numerator: int
+    denominator: int
+    if isinstance(number, int):
+        return number < 0, abs(number) * scale, False
+    elif isinstance(number, float):
+        if not isfinite(number): raise ValueError(f"The num must be a finite number, got {number}")
+        if not -_FLOAT_LIMITS[scale] < number < _FLOAT_LIMITS[scale]:
+            return _float_to_cents(number, rounding, scale)
+        numerator, denominator = number.as_integer_ratio()
+    elif isinstance(number, Decimal):
+        if not number.is_finite(): raise ValueError(f"The num must be a finite number, got {number}")
+        if number.is_zero():
+            return False, 0, False
+        exponent = number.adjusted()
+        if exponent >= max_digits: raise ValueError(f"The |num| must be less than 1e{max_digits}")
+        keep = _SCALE_DIGITS[scale] + 1
+        if exponent < -keep:
+            # less than a tenth of the minor unit, rounds to 0 whatever the digits are
+            return number.is_signed(), 0, True
+        if number.as_tuple().exponent < -keep:
+            number = _drop_decimals(number, keep)
+        numerator, denominator = number.as_integer_ratio()
+    elif isinstance(number, str):
+        numerator, denominator = _digits_ratio(number, max_digits, _SCALE_DIGITS[scale] + 1)
+    else:
+        raise TypeError(f"The num must be an integer, float, Decimal or a string of digits, got {type(number)}")
+
+    cents, remainder = divmod(abs(numerator) * scale, denominator)
+
+    if remainder * 2 > denominator or (remainder * 2 == denominator and (cents % 2 or rounding == "half_up")):
+        cents += 1
+
+    if isinstance(number, float):
+        # a float is almost never exactly a whole number of cents,
+        # it counts as rounded only if it is not the closest float to its cents, the same as round(number, 2) != number
+        return numerator < 0, cents, cents / scale != abs(number)
+    return numerator < 0, cents, bool(remainder)
+
+
+# {the minor units in a major unit : the decimals of the minor unit}
+_SCALE_DIGITS: Dict[int, int] = {10 ** digits: digits for digits in range(4)}
+
+# {the minor units in a major unit : the float below which the floats are at most a minor unit apart}
+# why: below it a decimal of fewer digits can not round to the same float as the rounded cents,
+# so the cents of the exact binary value are the cents of repr(round(number, 2)), see _float_to_cents
+_FLOAT_LIMITS: Dict[int, float] = {scale: 2.0 ** 52 / scale for scale in _SCALE_DIGITS}
+
+
+def _float_to_cents(number: float, rounding: Rounding, scale: int, /) -> Tuple[bool, int, bool]:
+    """
+    The cents of round(number, 2), read from its repr, the same as the spelling always did, for the floats
+    past _FLOAT_LIMITS. There the floats are more than a cent apart, the rounded float is only the closest one
+    to the cents and its shortest repr can differ from the cents of its exact binary value in the last digit,
+    i.e. -70595241796859.4 is -70595241796859.40625 in binary, but it is spelled with 40 cents, as it prints
+    """
+    digits = _SCALE_DIGITS[scale]
+    rounded = round(number, digits)
+    text = repr(abs(rounded))
+    if "e" in text:
+        cents = int(Decimal(text).scaleb(digits))
+    else:
+        whole, _, fraction = text.partition(".")
+        # the repr of a float rounded to the digits has at most the digits of decimals, past the trailing zeros
+        cents = int(whole + fraction.rstrip("0").ljust(digits, "0"))
+
+    if rounding == "half_up":
+        # round goes half to even, the exact ties are moved up
+        numerator, denominator = number.as_integer_ratio()
+        down, remainder = divmod(abs(numerator) * scale, denominator)
+        if remainder * 2 == denominator:
+            cents = down + 1
+    return number < 0, cents, rounded != number
+
+
+def _drop_decimals(number: Decimal, keep: int, /) -> Decimal:
+    """
+    Cuts a Decimal to keep decimals, without changing how it rounds to fewer decimals than that:
+    ROUND_05UP moves a cut value away from a last digit of 0 or 5, so a value that was not exact
+    is never taken for an exact one or for a tie
+    """
+    with localcontext() as context:
+        context.prec = max(number.adjusted(), 0) + keep + 2
+        return number.quantize(Decimal((0, (1,), -keep)), rounding=ROUND_05UP)
+
+
+def _digits_ratio(digits: str, max_digits: int | None = None, keep: int | None = None, /) -> Tuple[int, int]:
+    """
+    Parses a string of the form [+-]<digits>[.<digits>] into an exact fraction
+    :param max_digits: The max number of digits of the whole part, without the leading zeros, None for any
+    :param keep: The decimals that matter, the ones past them are replaced by a digit that only keeps them
+    from being exact (see _drop_decimals), None for all of them
+    :return: Tuple of numerator and denominator
+    """
+    sign = digits[:1]
+    unsigned = digits[1:] if sign in ("-", "+") else digits
+    whole, _, decimal = unsigned.partition(".")
+
+    if not (whole or decimal) or not (whole + decimal).isdigit() or not unsigned.isascii():
+        raise ValueError(f"The num must be a string of digits, got '{digits}'")
+    if max_digits is not None and len(whole) > max_digits and len(whole.lstrip("0")) > max_digits:
+        raise ValueError(f"The |num| must be less than 1e{max_digits}")
+    if keep is not None and len(decimal) > keep + 1:
+        decimal = decimal[:keep] + ("1" if decimal[keep:].strip("0") else "")
+
+    numerator = _digits_to_int(whole + decimal)
+    return -numerator if sign == "-" else numerator, 10 ** len(decimal)
+
+
+def _str_digits_limit() -> int:
+    """
+    :return: The max number of digits int and str convert at once (sys.set_int_max_str_digits), 0 for no limit
+    """
+    get_limit = getattr(sys, "get_int_max_str_digits", None)
+    return get_limit() if get_limit else 0
+
+
+def _digits_to_int(digits: str, /) -> int:
+    """
+    Same as int(digits), for any number of digits.
+    Above the digit limit of int the digits are converted in halves, that are joined with a multiplication
+    """
+    limit = _str_digits_limit()
+    if not limit or len(digits) <= limit:
+        return int(digits)
+
+    half = len(digits) // 2
+    return _digits_to_int(digits[:-half]) * 10 ** half + _digits_to_int(digits[-half:])
+
+
+def _int_to_digits(number: int, /) -> str:
+    """
+    Same as str(number) of a non-negative integer, for any number of digits.
+    Above the digit limit of str the number is split in halves by a power of 10, that are converted on their own
+    """
+    limit = _str_digits_limit()
+    # the number of bits is a cheap upper bound of the number of digits
+    if not limit or number.bit_length() * 0.30103 + 1 < limit:
+        return str(number)
+
+    half = int(number.bit_length() * 0.30103) // 2
+    high, low = divmod(number, 10 ** half)
+    return _int_to_digits(high) + _int_to_digits(low).zfill(half)
+
+
+def _check_names(*, power_names: Dict[int, str], num_names: Dict[int, str]) -> None:
+    """
+    Checks that the vocabulary names every number the speller can ask for,
+    so that the spelling itself can index it without guards.
+    """
+    if not isinstance(power_names, dict): raise TypeError(f"The power_names must be a dictionary, got {type(power_names)}")
+    if not isinstance(num_names, dict): raise TypeError(f"The num_names must be a dictionary, got {type(num_names)}")
+
+    for names in (power_names, num_names):
+        for key, name in names.items():
+            if not isinstance(key, int): raise TypeError(f"The names must be keyed by integers, got {type(key)}")
+            if not isinstance(name, str): raise TypeError(f"The names must be strings, got {type(name)}")
+            if not name: raise ValueError(f"The names must not be empty, got an empty name for {key}")
+
+    missing = [key for key in (*range(1, 21), *range(30, 100, 10)) if key not in num_names]
+    if missing: raise ValueError(f"The num_names must name 1-20, 30, 40, 50, 60, 70, 80, 90. Missing: {missing}")
+    if 2 not in power_names: raise ValueError("The power_names must name the hundreds (power 2)")
+
+
+def _spell_triplet(
+        value: int,
+        *,
+        num_names: Mapping[int, str],
+        power_names: Mapping[int, str],
+        hundred_and: bool = False
+) -> List[str]:
+    """
+    Spells a number between 0 and 999, without the power of its group.
+    :param hundred_and: Whether to put "and" between the hundreds and the rest, if there is any rest
+    :return: List of words, some of them may be empty
+    """
+    spelled: List[str] = []
+    hundreds, rest = divmod(value, 100)
+
+    # extracting 100s
+    if hundreds:
+        spelled.extend([num_names[hundreds], power_names[2]])
+        if hundred_and and rest:
+            spelled.append("and")
+
+    # extracting 10s
+    if 21 <= rest <= 99:
+        tens, units = divmod(rest, 10)
+        spelled.append(num_names[tens * 10])
+        if units in num_names.keys():
+            spelled[-1] = spelled[-1] + "-" + num_names[units]
+
+    # special 0-20
+    else:
+        # 0s are not in the NUM_NAMES, so raw indexing might error out
+        spelled.append(num_names.get(rest, ""))
+
+    return spelled
+
+
+def _compile_triplets(
+        *,
+        num_names: Mapping[int, str],
+        power_names: Mapping[int, str],
+        hundred_and: bool = False
+) -> Tuple[str, ...]:
+    """
+    :return: The spelled words of every number between 0 and 999, indexed by the number
+    """
+    return tuple(
+        " ".join(filter(None, _spell_triplet(value, num_names=num_names, power_names=power_names,
+                                             hundred_and=hundred_and)))
+        for value in range(1000)
+    )
+
+
+def _compile_powers(power_names: Mapping[int, str]) -> Tuple[str, ...]:
+    """
+    :return: The name of the power of every 3-digit group below 10^27 with a leading space, indexed by the group
+    """
+    # powers 0, 1 are not in the POWER_NAMES
+    return tuple(" " + power_names[power] if power in power_names else "" for power in range(0, 27, 3))
+
+
+class _Triplets(dict):
+    """
+    {number between 0 and 999 : its spelled words}, the words are spelled on the first lookup.\n
+    Used by the one-off currency_speller calls, where compiling the whole table does not pay off.
+    """
+
+    def __init__(self, *, num_names: Dict[int, str], power_names: Dict[int, str]):
+        super().__init__()
+        self.num_names = num_names
+        self.power_names = power_names
+
+    def __missing__(self, value: int) -> str:
+        words = " ".join(filter(None, _spell_triplet(value, num_names=self.num_names, power_names=self.power_names)))
+        self[value] = words
+        return words
+
+
+def _check_rounding(rounding: Rounding) -> None:
+    if rounding not in ROUNDING_POLICIES:
+        raise ValueError(f"The rounding must be one of {", ".join(ROUNDING_POLICIES)}, got {rounding!r}")
+
+
+def _check_currency(currency: Currency) -> None:
+    """
+    Checks that the currency names every unit the speller can ask for
+    """
+    if not isinstance(currency, Currency): raise TypeError(f"The currency must be a Currency, got {type(currency)}")
+    if not isinstance(currency.code, str) or not currency.code:
+        raise ValueError("The code of the currency must not be empty")
+    if not isinstance(currency.symbol, str):
+        raise TypeError(f"The symbol must be a string, got {type(currency.symbol)}")
+    if not isinstance(currency.digits, int):
+        raise TypeError(f"The digits must be an integer, got {type(currency.digits)}")
+    # why: the minor units are spelled as a single 3-digit group
+    if not 0 <= currency.digits <= 3: raise ValueError(f"The digits must be between 0 and 3, got {currency.digits}")
+
+    for names in (currency.major, currency.minor):
+        if not isinstance(names, (tuple, list)) or len(names) != 2 or not all(isinstance(name, str) for name in names):
+            raise TypeError(f"The names of a unit must be a pair of strings (singular, plural), got {names!r}")
+    if not all(currency.major): raise ValueError(f"The major unit must be named, got {currency.major!r}")
+    if currency.digits and not all(currency.minor):
+        raise ValueError(f"The minor unit must be named, got {currency.minor!r}")
+
+
+def _spell_number(
+        number: int | float | Decimal | str,
+        *,
+        capitalize: bool,
+        rounding: Rounding,
+        report: SpellReport | None,
+        triplets: Sequence[str] | _Triplets,
+        powers: Sequence[str],
+        unbounded: bool = False,
+        currency: Currency = USD
+) -> str:
+    """
+    Spells any supported number, see currency_speller
+
+    :param triplets: The spelled words of the 3-digit groups, see _compile_triplets
+    :param powers: The names of the powers of the 3-digit groups, see _compile_powers
+    """
+    units = _compile_units(currency)
+    negative, cents, rounded = _to_cents(number, rounding, units.scale,
+                                         MAX_DIGITS if unbounded else _BOUNDED_DIGITS)
+    if rounded:
+        _handle_rounding(number, cents, negative=negative, rounding=rounding, report=report, currency=currency)
+    return _spell_cents(cents, negative=negative, capitalize=capitalize, triplets=triplets, powers=powers,
+                        unbounded=unbounded, units=units)
+
+
+def _handle_rounding(
+        number: int | float | Decimal | str,
+        cents: int,
+        *,
+        negative: bool,
+        rounding: Rounding,
+        report: SpellReport | None,
+        currency: Currency = USD,
+        stacklevel: int = 4
+) -> None:
+    """
+    Applies the rounding policy to an amount that had more decimals than the currency
+
+    :param stacklevel: The frame the RoundingWarning is attributed to, counted from here,
+    the default is the caller of Speller.spell and currency_speller, which are two calls away
+    """
+    digits = currency.digits
+    if rounding == "raise":
+        raise ValueError(f"The amount {number} has more than {digits} decimals")
+
+    if report is not None:
+        report.rounded += 1
+
+    if rounding == "warn":
+        whole, minor = divmod(cents, 10 ** digits)
+        message = (f"Rounded {number} to {digits} decimals: {currency.symbol}{"-" if negative else ""}"
+                   f"{_int_to_digits(whole)}{f".{minor:0{digits}}" if digits else ""}")
+        if report is not None:
+            report.warnings.append(message)
         else:
-            v = assemble(broken_value)
-            # 0s are not in the NUM_NAMES, so raw indexing might error out
-            spelled_int_li.append(num_names.get(v, ""))
+            warn(message, RoundingWarning, stacklevel=stacklevel)
 
-        # powers 0, 1 are not in the POWER_NAMES
-        spelled_int_li.append(power_names.get(power, ""))
 
-    if abs(integer) > 1:
-        spelled_int_li.append("dollars")
-    if abs(integer) == 1:
-        spelled_int_li.append("dollar")
+def _spell_cents(
+        cents: int,
+        *,
+        negative: bool,
+        capitalize: bool,
+        triplets: Sequence[str] | _Triplets,
+        powers: Sequence[str],
+        unbounded: bool = False,
+        units: _Units = _DOLLARS
+) -> str:
+    """
+    Spells a non-negative number of cents (of the minor units of the currency) in a single pass,
+    the words of the units are looked up in the compiled units
+
+    :param negative: Whether to spell the amount as negative.
+    Kept apart from the cents, so that i.e. -0.001 is still spelled with a "minus", as it was always done
+    :param unbounded: Whether to spell the amounts of 10^27 and above, see _spell_large_groups
+    :param units: The unit words of the currency, see _compile_units
+    """
+    integer: int
+    decimal: int
+    integer, decimal = divmod(cents, units.scale)
+
+    spelled_groups: List[str] = []
+    if integer < 10 ** 27:
+        # the groups come least significant first
+        whole = integer
+        group = 0
+        while whole:
+            whole, value = divmod(whole, 1000)
+            if value:
+                spelled_groups.append(triplets[value] + powers[group])
+            group += 1
+        spelled_groups.reverse()
+    elif unbounded:
+        spelled_groups = _spell_large_groups(integer, triplets=triplets, powers=powers)
+    else:
+        raise ValueError("The |num| must be less than 1e27")
+
+    spelled_li: List[str] = ["minus"] if negative else []
+    spelled_li.extend(spelled_groups)
+
+    if integer:
+        spelled_li.append(units.major[integer > 1])
     # else: the decimal is being spelled
 
     # handling decimals
-    if not decimal:
-        return_list = filter(lambda x: bool(x), spelled_int_li)
-        return_text = " ".join(return_list).strip()
-        return return_text.capitalize() if capitalize else return_text
-
-    dec_name: str = ""
-    if decimal > 0.01:
-        dec_name = "cents"
-    elif decimal == 0.01:
-        dec_name = "cent"
-
-    dec_norm: int = int(
-        f"{decimal:.2f}"[2:]
-    )
-
-    spelled_dec_li = [
-        "and",
-        *currency_speller(dec_norm, power_names=power_names, num_names=num_names, capitalize=False).split(" ")[:-1],
-        dec_name
-    ]
+    if decimal:
+        spelled_li.extend(["and", triplets[decimal] + powers[0], units.minor[decimal > 1]])
 
-    return_list = filter(lambda x: bool(x), spelled_int_li + spelled_dec_li)
-    return_text = " ".join(return_list).strip()
+    return_text = " ".join(spelled_li)
     return return_text.capitalize() if capitalize else return_text
+
+
+def _spell_thousands(thousands: int, *, triplets: Sequence[str], powers: Sequence[str]) -> str:
+    """
+    Spells the groups of an amount above its last 3-digit group, see IncrementalSpeller
+
+    :param thousands: The amount divided by 1000, below 10^24
+    :return: The words of the groups with their powers, empty for 0
+    """
+    spelled_groups: List[str] = []
+    group = 1
+    while thousands:
+        thousands, value = divmod(thousands, 1000)
+        if value:
+            spelled_groups.append(triplets[value] + powers[group])
+        group += 1
+    spelled_groups.reverse()
+    return " ".join(spelled_groups)
+
+
+def _spell_large_groups(integer: int, *, triplets: Sequence[str] | _Triplets, powers: Sequence[str]) -> List[str]:
+    """
+    Spells the 3-digit groups of an integer of any size, the most significant first.\n
+    The integer is converted to digits once (instead of a divmod per group, that copies the whole integer every time),
+    so the spelling takes time linear in the number of digits, past the conversion itself.
+    The groups past the powers are named by power_name, in the scale of the powers (see _is_long_scale).
+    """
+    long_scale = _is_long_scale(powers)
+    digits = _int_to_digits(integer)
+    digits = digits.zfill(len(digits) + -len(digits) % 3)
+    count = len(digits) // 3
+
+    spelled_groups: List[str] = []
+    for index in range(count):
+        value = int(digits[3 * index:3 * index + 3])
+        if value:
+            group = count - 1 - index
+            power = powers[group] if group < len(powers) else " " + power_name(3 * group, long_scale=long_scale)
+            spelled_groups.append(triplets[value] + power)
+    return spelled_groups
+
+
+def _is_long_scale(powers: Sequence[str]) -> bool:
+    """
+    Whether the power names are of the long scale, that has the "-illiard" names, i.e. "milliard" for 10^9
+    """
+    return any(power.endswith("illiard") for power in powers)
@@ -0,0 +1,408 @@
+"""
+HTTP/JSON service around the speller, standalone and without dependencies besides the standard library.
+
+    python -m scripts.service --port 8080
+
+    GET  /spell?amount=1.234,52$&separator=.&decimal=,
+    POST /spell        {"amount": 1234.52}
+    POST /spell/bulk   {"amounts": [1234.52, "1.234,52$", ...], "locale": "en_GB"}
+
+The amounts are JSON numbers (read as Decimal, so 0.1 stays exactly 0.1) or texts parsed by parse_amount.
+The optional locale picks a vocabulary pack (see scripts.vocab), the default is the one of the service speller.
+Single amounts of concurrent requests are collected for up to --batch-window and spelled together,
+the queue of the waiting amounts is bounded and a full queue answers 503. Connections are kept alive.
+"""
+import argparse
+import asyncio
+import json
+from dataclasses import dataclass
+from decimal import Decimal
+from http import HTTPStatus
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from scripts.app import NUM_NAMES, POWER_NAMES, Separators, Shell, parse_amount
+from scripts.script import _BOUNDED_DIGITS, MAX_DIGITS, Speller
+from scripts.vocab import PACKS, get_speller
+
+# the request line and the headers, longer heads are rejected
+MAX_HEAD: int = 16 * 1024
+
+
+class HTTPError(Exception):
+    """An error answered to the client with the status and the message as {"error": message}"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+class SpellService:
+    """
+    The service, to be started with start (or serve) inside a running event loop.\n
+    Single amounts are spelled in micro-batches: the first waiting amount opens a batch, that takes every amount
+    arriving within batch_window seconds, up to max_batch of them. Bulk requests are spelled at once.
+    """
+
+    def __init__(
+            self,
+            *,
+            speller: Speller,
+            batch_window: float = 0.001,
+            max_batch: int = 512,
+            max_queue: int = 4096,
+            max_bulk: int = 10_000,
+            max_body: int = 1 << 20,
+            keep_alive_timeout: float = 5.0
+    ):
+        """
+        :param speller: The speller to spell the amounts with
+        :param batch_window: How long a batch waits for more amounts, in seconds
+        :param max_batch: The max number of amounts spelled in one batch
+        :param max_queue: The max number of amounts waiting for a batch, the requests above it are answered with 503
+        :param max_bulk: The max number of amounts of a bulk request
+        :param max_body: The max size of a request body in bytes
+        :param keep_alive_timeout: How long an idle connection is kept open, in seconds
+        """
+        if not isinstance(speller, Speller): raise TypeError(f"The speller must be a Speller, got {type(speller)}")
+        if not batch_window >= 0: raise ValueError(f"The batch_window must be >= 0, got {batch_window}")
+        for name, value in (("max_batch", max_batch), ("max_queue", max_queue), ("max_bulk", max_bulk),
+                            ("max_body", max_body)):
+            if not isinstance(value, int): raise TypeError(f"The {name} must be an integer, got {type(value)}")
+            if value < 1: raise ValueError(f"The {name} must be at least one, got {value}")
+        if not keep_alive_timeout > 0: raise ValueError(f"The keep_alive_timeout must be > 0, got {keep_alive_timeout}")
+
+        self.speller = speller
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.max_bulk = max_bulk
+        self.max_body = max_body
+        self.keep_alive_timeout = keep_alive_timeout
+
+        self.batches: int = 0
+        """The number of batches spelled so far"""
+
+        self._queue: asyncio.Queue | None = None
+        self._batcher: asyncio.Task | None = None
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        """
+        Starts listening and the batching, port 0 picks a free port (see the sockets of the returned server)
+        :return: The server
+        """
+        if self._server is not None: raise RuntimeError("The service is already started")
+
+        self._queue = asyncio.Queue(self.max_queue)
+        self._batcher = asyncio.create_task(self._run_batches())
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEAD)
+        return self._server
+
+    async def close(self) -> None:
+        """
+        Stops listening and the batching
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        self._server = self._batcher = self._queue = None
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """
+        Starts the service and serves until cancelled
+        """
+        server = await self.start(host, port)
+        try:
+            await server.serve_forever()
+        finally:
+            await self.close()
+
+    async def spell(self, amount: int | Decimal | float | str, *, speller: Speller | None = None) -> str:
+        """
+        Spells one amount in the next batch
+        :param speller: The speller to spell the amount with, the one of the service by default
+        :raises HTTPError: 503 if the queue of the waiting amounts is full
+        """
+        if self._queue is None: raise RuntimeError("The service is not started")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((amount, speller or self.speller, future))
+        except asyncio.QueueFull:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Too many requests waiting, retry later") from None
+        return await future
+
+    async def _run_batches(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[Any, Speller, asyncio.Future]] = [await self._queue.get()]
+
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                # whatever is already waiting is taken without a timer
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0: break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            self.batches += 1
+            for amount, speller, future in batch:
+                if future.done(): continue  # the client is gone
+                try:
+                    future.set_result(speller.spell(amount))
+                except (TypeError, ValueError) as error:
+                    future.set_exception(HTTPError(HTTPStatus.BAD_REQUEST, str(error)))
+                # why: the batcher serves all the requests, an error of one amount must fail only its own request,
+                # otherwise every later request would wait for a batcher that is gone
+                except Exception as error:
+                    future.set_exception(HTTPError(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                                   f"The amount could not be spelled: {type(error).__name__}"))
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(_read_request(reader, max_body=self.max_body),
+                                                     self.keep_alive_timeout)
+                except HTTPError as error:
+                    # the stream may be left in the middle of a request, so the connection is not reused
+                    _write_response(writer, error.status, {"error": error.message}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None: break
+
+                status, payload = await self._respond(request)
+                _write_response(writer, status, payload, keep_alive=request.keep_alive)
+                await writer.drain()
+                if not request.keep_alive: break
+        except (TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, request: Request) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        try:
+            if request.path == "/spell":
+                if request.method == "GET":
+                    return HTTPStatus.OK, await self._spell_one(request.query)
+                if request.method == "POST":
+                    return HTTPStatus.OK, await self._spell_one(_json_object(request.body))
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET or POST")
+
+            if request.path == "/spell/bulk":
+                if request.method == "POST":
+                    return HTTPStatus.OK, self._spell_bulk(_json_object(request.body))
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+
+            if request.path == "/health":
+                return HTTPStatus.OK, {"status": "ok", "waiting": self._queue.qsize(), "batches": self.batches}
+
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No such path: {request.path}")
+        except HTTPError as error:
+            return error.status, {"error": error.message}
+
+    async def _spell_one(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if "amount" not in params: raise HTTPError(HTTPStatus.BAD_REQUEST, "The amount is missing")
+
+        speller = self._speller_for(params)
+        amount = _parse_amount(params["amount"], *_separators(params), max_digits=_max_digits(speller))
+        if amount is None: raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid amount: {params["amount"]!r}")
+        return {"spelled": await self.spell(amount, speller=speller)}
+
+    def _spell_bulk(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        amounts = params.get("amounts")
+        if not isinstance(amounts, list): raise HTTPError(HTTPStatus.BAD_REQUEST, "The amounts must be a list")
+        if len(amounts) > self.max_bulk:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"At most {self.max_bulk} amounts per request")
+
+        separator, decimal = _separators(params)
+        speller = self._speller_for(params)
+        spelled: List[str | None] = []
+        invalid = 0
+        max_digits = _max_digits(speller)
+        for raw in amounts:
+            amount = _parse_amount(raw, separator, decimal, max_digits=max_digits)
+            try:
+                spelled.append(None if amount is None else speller.spell(amount))
+            except Exception:
+                spelled.append(None)
+            invalid += spelled[-1] is None
+
+        return {"spelled": spelled, "invalid": invalid}
+
+    def _speller_for(self, params: Dict[str, Any]) -> Speller:
+        if "locale" not in params: return self.speller
+        locale = params["locale"]
+        if not isinstance(locale, str): raise HTTPError(HTTPStatus.BAD_REQUEST, "The locale must be a string")
+        if locale not in PACKS:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Unknown locale {locale!r}, the locales are: {", ".join(PACKS)}")
+        try:
+            return get_speller(locale, capitalize=self.speller.capitalize, rounding=self.speller.rounding)
+        except (TypeError, ValueError) as error:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(error)) from None
+
+
+def _separators(params: Dict[str, Any]) -> Separators:
+    separator, decimal = params.get("separator", "."), params.get("decimal", ",")
+    if separator not in Shell.available_sep or decimal not in Shell.available_sep:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"The separators must be one of: {" ".join(Shell.available_sep)}")
+    if separator == decimal:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "The integer and the decimal separators must differ")
+    return Separators(integer=separator, decimal=decimal)
+
+
+def _max_digits(speller: Speller) -> int:
+    """
+    :return: The max number of digits of the whole part of the amounts the speller spells
+    """
+    return MAX_DIGITS if speller.unbounded else _BOUNDED_DIGITS
+
+
+def _parse_amount(
+        raw: Any,
+        separator: str,
+        decimal: str,
+        *,
+        max_digits: int = _BOUNDED_DIGITS
+) -> int | Decimal | str | None:
+    """
+    The amounts are spelled on the event loop, so the ones out of the range of the speller are rejected here,
+    from their exponent or their number of digits, before any of their digits are converted.
+    I.E. {"amount": 1e-100000000} is 26 bytes of JSON, but an exact fraction with 100 million digits
+
+    :param max_digits: The max number of digits of the whole part, see _max_digits
+    :return: The amount of a JSON number or of a text (see parse_amount),
+    None if it is neither or if it is out of the range
+    """
+    # bool is an int, but true is no amount
+    if isinstance(raw, bool): return None
+    # the JSON integers are limited to sys.get_int_max_str_digits() digits, so str is cheap
+    if isinstance(raw, int): return raw if len(str(abs(raw))) <= max_digits else None
+    if isinstance(raw, Decimal):
+        if not raw.is_finite(): return None
+        if not raw.is_zero() and not -max_digits <= raw.adjusted() < max_digits: return None
+        return raw
+    if isinstance(raw, str):
+        amount = parse_amount(raw, separator=separator, decimal=decimal)
+        if amount is not None and len(amount.partition(".")[0].lstrip("-+0")) > max_digits: return None
+        return amount
+    return None
+
+
+def _json_object(body: bytes) -> Dict[str, Any]:
+    try:
+        # why: Decimal keeps the decimals of the JSON numbers exact, 0.1 as a float is 0.1000000000000000055...
+        data = json.loads(body, parse_float=Decimal)
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "The body must be JSON") from None
+    if not isinstance(data, dict): raise HTTPError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+    return data
+
+
+async def _read_request(reader: asyncio.StreamReader, *, max_body: int) -> Request | None:
+    """
+    Reads one HTTP/1.x request
+    :return: The request, None if the client closed the connection
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if not error.partial.strip(): return None
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Incomplete request") from None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "The request head is too large") from None
+
+    request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    try:
+        method, target, version = request_line.split(" ")
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        raise HTTPError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED, f"Unsupported version: {version}")
+
+    headers: Dict[str, str] = {}
+    for line in header_lines:
+        name, colon, value = line.partition(":")
+        if not colon: raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked bodies are not supported, send a Content-Length")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+    if not 0 <= length <= max_body:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"The body must be at most {max_body} bytes")
+    body = await reader.readexactly(length) if length else b""
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+    url = urlsplit(target)
+    return Request(method=method, path=url.path, query=dict(parse_qsl(url.query)), headers=headers, body=body,
+                   keep_alive=keep_alive)
+
+
+def _write_response(writer: asyncio.StreamWriter, status: HTTPStatus, payload: Dict[str, Any], *,
+                    keep_alive: bool) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {"keep-alive" if keep_alive else "close"}\r\n")
+    if status == HTTPStatus.SERVICE_UNAVAILABLE:
+        head += "Retry-After: 1\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n" + body)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.service", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--batch-window", type=float, default=0.001,
+                        help="seconds a batch waits for more amounts (default: %(default)s)")
+    parser.add_argument("--max-batch", type=int, default=512, help="amounts per batch (default: %(default)s)")
+    parser.add_argument("--max-queue", type=int, default=4096,
+                        help="amounts waiting for a batch before answering 503 (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    service = SpellService(speller=Speller(power_names=POWER_NAMES, num_names=NUM_NAMES),
+                           batch_window=args.batch_window, max_batch=args.max_batch, max_queue=args.max_queue)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""
+Spelling of whole NumPy columns at once, for amounts that come as int64 cents or float64 dollars.
+
+NumPy is optional, it is only needed when the functions of this module are called.
+"""
+from typing import Any, List, NamedTuple
+
+from scripts.script import Speller
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+# rows spelled at once, keeps the temporary arrays of strings small
+CHUNK_ROWS: int = 1 << 16
+
+# the largest amount of cents that fits into int64 with room for the divmods
+_MAX_CENTS: int = 2 ** 62
+
+
+def _require_numpy() -> None:
+    if np is None: raise ImportError("The vectorized speller requires numpy, install it with `pip install numpy`")
+
+
+def spell_array(values: Any, *, speller: Speller, cents: bool = False):
+    """
+    Spells a column of amounts as dollar amounts, the output is the same as of speller.spell_many.\n
+    The amounts are split into dollars, cents and 3-digit groups with array operations,
+    the words are gathered from the compiled tables of the speller. The column is processed in chunks of CHUNK_ROWS,
+    so the temporary arrays stay small however long the column is.
+    Amounts that do not fit into int64 cents, float ties that numpy could round differently than round(number, 2),
+    rounding policies other than "half_even" and currencies without 2 decimals fall back to speller.spell,
+    amount by amount.
+
+    :param values: Array-like of float dollars or integer dollars, or of integer cents if cents=True
+    :param speller: The speller, whose vocabulary and settings are used
+    :param cents: Whether the values are integer numbers of cents
+    :return: Object array of the spelled amounts, of the same shape as the values
+    """
+    _require_numpy()
+    if not isinstance(speller, Speller): raise TypeError(f"The speller must be a Speller, got {type(speller)}")
+    if not isinstance(cents, bool): raise TypeError(f"Keyword cents must be a boolean value, got {type(cents)}")
+
+    array = np.asarray(values)
+    shape = array.shape
+    array = array.ravel()
+
+    if cents and array.dtype.kind not in "iu":
+        raise TypeError(f"The cents must be an integer array, got {array.dtype}")
+    if array.dtype.kind not in "iuf":
+        raise TypeError(f"The values must be a numeric array, got {array.dtype}")
+    if array.dtype.kind == "f" and not np.isfinite(array).all():
+        raise ValueError("The values must be finite numbers")
+
+    spelled = np.empty(array.shape, dtype=object)
+    if speller.rounding != "half_even" or speller.units.scale != 100:
+        spelled[:] = _spell_fallback(array, speller=speller, cents=cents)
+        return spelled.reshape(shape)
+
+    # the text is concatenated from pieces, that are looked up whole: [group][the 3-digit value] -> "<words> <power>"
+    pieces = [[words + power if words else "" for words in speller.triplets] for power in speller.powers]
+    cent_piece = [f"and {words}{speller.powers[0]} {speller.units.minor[value > 1]}" if value else ""
+                  for value, words in enumerate(speller.triplets[:100])]
+    minus_piece = ["", "minus"]
+    dollar_piece = ["", *speller.units.major]
+
+    # why: capitalizing the first piece is the same as capitalizing the whole text only if the rest is lowercase
+    lowercase = all(text == text.lower() for piece in (*pieces, cent_piece, dollar_piece) for text in piece)
+    capitalize_first = speller.capitalize and lowercase
+
+    tables = _Tables(
+        groups=[_piece_table(piece, capitalize=capitalize_first) for piece in pieces],
+        cents=_piece_table(cent_piece, capitalize=capitalize_first),
+        minus=_piece_table(minus_piece, capitalize=capitalize_first),
+        dollars=_piece_table(dollar_piece, capitalize=capitalize_first),
+    )
+    capitalize_all = speller.capitalize and not lowercase
+
+    for start in range(0, len(array), CHUNK_ROWS):
+        chunk = array[start:start + CHUNK_ROWS]
+        spelled[start:start + CHUNK_ROWS] = _spell_chunk(chunk, speller=speller, cents=cents, tables=tables,
+                                                         capitalize=capitalize_all)
+
+    return spelled.reshape(shape)
+
+
+class _PieceTable(NamedTuple):
+    first: Any
+    """The texts of the piece when it starts the text"""
+    rest: Any
+    """The texts of the piece with a leading space, when some piece comes before"""
+
+
+class _Tables(NamedTuple):
+    groups: List[_PieceTable]
+    cents: _PieceTable
+    minus: _PieceTable
+    dollars: _PieceTable
+
+
+def _piece_table(texts: List[str], *, capitalize: bool) -> _PieceTable:
+    return _PieceTable(
+        first=np.array([text.capitalize() if capitalize else text for text in texts], dtype=object),
+        rest=np.array([" " + text if text else "" for text in texts], dtype=object),
+    )
+
+
+def _spell_chunk(array, *, speller: Speller, cents: bool, tables: _Tables, capitalize: bool):
+    negative = array < 0
+    if array.dtype.kind == "f":
+        scaled = np.abs(array * 100)
+        # rint rounds half to even, same as round(number, 2), but the multiplication may itself round
+        # a value next to a tie onto the tie, such values are left to the exact path
+        magnitude_f = np.rint(scaled)
+        fallback = (np.abs(np.abs(scaled - magnitude_f) - 0.5) <= scaled * 2 ** -50) | (magnitude_f >= _MAX_CENTS)
+        magnitude = np.where(fallback, 0, magnitude_f).astype(np.int64)
+    else:
+        limit = _MAX_CENTS if cents else _MAX_CENTS // 100
+        fallback = (array >= limit) | (array <= -limit)
+        magnitude = np.abs(np.where(fallback, 0, array)).astype(np.int64)
+        if not cents:
+            magnitude *= 100
+
+    whole, decimal = np.divmod(magnitude, 100)
+
+    # least significant group first
+    groups = []
+    rest = whole
+    while rest.any():
+        rest, value = np.divmod(rest, 1000)
+        groups.append(value)
+
+    pieces = [(tables.minus, negative.view(np.int8))]
+    pieces += [(tables.groups[index], groups[index]) for index in reversed(range(len(groups)))]
+    pieces += [(tables.dollars, np.minimum(whole, 2)), (tables.cents, decimal)]
+
+    spelled = np.full(array.shape, "", dtype=object)
+    started = np.zeros(array.shape, dtype=bool)
+    for table, index in pieces:
+        spelled = spelled + np.where(started, table.rest[index], table.first[index])
+        started |= index != 0
+
+    if capitalize:
+        spelled = np.frompyfunc(str.capitalize, 1, 1)(spelled)
+
+    if fallback.any():
+        spelled[fallback] = _spell_fallback(array[fallback], speller=speller, cents=cents)
+
+    return spelled
+
+
+def _spell_fallback(array, *, speller: Speller, cents: bool) -> List[str]:
+    amounts = array.tolist()
+    if cents:
+        return [speller.spell_cents(amount) for amount in amounts]
+    return speller.spell_many(amounts)
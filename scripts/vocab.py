@@ -0,0 +1,221 @@
+"""
+Vocabulary packs: the names of the numbers and of the powers of 10 of a locale, with the way they are put together.
+
+A pack is checked and compiled into a Speller once per process (see get_speller), the compiled spellers
+are also cached on disk, so that a new process (i.e. a worker) loads the tables instead of spelling them again.
+"""
+import os
+import threading
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Tuple
+
+from scripts.script import Rounding, Speller, _check_names, _check_rounding
+
+NUM_NAMES: Dict[int, str] = {
+    # 0: 'zero',
+    1: 'one',
+    2: 'two',
+    3: 'three',
+    4: 'four',
+    5: 'five',
+    6: 'six',
+    7: 'seven',
+    8: 'eight',
+    9: 'nine',
+    10: 'ten',
+    11: 'eleven',
+    12: 'twelve',
+    13: 'thirteen',
+    14: 'fourteen',
+    15: 'fifteen',
+    16: 'sixteen',
+    17: 'seventeen',
+    18: 'eighteen',
+    19: 'nineteen',
+    20: 'twenty',
+    30: 'thirty',
+    40: 'forty',
+    50: 'fifty',
+    60: 'sixty',
+    70: 'seventy',
+    80: 'eighty',
+    90: 'ninety'
+}
+POWER_NAMES: Dict[int, str] = {
+    2: "hundred",
+    3: "thousand",
+    6: "million",
+    9: "billion",
+    12: "trillion",
+    15: "quadrillion",
+    18: "quintillion",
+    21: "hexillion",
+    24: "heptillion"
+}
+
+# the short scale with the standard names of 10^21 and 10^24
+SHORT_SCALE_NAMES: Dict[int, str] = {**POWER_NAMES, 21: "sextillion", 24: "septillion"}
+
+# the long scale, a new name every 10^6 and the "-illiard" in between
+LONG_SCALE_NAMES: Dict[int, str] = {
+    2: "hundred",
+    3: "thousand",
+    6: "million",
+    9: "milliard",
+    12: "billion",
+    15: "billiard",
+    18: "trillion",
+    21: "trilliard",
+    24: "quadrillion"
+}
+
+# bump when the compiled format of the Speller changes, so that the old cache files are not loaded
+CACHE_VERSION: int = 2
+
+
+class VocabPack(NamedTuple):
+    """The vocabulary of a locale"""
+    name: str
+    num_names: Mapping[int, str]
+    """The names of key numbers, names: 1-20, 30, 40, 50, 60, 70, 80, 90"""
+    power_names: Mapping[int, str]
+    """The names of powers of 10, namely: 2, 3, 6, 9, 12, 15, 18, 21, 24"""
+    hundred_and: bool = False
+    """Whether to put "and" after the hundreds, the British way: "one hundred and five" """
+
+
+# the registered packs, their names are frozen (read-only mappings), so a pack can be read from any thread
+PACKS: Dict[str, VocabPack] = {}
+
+# (pack name, capitalize, rounding) : the speller, so that switching between the packs costs a dict lookup
+_spellers: Dict[Tuple[str, bool, str], Speller] = {}
+
+# guards the changes of PACKS and _spellers, the lookups go without it
+_lock = threading.Lock()
+
+
+def register_pack(pack: VocabPack) -> None:
+    """
+    Checks the pack and makes it available to get_speller under its name, replacing a pack of the same name.
+    The names are copied, changing the passed dictionaries afterward does not affect the pack
+    """
+    if not isinstance(pack, VocabPack): raise TypeError(f"The pack must be a VocabPack, got {type(pack)}")
+    if not isinstance(pack.name, str) or not pack.name: raise ValueError("The name of the pack must not be empty")
+    if not isinstance(pack.hundred_and, bool):
+        raise TypeError(f"The hundred_and must be a boolean value, got {type(pack.hundred_and)}")
+    # the frozen names of a registered pack are accepted as well, i.e. register_pack(PACKS[name]._replace(...))
+    num_names, power_names = (dict(names) if isinstance(names, Mapping) else names
+                              for names in (pack.num_names, pack.power_names))
+    _check_names(power_names=power_names, num_names=num_names)
+
+    frozen = VocabPack(pack.name, MappingProxyType(num_names), MappingProxyType(power_names), pack.hundred_and)
+    with _lock:
+        PACKS[pack.name] = frozen
+        for key in [key for key in _spellers if key[0] == pack.name]:
+            del _spellers[key]
+
+
+def get_speller(
+        name: str = "en_US",
+        *,
+        capitalize: bool = True,
+        rounding: Rounding = "half_even",
+        cache_dir: str | None = None
+) -> Speller:
+    """
+    The speller of a registered pack, compiled on the first call in the process and shared afterward.\n
+    The compiled speller is loaded from the cache_dir if it is there, and saved to it otherwise.
+    A cache that can not be read or written is skipped, the speller is then compiled in memory.
+    Safe to call from multiple threads, a speller is compiled once however many threads ask for it at the same time.
+
+    :param name: The name of the pack, see PACKS
+    :param capitalize: Whether to capitalize the output or not
+    :param rounding: What to do with more than 2 decimals, see to_cents
+    :param cache_dir: The directory of the cached spellers, default_cache_dir() by default
+    :return: The speller, shared by all the callers with the same arguments, so it must not be changed
+    """
+    if name not in PACKS: raise ValueError(f"Unknown pack {name!r}, the packs are: {", ".join(PACKS)}")
+    if not isinstance(capitalize, bool):
+        raise TypeError(f"Keyword capitalize must be a boolean value, got {type(capitalize)}")
+    _check_rounding(rounding)
+
+    key = (name, capitalize, rounding)
+    speller = _spellers.get(key)
+    if speller is not None:
+        return speller
+
+    with _lock:
+        # another thread may have compiled it while this one waited for the lock
+        speller = _spellers.get(key)
+        if speller is not None:
+            return speller
+
+        pack = PACKS[name]
+        path = os.path.join(cache_dir or default_cache_dir(), f"{name}-{_digest(pack, capitalize, rounding)}.pickle")
+        speller = _load(path)
+        if speller is None:
+            speller = Speller(power_names=dict(pack.power_names), num_names=dict(pack.num_names),
+                              capitalize=capitalize, rounding=rounding, hundred_and=pack.hundred_and)
+            _save(path, speller)
+
+        _spellers[key] = speller
+        return speller
+
+
+def default_cache_dir() -> str:
+    """
+    :return: $MONEY_SPELLER_CACHE, or money-speller in the user cache directory ($XDG_CACHE_HOME or ~/.cache)
+    """
+    if "MONEY_SPELLER_CACHE" in os.environ:
+        return os.environ["MONEY_SPELLER_CACHE"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "money-speller")
+
+
+# why: pickle, tempfile and hashlib are imported by the functions that use them, so that importing the vocabularies
+# (i.e. by scripts.app for the names) does not pay for the disk cache
+def _digest(pack: VocabPack, capitalize: bool, rounding: Rounding) -> str:
+    """
+    :return: A short hash of everything the compiled speller depends on, so that a changed pack gets a new file
+    """
+    import hashlib
+
+    key = repr((CACHE_VERSION, sorted(pack.num_names.items()), sorted(pack.power_names.items()), pack.hundred_and,
+                capitalize, rounding))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def _load(path: str) -> Speller | None:
+    import pickle
+
+    try:
+        with open(path, "rb") as file:
+            speller = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+        return None
+    return speller if type(speller) is Speller else None
+
+
+def _save(path: str, speller: Speller) -> None:
+    import pickle
+    import tempfile
+
+    # why: written to a temporary file and renamed, so that concurrent processes never load a half written file
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(speller, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+register_pack(VocabPack("en_US", NUM_NAMES, POWER_NAMES))
+register_pack(VocabPack("en_US_standard", NUM_NAMES, SHORT_SCALE_NAMES))
+register_pack(VocabPack("en_GB", NUM_NAMES, SHORT_SCALE_NAMES, hundred_and=True))
+register_pack(VocabPack("en_GB_long", NUM_NAMES, LONG_SCALE_NAMES, hundred_and=True))
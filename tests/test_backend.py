@@ -1,9 +1,29 @@
+import pickle
+import threading
 import pytest
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP, Decimal, localcontext
 from random import randint
 from scripts.script import *
 from scripts.app import POWER_NAMES, NUM_NAMES
 
 
+def _run_threads(spell, shares):
+    # all the threads start at once, so they do spell at the same time
+    barrier = threading.Barrier(len(shares))
+    got = [None] * len(shares)
+
+    def _work(index):
+        barrier.wait()
+        got[index] = [spell(amount) for amount in shares[index]]
+
+    workers = [threading.Thread(target=_work, args=(index,)) for index in range(len(shares))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return got
+
+
 class TestNumberBreaker:
     # num testing
     def test_float(self):
@@ -124,6 +144,60 @@ class TestBatch:
         with pytest.raises(TypeError): batched("hello", 1, strict="true")
         with pytest.raises(ValueError): batched("hello", 3, strict=True)
 
+    def test_batched_iterator(self):
+        for n in range(1, 6):
+            for backwards in (True, False):
+                expected = list(batched("hello world", n, backwards=backwards))
+                assert expected == list(batched(iter("hello world"), n, backwards=backwards))
+                assert expected == list(batched((c for c in "hello world"), n, backwards=backwards))
+
+    def test_batched_lazy(self):
+        consumed = []
+
+        def numbers():
+            for i in range(10):
+                consumed.append(i)
+                yield i
+
+        batches = batched(numbers(), 3)
+        assert (0, 1, 2) == next(batches)
+        assert [0, 1, 2] == consumed
+
+    def test_batched_range_backwards(self):
+        # reversed(range) walks the range in place, nothing is copied
+        assert [(8, 9), (6, 7), (4, 5)] == list(batched(range(4, 10), 2, backwards=True))
+
+    def test_batch_strict_iterator(self):
+        batches = batched(iter("hello"), 3, strict=True)
+        assert tuple("hel") == next(batches)
+        with pytest.raises(ValueError): next(batches)
+
+
+class TestIterGroups:
+    def test_predefined(self):
+        assert [(6, 1), (3, 0), (0, 234)] == list(iter_groups(1_000_234, 3))
+        assert [(0, 0)] == list(iter_groups(0, 3))
+        assert [(0, 999)] == list(iter_groups(999, 3))
+        assert [(3, 1), (0, 0)] == list(iter_groups(1000, 3))
+        assert [(2, 1), (1, 0), (0, 0)] == list(iter_groups(100, 1))
+
+    def test_same_as_break_down(self):
+        for i in range(10_000):
+            power_step = randint(1, 20)
+            num = randint(0, 10 ** randint(0, 40))
+            groups = list(iter_groups(num, power_step))
+
+            assert num == sum(10 ** power * value for power, value in groups)
+            assert all(0 <= value < 10 ** power_step for _, value in groups[1:])
+            assert 0 < groups[0][1] or num == 0
+            assert break_down(num, power_step) == {power: value for power, value in groups if value or not power}
+
+    def test_bad_input(self):
+        with pytest.raises(ValueError): iter_groups(-1, 3)
+        with pytest.raises(ValueError): iter_groups(1.5, 3)
+        with pytest.raises(TypeError): iter_groups("123", 3)
+        with pytest.raises(ValueError): iter_groups(123, 0)
+
 
 class TestAssembler:
     def test_assembler_edge(self):
@@ -198,3 +272,520 @@ class TestCurrencySpeller:
         }
         for num, expected in predefined_inputs.items():
             assert expected == currency_speller(num, power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+
+class TestSpellMany:
+    def test_same_as_currency_speller(self):
+        amounts = [randint(-10 ** 15, 10 ** 15) for _ in range(1_000)]
+        amounts += [randint(-10 ** 8, 10 ** 8) / 100 for _ in range(1_000)]
+        amounts += [0, 1, -1, 0.01, 0.5, -0.5, 123.1, 499.999]
+
+        expected = [currency_speller(num, power_names=POWER_NAMES, num_names=NUM_NAMES) for num in amounts]
+        assert expected == spell_many(amounts, power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_not_capitalized(self):
+        got = spell_many([14, -1], power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=False)
+        assert ["fourteen dollars", "minus one dollar"] == got
+
+    def test_empty(self):
+        assert [] == spell_many([], power_names=POWER_NAMES, num_names=NUM_NAMES)
+        assert [] == spell_many(iter(()), power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_bad_amounts(self):
+        with pytest.raises(TypeError): spell_many(12345, power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(TypeError): spell_many([[123]], power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(ValueError): spell_many(["12a"], power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(ValueError): spell_many([1, 10 ** 28], power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_bad_names(self):
+        with pytest.raises(TypeError): spell_many([1], power_names=list(POWER_NAMES), num_names=NUM_NAMES)
+        with pytest.raises(TypeError): spell_many([1], power_names=POWER_NAMES, num_names={**NUM_NAMES, 1: 1})
+        with pytest.raises(ValueError): spell_many([1], power_names={3: "thousand"}, num_names=NUM_NAMES)
+        with pytest.raises(ValueError):
+            spell_many([1], power_names=POWER_NAMES, num_names={k: v for k, v in NUM_NAMES.items() if k != 7})
+
+    def test_bad_capitalize_kw(self):
+        with pytest.raises(TypeError):
+            spell_many([1], power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize="yes")
+
+
+class TestSpeller:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_triplet_table(self):
+        assert 1000 == len(self.speller.triplets)
+        assert "" == self.speller.triplets[0]
+        assert "one hundred" == self.speller.triplets[100]
+        assert "nine hundred ninety-nine" == self.speller.triplets[999]
+
+    def test_same_as_currency_speller(self):
+        for _ in range(10_000):
+            num = randint(-10 ** 26, 10 ** 26) // 10 ** randint(0, 26)
+            expected = currency_speller(num, power_names=POWER_NAMES, num_names=NUM_NAMES)
+            assert expected == self.speller.spell(num)
+
+            num = randint(-10 ** 9, 10 ** 9) / 100
+            expected = currency_speller(num, power_names=POWER_NAMES, num_names=NUM_NAMES)
+            assert expected == self.speller.spell(num)
+
+    def test_bad_number(self):
+        with pytest.raises(TypeError): self.speller.spell([123])
+        with pytest.raises(ValueError): self.speller.spell(float("nan"))
+        with pytest.raises(ValueError): self.speller.spell(10 ** 27)
+        with pytest.raises(TypeError): self.speller.spell_many(123)
+
+    def test_slots(self):
+        assert not hasattr(self.speller, "__dict__")
+        with pytest.raises(AttributeError): self.speller.locale = "en_GB"
+
+    def test_frozen_vocabulary(self):
+        num_names = dict(NUM_NAMES)
+        speller = Speller(power_names=POWER_NAMES, num_names=num_names)
+        num_names[1] = "uno"
+
+        assert "One dollar" == speller.spell(1)
+        with pytest.raises(TypeError): speller.num_names[1] = "uno"
+
+    def test_bad_vocabulary(self):
+        with pytest.raises(TypeError): Speller(power_names=POWER_NAMES, num_names=None)
+        with pytest.raises(ValueError): Speller(power_names={}, num_names=NUM_NAMES)
+        with pytest.raises(ValueError): Speller(power_names=POWER_NAMES, num_names={**NUM_NAMES, 1: ""})
+        with pytest.raises(TypeError): Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=1)
+
+
+class TestToCents:
+    def test_predefined(self):
+        predefined_inputs = {
+            0: 0,
+            14: 1400,
+            -12: -1200,
+            123.1: 12310,
+            -123.4: -12340,
+            499.999: 50000,
+            0.125: 12,
+            Decimal("123.455"): 12346,
+            Decimal("123.465"): 12346,
+            Decimal("-0.5"): -50,
+            "1234.52": 123452,
+            "-0.001": 0,
+            "+.5": 50,
+            "7.": 700,
+        }
+        for num, expected in predefined_inputs.items():
+            assert expected == to_cents(num)
+
+    def test_exact_near_limit(self):
+        for _ in range(10_000):
+            cents = randint(-10 ** 29 + 1, 10 ** 29 - 1)
+            sign = "-" if cents < 0 else ""
+            text = f"{sign}{abs(cents) // 100}.{abs(cents) % 100:02}"
+            assert cents == to_cents(text)
+            assert cents == to_cents(Decimal(text))
+
+    def test_same_as_round(self):
+        for _ in range(10_000):
+            num = randint(-10 ** 9, 10 ** 9) / 1000
+            assert round(round(num, 2) * 100) == to_cents(num)
+
+    def test_large_floats(self):
+        # past 2^46 the floats are more than a cent apart, the cents are the ones of round(num, 2) as it prints
+        assert -7059524179685940 == to_cents(-70595241796859.4)
+        assert "forty cents" == Speller(power_names=POWER_NAMES, num_names=NUM_NAMES).spell(-70595241796859.4)[-11:]
+        for _ in range(10_000):
+            num = randint(-10 ** 20, 10 ** 20) / 10 ** randint(0, 6)
+            assert int(Decimal(repr(round(num, 2))).scaleb(2)) == to_cents(num)
+
+    def test_many_decimals(self):
+        with localcontext() as context:
+            context.prec = 100
+            for rounding, mode in (("half_even", ROUND_HALF_EVEN), ("half_up", ROUND_HALF_UP)):
+                texts = [f"{randint(0, 10 ** 6)}.{randint(0, 10 ** 40):040}" for _ in range(2_000)]
+                texts += ["0.125", "0.1250000000000", "0.12500000000001", "-2.6749999999999", "0.01500"]
+                for text in texts:
+                    expected = int(Decimal(text).scaleb(2).quantize(Decimal(1), rounding=mode))
+                    assert expected == to_cents(text, rounding=rounding)
+                    assert expected == to_cents(Decimal(text), rounding=rounding)
+        with pytest.raises(ValueError): to_cents("1." + "0" * 1_000 + "1", rounding="raise")
+        assert 100 == to_cents("1." + "0" * 1_000)
+
+    def test_out_of_range(self):
+        # rejected or rounded away before the digits are converted into an integer
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        assert "" == speller.spell(Decimal("1e-100000000"))
+        assert "Minus" == speller.spell(Decimal("-1e-100000000"))
+        for number in (Decimal("1e10000000"), Decimal("-1e27"), "1" * 1_000_000, "0" * 10 + "1" * 28):
+            with pytest.raises(ValueError): speller.spell(number)
+        assert "One dollar" == speller.spell("0" * 1_000 + "1")
+        assert speller.spell(10 ** 27 - 1) == speller.spell("0" * 10 + "9" * 27)
+
+        unbounded = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, unbounded=True)
+        with pytest.raises(ValueError): unbounded.spell(Decimal("1e10000000"))
+        with pytest.raises(ValueError): unbounded.spell("1" * (MAX_DIGITS + 1))
+        with pytest.raises(ValueError): to_cents(Decimal(f"1e{MAX_DIGITS}"))
+
+    def test_bad_input(self):
+        for val in ("", "-", ".", "1e5", "1.2.3", " 12", "12$", "١٢", "--1"):
+            with pytest.raises(ValueError): to_cents(val)
+        for val in (float("inf"), float("nan"), Decimal("NaN"), Decimal("-Infinity")):
+            with pytest.raises(ValueError): to_cents(val)
+        with pytest.raises(TypeError): to_cents([123])
+        with pytest.raises(TypeError): to_cents(None)
+
+    def test_speller_exact_inputs(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        expected = ("Nine hundred ninety-nine heptillion nine hundred ninety-nine hexillion nine hundred ninety-nine "
+                    "quintillion nine hundred ninety-nine quadrillion nine hundred ninety-nine trillion nine hundred "
+                    "ninety-nine billion nine hundred ninety-nine million nine hundred ninety-nine thousand "
+                    "nine hundred ninety-nine dollars and ninety-nine cents")
+        assert expected == speller.spell("999999999999999999999999999.99")
+        assert expected == speller.spell(Decimal("999999999999999999999999999.99"))
+        assert "Minus one dollar and one cent" == speller.spell("-1.01")
+        with pytest.raises(ValueError): speller.spell("999999999999999999999999999.999")
+
+
+class TestSpellCents:
+    def test_same_as_currency_speller(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        for _ in range(10_000):
+            cents = randint(-10 ** 11, 10 ** 11)
+            expected = currency_speller(Decimal(cents) / 100, power_names=POWER_NAMES, num_names=NUM_NAMES)
+            assert expected == spell_cents(cents, power_names=POWER_NAMES, num_names=NUM_NAMES)
+            assert expected == speller.spell_cents(cents)
+
+    def test_predefined(self):
+        predefined_inputs = {
+            0: "",
+            1: "And one cent",
+            -50: "Minus and fifty cents",
+            100: "One dollar",
+            123452: "One thousand two hundred thirty-four dollars and fifty-two cents",
+        }
+        for cents, expected in predefined_inputs.items():
+            assert expected == spell_cents(cents, power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_bad_input(self):
+        with pytest.raises(TypeError): spell_cents(12.5, power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(TypeError): spell_cents("1250", power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(ValueError): spell_cents(10 ** 29, power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(TypeError):
+            spell_cents(1, power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=None)
+
+
+class TestCachedSpeller:
+    def test_same_as_speller(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        cached = CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, maxsize=100)
+        for _ in range(10_000):
+            num = randint(-500, 500) / 100
+            assert speller.spell(num) == cached.spell(num)
+        assert cached.cache_info().currsize == 100
+
+    def test_statistics(self):
+        cached = CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, maxsize=2)
+        for num in (9.99, Decimal("9.990"), "9.99", 999, 100, 9.99):
+            cached.spell(num)
+        cached.spell_cents(999)
+
+        hits, misses, maxsize, currsize = cached.cache_info()
+        assert (3, 4, 2, 2) == (hits, misses, maxsize, currsize)
+
+        cached.cache_clear()
+        assert (0, 0, 2, 0) == tuple(cached.cache_info())
+
+    def test_bad_maxsize(self):
+        with pytest.raises(TypeError): CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, maxsize=None)
+        with pytest.raises(ValueError): CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, maxsize=0)
+
+
+class TestRounding:
+    def test_no_stdout(self, capsys):
+        currency_speller(123.456, power_names=POWER_NAMES, num_names=NUM_NAMES)
+        spell_many([123.456, Decimal("1.001")], power_names=POWER_NAMES, num_names=NUM_NAMES)
+        assert "" == capsys.readouterr().out
+
+    def test_policies(self):
+        predefined_inputs = {
+            "half_even": {Decimal("0.125"): 12, "0.135": 14, "-0.125": -12, 0.125: 12},
+            "half_up": {Decimal("0.125"): 13, "0.135": 14, "-0.125": -13, 0.125: 13, 1.005: 100},
+        }
+        for rounding, io in predefined_inputs.items():
+            for num, expected in io.items():
+                assert expected == to_cents(num, rounding=rounding)
+
+    def test_raise(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="raise")
+        assert "One dollar and ten cents" == speller.spell(1.1)
+        assert "One dollar and ten cents" == speller.spell("1.100")
+        with pytest.raises(ValueError): speller.spell("1.101")
+        with pytest.raises(ValueError): to_cents(0.001, rounding="raise")
+
+    def test_warn(self):
+        with pytest.warns(RoundingWarning) as record:
+            currency_speller(1.005, power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="warn")
+            Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="warn").spell(1.005)
+            to_cents("1.005", rounding="warn")
+        # every warning points at the line that called the public function
+        assert [__file__] * 3 == [warning.filename for warning in record]
+
+    def test_report(self):
+        amounts = [1.1, 1.234, "5.555", Decimal("2.00"), -0.001]
+
+        report = SpellReport()
+        spell_many(amounts, power_names=POWER_NAMES, num_names=NUM_NAMES, report=report)
+        assert 3 == report.rounded
+        assert [] == report.warnings
+
+        report = SpellReport()
+        spell_many(amounts, power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="warn", report=report)
+        assert 3 == report.rounded
+        assert ["Rounded 1.234 to 2 decimals: $1.23",
+                "Rounded 5.555 to 2 decimals: $5.56",
+                "Rounded -0.001 to 2 decimals: $-0.00"] == report.warnings
+
+    def test_bad_policy(self):
+        with pytest.raises(ValueError): to_cents(1, rounding="up")
+        with pytest.raises(ValueError): Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding=None)
+        with pytest.raises(ValueError):
+            currency_speller(1, power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="truncate")
+
+
+class TestSpellerPickle:
+    def test_round_trip(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=False, rounding="half_up",
+                          hundred_and=True)
+        copy = pickle.loads(pickle.dumps(speller))
+
+        assert repr(speller) == repr(copy)
+        assert speller.triplets == copy.triplets
+        assert speller.spell(101.125) == copy.spell(101.125)
+        with pytest.raises(TypeError): copy.num_names[1] = "uno"
+
+    def test_hundred_and(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, hundred_and=True)
+        assert "One hundred and five dollars and ten cents" == speller.spell(105.1)
+        assert "Nine hundred dollars" == speller.spell(900)
+        assert "Minus one million one hundred and twelve dollars" == speller.spell(-1_000_112)
+        with pytest.raises(TypeError): Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, hundred_and="yes")
+
+    def test_cached_speller(self):
+        speller = CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, maxsize=16)
+        speller.spell(1)
+        copy = pickle.loads(pickle.dumps(speller))
+
+        assert 16 == copy.cache_info().maxsize
+        assert 0 == copy.cache_info().currsize
+        assert "One dollar" == copy.spell(1)
+
+
+class TestIncrementalSpeller:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_runs(self):
+        speller = IncrementalSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        for _ in range(20):
+            first, step = randint(-10 ** 28, 10 ** 28), randint(1, 10 ** randint(0, 6))
+            cents = [first + index * step for index in range(500)]
+            assert [self.speller.spell_cents(amount) for amount in cents] == \
+                   [speller.spell_cents(amount) for amount in cents]
+
+    def test_random(self):
+        speller = IncrementalSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        amounts = [randint(-10 ** 29 + 1, 10 ** 29 - 1) // 10 ** randint(0, 28) for _ in range(5_000)]
+        amounts += [0, 1, 99, 100, 101, 199, 200, 100_000, 100_001, -100_000]
+        assert [self.speller.spell_cents(amount) for amount in amounts] == \
+               [speller.spell_cents(amount) for amount in amounts]
+        assert self.speller.spell_many([1.005, "2.5", Decimal("-0.001")]) == \
+               speller.spell_many([1.005, "2.5", Decimal("-0.001")])
+
+    def test_settings(self):
+        for kwargs in ({"capitalize": False}, {"hundred_and": True}, {"unbounded": True}):
+            reference = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, **kwargs)
+            speller = IncrementalSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, **kwargs)
+            cents = [10 ** 31 + 10 ** 26 * 7 + index * 100_001 for index in range(200)]
+            cents += [123_456_700 + index for index in range(200)]
+            if "unbounded" not in kwargs:
+                cents = cents[200:]
+            assert [reference.spell_cents(amount) for amount in cents] == \
+                   [speller.spell_cents(amount) for amount in cents]
+
+        with pytest.raises(ValueError): IncrementalSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES).spell(10 ** 27)
+
+    def test_pickle(self):
+        speller = IncrementalSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        speller.spell(1234)
+        copy = pickle.loads(pickle.dumps(speller))
+        assert (0, "") == copy._last
+        assert "One thousand two hundred thirty-four dollars" == copy.spell(1234)
+
+    def test_threads(self):
+        speller = IncrementalSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        shares = [[10 ** (3 * index + 3) + step for step in range(1_000)] for index in range(8)]
+        got = _run_threads(speller.spell, shares)
+        assert [self.speller.spell_many(share) for share in shares] == got
+
+
+class TestCurrency:
+    EURO = Currency("EUR", "€", ("euro", "euros"), ("cent", "cents"))
+    YEN = Currency("JPY", "¥", ("yen", "yen"), ("", ""), digits=0)
+    DINAR = Currency("KWD", "KD ", ("dinar", "dinars"), ("fils", "fils"), digits=3)
+
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_dollars_by_default(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=USD)
+        amounts = [randint(-10 ** 29 + 1, 10 ** 29 - 1) // 10 ** randint(0, 28) / 100 for _ in range(2_000)]
+        assert self.speller.spell_many(amounts) == speller.spell_many(amounts)
+        assert USD == self.speller.currency
+
+    def test_predefined(self):
+        predefined_inputs = {
+            self.EURO: {1: "One euro", 2.5: "Two euros and fifty cents", 0.01: "And one cent"},
+            self.YEN: {1: "One yen", 1_000: "One thousand yen", 2.5: "Two yen", 3.5: "Four yen", 0.4: ""},
+            self.DINAR: {1.001: "One dinar and one fils", "0.5": "And five hundred fils",
+                         -2.125: "Minus two dinars and one hundred twenty-five fils", "1.0005": "One dinar"},
+            Currency("GBP", "£", ("pound", "pounds"), ("penny", "pence")): {2.01: "Two pounds and one penny",
+                                                                           1.99: "One pound and ninety-nine pence"},
+        }
+        for currency, io in predefined_inputs.items():
+            speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=currency)
+            for num, expected in io.items():
+                assert expected == speller.spell(num)
+                assert expected == currency_speller(num if not isinstance(num, str) else Decimal(num),
+                                                    power_names=POWER_NAMES, num_names=NUM_NAMES, currency=currency)
+
+    def test_minor_units(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=self.DINAR)
+        for _ in range(1_000):
+            fils = randint(-10 ** 20, 10 ** 20)
+            expected = speller.spell(Decimal(fils).scaleb(-3))
+            assert expected == speller.spell_cents(fils)
+            assert expected == spell_cents(fils, power_names=POWER_NAMES, num_names=NUM_NAMES, currency=self.DINAR)
+
+    def test_rounding(self):
+        report = SpellReport()
+        for currency, amounts in ((self.YEN, [12.5, "-0.7", 3]), (self.DINAR, ["1.0005", 2.25, Decimal("-0.0004")])):
+            speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=currency, rounding="warn")
+            speller.spell_many(amounts, report=report)
+        assert ["Rounded 12.5 to 0 decimals: ¥12",
+                "Rounded -0.7 to 0 decimals: ¥-1",
+                "Rounded 1.0005 to 3 decimals: KD 1.000",
+                "Rounded -0.0004 to 3 decimals: KD -0.000"] == report.warnings
+
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=self.DINAR, rounding="raise")
+        assert "One dinar and one hundred fils" == speller.spell(1.1)
+        with pytest.raises(ValueError, match="3 decimals"): speller.spell("1.0001")
+
+    def test_with_currency(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=False, hundred_and=True)
+        euros = speller.with_currency(self.EURO)
+        assert "one hundred and five euros and ten cents" == euros.spell(105.1)
+        assert speller.triplets is euros.triplets
+        assert USD == speller.currency
+
+        for kind in (CachedSpeller, IncrementalSpeller):
+            dinars = kind(power_names=POWER_NAMES, num_names=NUM_NAMES).with_currency(self.DINAR)
+            assert kind is type(dinars)
+            fils = [123_456_000 + index * 7 for index in range(300)] + [randint(0, 10 ** 29) for _ in range(300)]
+            expected = [Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=self.DINAR).spell_cents(amount)
+                        for amount in fils]
+            assert expected == [dinars.spell_cents(amount) for amount in fils]
+
+    def test_pickle(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=self.YEN)
+        copy = pickle.loads(pickle.dumps(speller))
+        assert repr(speller) == repr(copy)
+        assert "Twelve yen" == copy.spell(12)
+
+    def test_bad_currency(self):
+        bad_currencies = {
+            TypeError: ["USD", ("USD", "$", ("dollar", "dollars"), ("cent", "cents")),
+                        Currency("USD", "$", "dollars", ("cent", "cents")),
+                        Currency("USD", "$", ("dollar", "dollars"), ("cent", "cents"), digits=2.0)],
+            ValueError: [Currency("", "$", ("dollar", "dollars"), ("cent", "cents")),
+                         Currency("USD", "$", ("dollar", ""), ("cent", "cents")),
+                         Currency("USD", "$", ("dollar", "dollars"), ("", "")),
+                         Currency("XXX", "", ("unit", "units"), ("tick", "ticks"), digits=4)],
+        }
+        for error, currencies in bad_currencies.items():
+            for currency in currencies:
+                with pytest.raises(error): Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=currency)
+                with pytest.raises(error): self.speller.with_currency(currency)
+        with pytest.raises(TypeError): currency_speller(1, power_names=POWER_NAMES, num_names=NUM_NAMES, currency="EUR")
+
+
+class TestUnbounded:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, unbounded=True)
+
+    def test_same_below_limit(self):
+        bounded = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        for i in range(10_000):
+            amount = randint(-10 ** 29, 10 ** 29) / 100
+            assert bounded.spell(amount) == self.speller.spell(amount)
+
+    def test_predefined(self):
+        assert "One octillion dollars" == self.speller.spell(10 ** 27)
+        assert "One octillion five dollars and one cent" == self.speller.spell(Decimal("1" + "0" * 26 + "5.01"))
+        assert "Minus seven millinillion dollars" == self.speller.spell(-7 * 10 ** 3003)
+        assert "Twelve decillion one heptillion dollars" == self.speller.spell(12 * 10 ** 33 + 10 ** 24)
+        assert "One octillion dollars" == currency_speller(10 ** 27, power_names=POWER_NAMES, num_names=NUM_NAMES,
+                                                           unbounded=True)
+
+    def test_past_str_digits_limit(self):
+        # 10_000 digits, more than int and str convert by default
+        number = 7 * 10 ** 9_999 + 12
+        expected = "Seven trilliduotrigintatrecentillion twelve dollars"
+        assert expected == self.speller.spell(number)
+        assert expected == self.speller.spell("7" + "0" * 9_997 + "12")
+        assert expected == self.speller.spell(Decimal("7" + "0" * 9_997 + "12"))
+
+    def test_digit_string(self):
+        assert self.speller.spell(10 ** 5_000) == self.speller.spell("1" + "0" * 5_000)
+
+    def test_long_scale(self):
+        from scripts.vocab import LONG_SCALE_NAMES
+        speller = Speller(power_names=LONG_SCALE_NAMES, num_names=NUM_NAMES, unbounded=True)
+        assert "One quadrillion dollars" == speller.spell(10 ** 24)
+        assert "One quadrilliard dollars" == speller.spell(10 ** 27)
+        assert "Two quintillion three quadrilliard dollars" == speller.spell(2 * 10 ** 30 + 3 * 10 ** 27)
+        assert "One decilliard one decillion dollars" == speller.spell(10 ** 63 + 10 ** 60)
+
+    def test_bounded_raises(self):
+        with pytest.raises(ValueError): Speller(power_names=POWER_NAMES, num_names=NUM_NAMES).spell(10 ** 27)
+        with pytest.raises(TypeError): Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, unbounded=1)
+
+
+class TestThreads:
+    THREADS = 8
+
+    def test_shared_speller(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        shares = [[randint(-10 ** 26, 10 ** 26) / 100 for _ in range(2_000)] for _ in range(self.THREADS)]
+
+        got = _run_threads(speller.spell, shares)
+        assert [speller.spell_many(share) for share in shares] == got
+
+    def test_shared_cached_speller(self):
+        speller = CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, maxsize=64)
+        reference = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        # few distinct amounts, so the threads hit and evict the same entries
+        shares = [[randint(0, 200) for _ in range(2_000)] for _ in range(self.THREADS)]
+
+        got = _run_threads(speller.spell, shares)
+        assert [reference.spell_many(share) for share in shares] == got
+
+    def test_reports_per_thread(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="warn")
+        reports = [SpellReport() for _ in range(self.THREADS)]
+        shares = [[f"{index}.005"] * 500 for index in range(self.THREADS)]
+
+        _run_threads(lambda amount: speller.spell(amount, report=reports[int(amount[0])]), shares)
+        assert [500] * self.THREADS == [report.rounded for report in reports]
+        assert all(len(set(report.warnings)) == 1 for report in reports)
@@ -0,0 +1,49 @@
+import json
+import pytest
+from scripts.bench import *
+
+
+class TestBenchmarks:
+    def test_run(self):
+        results = run(20, repeat=1)
+        for dist_name in DISTRIBUTIONS:
+            assert f"currency_speller/{dist_name}" in results
+            assert f"parse_num/{dist_name}" in results
+            assert f"parse_cents/{dist_name}" in results
+        for sequence_name in SEQUENCES:
+            assert f"IncrementalSpeller.spell/{sequence_name}" in results
+
+        for result in results.values():
+            assert result["ops_per_sec"] > 0
+            assert result["p50_ns"] <= result["p99_ns"]
+
+    def test_compare(self):
+        baseline = {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}}
+        results = {"a": {"ops_per_sec": 95.0}, "b": {"ops_per_sec": 50.0}, "c": {"ops_per_sec": 1.0}}
+
+        regressions = compare(results, baseline, tolerance=0.1)
+        assert 1 == len(regressions)
+        assert regressions[0].startswith("b:")
+
+    def test_main_baseline(self, tmp_path, capsys):
+        baseline = tmp_path / "baseline.json"
+        assert 0 == main(["-n", "5", "--repeat", "1", "--save", str(baseline)])
+
+        saved = json.loads(baseline.read_text(encoding="utf-8"))
+        for result in saved["results"].values():
+            result["ops_per_sec"] *= 1000
+        baseline.write_text(json.dumps(saved), encoding="utf-8")
+
+        assert 1 == main(["-n", "5", "--repeat", "1", "--baseline", str(baseline)])
+        assert "REGRESSION" in capsys.readouterr().err
+
+    def test_bad_input(self):
+        with pytest.raises(ValueError): run(0)
+        with pytest.raises(TypeError): run(1.5)
+        with pytest.raises(ValueError): compare({}, {}, tolerance=1)
+
+    def test_thread_scaling(self):
+        scaling = thread_scaling(200, threads=3)
+        assert [1, 2, 3] == list(scaling)
+        assert all(ops > 0 for ops in scaling.values())
+        with pytest.raises(ValueError): thread_scaling(10, threads=0)
@@ -0,0 +1,147 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from random import randint
+import pytest
+from scripts.cli import *
+from scripts.app import NUM_NAMES, POWER_NAMES
+
+
+class TestStream:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_lines_aligned(self):
+        infile = io.StringIO("14$\n$-12\nhello\n\n1.234,52$\n")
+        outfile = io.StringIO()
+
+        invalid = stream(infile, outfile, speller=self.speller)
+
+        assert 2 == invalid
+        assert outfile.getvalue() == ("Fourteen dollars\n"
+                                      "Minus twelve dollars\n"
+                                      "\n"
+                                      "\n"
+                                      "One thousand two hundred thirty-four dollars and fifty-two cents\n")
+
+    def test_out_of_range(self):
+        outfile = io.StringIO()
+        invalid = stream(["12$\n", "1" + "0" * 27 + "$\n", "5$\n"], outfile, speller=self.speller)
+        assert 1 == invalid
+        assert "Twelve dollars\n\nFive dollars\n" == outfile.getvalue()
+
+    def test_separators(self):
+        outfile = io.StringIO()
+        stream(["1,234.52$"], outfile, speller=self.speller, separator=",", decimal=".")
+        assert "One thousand two hundred thirty-four dollars and fifty-two cents\n" == outfile.getvalue()
+
+    def test_many_lines(self):
+        lines = [f"{i}$\n" for i in range(3 * WRITE_BATCH + 7)]
+        outfile = io.StringIO()
+        stream(lines, outfile, speller=self.speller)
+
+        got = outfile.getvalue().splitlines()
+        assert len(lines) == len(got)
+        assert "Five dollars" == got[5]
+
+    def test_main_files(self, tmp_path, capsys):
+        src, dst = tmp_path / "amounts.txt", tmp_path / "words.txt"
+        src.write_text("1$\n123,456$\nbad\n", encoding="utf-8")
+
+        assert 0 == main(["--stream", "-i", str(src), "-o", str(dst)])
+        assert "One dollar\nOne hundred twenty-three dollars and forty-six cents\n\n" == dst.read_text(encoding="utf-8")
+        captured = capsys.readouterr()
+        assert "1 line(s) could not be parsed" in captured.err
+        assert "1 amount(s) had more than 2 decimals and were rounded" in captured.err
+        assert "" == captured.out
+
+        assert 1 == main(["--stream", "-i", str(tmp_path / "missing.txt"), "-o", str(dst)])
+        assert "run: " in capsys.readouterr().err
+        assert 1 == main(["--stream", "-i", str(src), "-o", str(tmp_path / "missing" / "words.txt")])
+        assert "run: " in capsys.readouterr().err
+
+    def test_main_same_separators(self):
+        with pytest.raises(SystemExit): main(["--stream", "--separator", ",", "--decimal", ","])
+
+
+class TestStreamParallel:
+    def test_same_as_stream(self):
+        lines = [f"{randint(-10 ** 9, 10 ** 9)},{randint(0, 99)}$\n" for _ in range(2_000)] + ["bad\n"]
+        expected = io.StringIO()
+        stream(lines, expected, speller=Speller(power_names=POWER_NAMES, num_names=NUM_NAMES))
+
+        got = io.StringIO()
+        invalid = stream_parallel(lines, got, workers=2, chunk_size=101)
+        assert 1 == invalid
+        assert expected.getvalue() == got.getvalue()
+
+
+class TestOneShot:
+    def test_spell(self, capsys):
+        assert 0 == main(["spell", "1.234,52$"])
+        assert "One thousand two hundred thirty-four dollars and fifty-two cents\n" == capsys.readouterr().out
+
+        assert 0 == main(["--separator", ",", "--decimal", ".", "spell", "$12.50"])
+        assert "Twelve dollars and fifty cents\n" == capsys.readouterr().out
+
+    def test_rounding_and_invalid(self, capsys):
+        assert 0 == main(["spell", "1,005$"])
+        captured = capsys.readouterr()
+        assert "One dollar\n" == captured.out
+        assert "Rounded 1.005 to 2 decimals" in captured.err
+
+        assert 1 == main(["spell", "12"])
+        captured = capsys.readouterr()
+        assert "" == captured.out
+        assert "Invalid input." in captured.err
+
+        assert 1 == main(["spell", "1" + "0" * 27 + "$"])
+        captured = capsys.readouterr()
+        assert "" == captured.out
+        assert "Invalid input." in captured.err
+
+    def test_no_banner(self, monkeypatch, capsys):
+        monkeypatch.setattr("builtins.input", lambda prompt: "exit")
+        assert 0 == main(["--no-banner"])
+        assert "" == capsys.readouterr().out
+
+        assert 0 == main([])
+        assert "Good " in capsys.readouterr().out
+
+
+class TestImportBudget:
+    # modules that only some of the modes need, they must not be paid for by every start
+    HEAVY = ["multiprocessing", "concurrent.futures", "asyncio", "pickle", "hashlib", "tempfile", "datetime", "numpy",
+             "csv", "mmap"]
+
+    def test_cli_import(self):
+        code = "import sys, scripts.cli; print(' '.join(sorted(sys.modules)))"
+        modules = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                 cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.split()
+        assert "scripts.cli" in modules
+        assert [] == [module for module in self.HEAVY if module in modules]
+
+    def test_one_shot_process(self):
+        got = subprocess.run([sys.executable, "run", "spell", "14$"], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        assert "Fourteen dollars\n" == got.stdout
+
+
+class TestProfile:
+    def test_stream_profile(self, tmp_path, capsys):
+        src, profile = tmp_path / "amounts.txt", tmp_path / "profile.jsonl"
+        src.write_text("1$\n123,456$\nbad\n", encoding="utf-8")
+
+        assert 0 == main(["--stream", "-i", str(src), "--profile", str(profile)])
+        assert "One dollar\nOne hundred twenty-three dollars and forty-six cents\n\n" == capsys.readouterr().out
+
+        snapshot = json.loads(profile.read_text(encoding="utf-8"))
+        assert 3 == snapshot["stages"]["parse"]["calls"]
+        assert 2 == snapshot["stages"]["convert"]["calls"] == snapshot["stages"]["spell"]["calls"]
+        assert {"amounts": 2, "rounded": 1, "invalid": 1} == snapshot["counters"]
+
+    def test_profile_with_jobs(self):
+        with pytest.raises(SystemExit): main(["--stream", "--profile", "-", "--jobs", "2"])
@@ -0,0 +1,103 @@
+import sys
+from decimal import Decimal
+from random import randint
+import pytest
+from scripts.compact import *
+from scripts.currency import get_currency
+from scripts.app import NUM_NAMES, POWER_NAMES
+from scripts.script import SpellReport, Speller
+from scripts.vocab import LONG_SCALE_NAMES
+
+
+class TestSpelledStore:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_same_as_speller(self):
+        store = SpelledStore(self.speller)
+        amounts = [randint(-10 ** 29 + 1, 10 ** 29 - 1) // 10 ** randint(0, 28) / 100 for _ in range(3_000)]
+        amounts += [0, 1, 0.01, 0.5, -0.001, Decimal("1.005"), "12.34", 10 ** 26]
+        store.extend(amounts)
+
+        expected = self.speller.spell_many(amounts)
+        assert len(expected) == len(store)
+        assert expected == list(store)
+        assert expected[-1] == store[-1]
+        assert expected[10:20] == store[10:20]
+        assert expected[::-7] == store[::-7]
+
+    def test_cents(self):
+        store = SpelledStore(self.speller)
+        cents = [randint(-10 ** 20, 10 ** 20) for _ in range(1_000)]
+        for amount in cents:
+            store.append_cents(amount)
+        assert [self.speller.spell_cents(amount) for amount in cents] == list(store)
+
+    def test_settings(self):
+        for kwargs in ({"capitalize": False}, {"hundred_and": True}, {"rounding": "half_up"}):
+            speller = Speller(power_names=LONG_SCALE_NAMES, num_names=NUM_NAMES, **kwargs)
+            store = SpelledStore(speller)
+            amounts = [randint(-10 ** 15, 10 ** 15) / 1000 for _ in range(500)]
+            store.extend(amounts)
+            assert speller.spell_many(amounts) == list(store)
+
+    def test_unbounded(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, unbounded=True)
+        store = SpelledStore(speller)
+        amounts = [randint(1, 10 ** 40) * 10 ** randint(0, 300) for _ in range(200)]
+        store.extend(amounts)
+        assert speller.spell_many(amounts) == list(store)
+
+        speller = Speller(power_names=LONG_SCALE_NAMES, num_names=NUM_NAMES, unbounded=True)
+        store = SpelledStore(speller)
+        store.extend(amounts)
+        assert speller.spell_many(amounts) == list(store)
+
+        with pytest.raises(ValueError): SpelledStore(self.speller).append(10 ** 27)
+
+    def test_currencies(self):
+        amounts = [randint(-10 ** 24, 10 ** 24) / 10 ** randint(0, 4) for _ in range(1_000)] + [0.001, 1, 2.5]
+        for code in ("EUR", "GBP", "JPY", "KWD"):
+            speller = self.speller.with_currency(get_currency(code))
+            store = SpelledStore(speller)
+            store.extend(amounts)
+            assert speller.spell_many(amounts) == list(store)
+
+    def test_report(self):
+        store = SpelledStore(Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="warn"))
+        report = SpellReport()
+        store.extend(["1.005", "2.5", "3.125"], report=report)
+        assert 2 == report.rounded
+        assert 2 == len(report.warnings)
+
+    def test_to_bytes(self):
+        store = SpelledStore(self.speller)
+        assert b"" == store.to_bytes()
+        amounts = [randint(0, 10 ** 9) / 100 for _ in range(100)]
+        store.extend(amounts)
+        assert "\n".join(self.speller.spell_many(amounts)).encode() == store.to_bytes()
+        assert "|".join(self.speller.spell_many(amounts)).encode("utf-16") == \
+               store.to_bytes(separator="|", encoding="utf-16")
+
+    def test_compact(self):
+        store = SpelledStore(self.speller)
+        amounts = [randint(0, 10 ** 12) / 100 for _ in range(10_000)]
+        store.extend(amounts)
+
+        strings = self.speller.spell_many(amounts)
+        # the strings with the pointers to them in a list
+        as_strings = sum(sys.getsizeof(text) for text in strings) + 8 * len(strings)
+        assert store.nbytes * 3 < as_strings
+        assert len(store.words) < 200
+
+    def test_bad_arguments(self):
+        store = SpelledStore(self.speller)
+        store.append(1)
+        with pytest.raises(TypeError): SpelledStore(None)
+        with pytest.raises(TypeError): store.append_cents(1.5)
+        with pytest.raises(TypeError): store.extend(1)
+        with pytest.raises(TypeError): store["0"]
+        with pytest.raises(IndexError): store[1]
+        with pytest.raises(IndexError): store[-2]
+        with pytest.raises(TypeError): store.to_bytes(separator=b"\n")
@@ -0,0 +1,59 @@
+from random import choice, randint
+import pytest
+from scripts.currency import *
+from scripts.app import NUM_NAMES, POWER_NAMES
+from scripts.script import USD, CachedSpeller, Currency, SpellReport, Speller
+
+
+class TestRegistry:
+    def test_predefined(self):
+        assert {"USD", "EUR", "GBP", "JPY", "KWD"} <= set(CURRENCIES)
+        assert USD is get_currency("USD")
+        assert 0 == get_currency("JPY").digits
+        assert 3 == get_currency("KWD").digits
+
+    def test_register(self):
+        register_currency(Currency("CHF", "CHF ", ["franc", "francs"], ["centime", "centimes"]))
+        try:
+            franc = get_currency("CHF")
+            assert ("franc", "francs") == franc.major
+            speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=franc)
+            assert "Two francs and one centime" == speller.spell(2.01)
+        finally:
+            del CURRENCIES["CHF"]
+
+    def test_bad_arguments(self):
+        with pytest.raises(ValueError): get_currency("XXX")
+        with pytest.raises(TypeError): register_currency(("CHF", "CHF ", ("franc", "francs"), ("centime", "centimes")))
+        with pytest.raises(ValueError): register_currency(Currency("CHF", "", ("franc", "francs"), ("", "")))
+
+
+class TestSpellMixed:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_same_as_spellers(self):
+        pairs = [(randint(-10 ** 20, 10 ** 20) / 10 ** randint(0, 4), choice(list(CURRENCIES))) for _ in range(3_000)]
+        expected = [Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, currency=get_currency(code)).spell(number)
+                    for number, code in pairs]
+        assert expected == spell_mixed(pairs, speller=self.speller)
+
+    def test_examples(self):
+        assert ["Twelve euros and fifty cents", "One thousand yen", "One dinar and five fils",
+                "Two pounds and one penny", "Seven dollars"] == \
+               spell_mixed([(12.5, "EUR"), (1000, "JPY"), ("1.005", "KWD"), (2.01, "GBP"), (7, "USD")],
+                           speller=self.speller)
+
+    def test_settings_and_report(self):
+        speller = CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=False, rounding="warn")
+        report = SpellReport()
+        assert ["one dollar", "two yen"] == spell_mixed([(1.001, "USD"), (1.5, "JPY")], speller=speller, report=report)
+        assert ["Rounded 1.001 to 2 decimals: $1.00", "Rounded 1.5 to 0 decimals: ¥2"] == report.warnings
+        # the amounts of the currency of the speller go through the speller itself
+        assert 1 == speller.cache_info().misses
+
+    def test_bad_arguments(self):
+        with pytest.raises(TypeError): spell_mixed(1, speller=self.speller)
+        with pytest.raises(TypeError): spell_mixed([(1, "USD")], speller=None)
+        with pytest.raises(ValueError): spell_mixed([(1, "XXX")], speller=self.speller)
@@ -1,7 +1,8 @@
+import threading
 from random import randint
 import pytest
 from scripts.app import *
-from scripts.script import split_decimal
+from scripts.script import split_decimal, to_cents
 
 
 class TestApplicationParser:
@@ -55,6 +56,84 @@ class TestApplicationParser:
             assert exp == split_decimal(inp)
 
 
+class TestAmountParser:
+    def test_parse_cents(self):
+        inputs = {
+            "1.234,52$": 123452,
+            "$1.234,52": 123452,
+            "-$1.234,5": -123450,
+            "$-12": -1200,
+            "+12$": 1200,
+            "1_2_3_4$": 123400,
+            " 14$ ": 1400,
+            ",5$": 50,
+            "7,$": 700,
+            "..$...1....4": 1400,
+            "2,675$": 268,
+            "1,005$": 100,
+            "0$": 0,
+            "9" * 30 + ",99$": 10 ** 32 - 1,
+        }
+        for inp, expected in inputs.items():
+            assert expected == parse_cents(inp, separator=".", decimal=","), inp
+
+    def test_parse_amount(self):
+        assert "-1234.525" == parse_amount("-1,234.525$")
+        assert "0.5" == parse_amount("$.5")
+        assert "12" == parse_amount("12$")
+        assert None == parse_amount("12")
+
+    def test_bad_structure(self):
+        bad_inputs = (
+            "1,2,3$", "1,2$,3", "$$12", "12$$", "$12$", "-$-12", "--12$", "1e5$", "inf$", "nan$", "$", "-$", "$,",
+            "12 34$", "1$2", "١٢$", "12,3.4$", "+-1$", "$ 12", "$12,-5", "12,5 5$",
+        )
+        for inp in bad_inputs:
+            assert None == parse_cents(inp, separator=".", decimal=","), inp
+            assert None == parse_num(inp, separator=".", decimal=","), inp
+
+    def test_same_as_float(self):
+        for _ in range(10_000):
+            whole, decimal = randint(0, 10 ** 12), randint(0, 999)
+            text = f"{whole:_}.{decimal:03}$".replace("_", ",")
+            assert float(f"{whole}.{decimal:03}") == parse_num(text)
+            assert round(whole * 100 + decimal / 10) == parse_cents(text) or decimal % 10 == 5
+
+    def test_usual_shape(self):
+        # the usual shape <digits and separators><decimal><2 digits>$ skips the full scan, the result is the same
+        for _ in range(10_000):
+            text = "".join(str(randint(0, 9)) + "." * (randint(0, 3) == 0) for _ in range(randint(0, 12)))
+            text = "-" * randint(0, 1) + text + f",{randint(0, 99):02}$"
+            amount = parse_amount(text, separator=".", decimal=",")
+            assert (None if amount is None else float(amount)) == parse_num(text, separator=".", decimal=","), text
+            assert (None if amount is None else to_cents(amount)) == parse_cents(text, separator=".", decimal=","), text
+
+        assert -123456 == parse_cents("-1.234,56$", separator=".", decimal=",")
+        assert None == parse_cents(".-5,78$", separator=".", decimal=",")
+        assert None == parse_num("1.2,34,56$", separator=".", decimal=",")
+        with pytest.raises(TypeError): parse_num(12)
+
+    def test_minus_as_separator(self):
+        # a separator is never a sign
+        assert 1200 == parse_cents("-12$", separator="-", decimal=",")
+        assert 12 == parse_cents("-12$", separator=".", decimal="-")
+        assert 1250 == parse_cents("12_50$", separator=".", decimal="_")
+
+    def test_parse_many(self):
+        texts = ["1.234,52$", "bad", "$-0,5", "1,005$"]
+        assert [123452, None, -50, 100] == parse_many(texts, separator=".", decimal=",")
+        assert [123452, None, -50, 101] == parse_many(iter(texts), separator=".", decimal=",", rounding="half_up")
+        with pytest.raises(ValueError): parse_many(["1,005$"], separator=".", decimal=",", rounding="raise")
+
+    def test_bad_arguments(self):
+        with pytest.raises(TypeError): parse_cents(12)
+        with pytest.raises(ValueError): parse_cents("12$", separator=".", decimal=".")
+        with pytest.raises(ValueError): parse_cents("12$", separator="5")
+        with pytest.raises(ValueError): parse_cents("12$", separator="..")
+        with pytest.raises(ValueError): parse_cents("12$", rounding="up")
+        with pytest.raises(TypeError): parse_many(12)
+
+
 class TestApplicationSeparators:
     @classmethod
     def setup_class(cls):
@@ -141,6 +220,7 @@ class TestApplicationSpeller:
             "",
             "-\321$",
             "Minus 123$",
+            "1" + "0" * 27 + "$",
         )
         for val in bad_inputs:
             self.shell.do_spell(val)
@@ -253,6 +333,26 @@ class TestSeparatorChanger:
                            f"The available decimal separators are: {" ".join(self.shell.available_sep)}")
         self.teardown_sep()
 
+    def test_switch_is_atomic(self):
+        shell = Shell()
+        seen = set()
+        done = threading.Event()
+
+        def _read():
+            while not done.is_set():
+                seen.add(shell.separators)
+
+        reader = threading.Thread(target=_read)
+        reader.start()
+        for _ in range(20_000):
+            shell._change_separator(new_sep=shell.decimal_sep, _tp="integer")
+        done.set()
+        reader.join()
+
+        # the readers only ever see one of the two whole pairs
+        assert seen <= {Separators(".", ","), Separators(",", ".")}
+        assert isinstance(shell.separators, Separators)
+
 
 class TestMiscellaneous:
     @classmethod
@@ -273,3 +373,16 @@ class TestMiscellaneous:
         ]
         for val in bad_inp:
             with pytest.raises(TypeError): get_time_of_day(val)
+
+    def test_intro(self):
+        shell = Shell()
+        assert shell.intro.lstrip().startswith("Good ")
+        assert " ".join(Shell.available_sep) in shell.intro
+        shell.intro = ""
+        assert "" == shell.intro
+
+
+class TestSpellRounding:
+    def test_rounding_message(self, capsys):
+        Shell().do_spell("1,005$")
+        assert "Rounded 1.005 to 2 decimals: $1.00\n-> One dollar\n" == capsys.readouterr().out
@@ -0,0 +1,40 @@
+import pytest
+from scripts.illions import *
+
+
+class TestIllionName:
+    def test_predefined(self):
+        names = {
+            1: "million", 2: "billion", 8: "octillion", 9: "nonillion", 10: "decillion", 11: "undecillion",
+            13: "tredecillion", 16: "sedecillion", 17: "septendecillion", 19: "novendecillion", 20: "vigintillion",
+            23: "tresvigintillion", 26: "sesvigintillion", 27: "septemvigintillion", 30: "trigintillion",
+            100: "centillion", 103: "trescentillion", 106: "sexcentillion", 107: "septencentillion",
+            123: "tresviginticentillion", 999: "novenonagintanongentillion", 1000: "millinillion",
+            1001: "millimillion", 1_000_000: "millinillinillion",
+        }
+        for n, name in names.items():
+            assert name == illion_name(n), n
+
+    def test_all_distinct(self):
+        names = [illion_name(n) for n in range(1, 5_000)]
+        assert len(names) == len(set(names))
+        assert all(name.endswith("illion") for name in names)
+
+    def test_power_name(self):
+        assert "thousand" == power_name(3)
+        assert "million" == power_name(6)
+        assert "octillion" == power_name(27)
+        assert "millinillion" == power_name(3003)
+
+    def test_long_scale(self):
+        names = {3: "thousand", 6: "million", 9: "milliard", 12: "billion", 15: "billiard", 24: "quadrillion",
+                 27: "quadrilliard", 30: "quintillion", 6000: "millinillion", 6003: "millinilliard"}
+        for power, name in names.items():
+            assert name == power_name(power, long_scale=True), power
+
+    def test_bad_input(self):
+        with pytest.raises(ValueError): illion_name(0)
+        with pytest.raises(TypeError): illion_name(1.0)
+        with pytest.raises(ValueError): power_name(4)
+        with pytest.raises(ValueError): power_name(0)
+        with pytest.raises(TypeError): power_name("6")
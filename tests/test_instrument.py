@@ -0,0 +1,119 @@
+import io
+import json
+from random import randint
+import pytest
+from scripts.instrument import *
+from scripts.currency import get_currency
+from scripts.app import NUM_NAMES, POWER_NAMES, parse_amount
+from scripts.script import CachedSpeller, SpellReport, Speller
+
+
+class TestRecorder:
+    def test_record_and_count(self):
+        recorder = Recorder()
+        recorder.record("parse", 100)
+        recorder.record("parse", 300)
+        recorder.record("spell", 50, calls=5)
+        recorder.count("rounded")
+        recorder.count("rounded", 2)
+
+        snapshot = recorder.snapshot()
+        assert {"calls": 2, "total_ns": 400, "mean_ns": 200, "max_ns": 300} == snapshot["stages"]["parse"]
+        assert {"calls": 5, "total_ns": 50, "mean_ns": 10, "max_ns": 50} == snapshot["stages"]["spell"]
+        assert {"rounded": 3} == snapshot["counters"]
+
+        recorder.reset()
+        assert {"stages": {}, "counters": {}} == recorder.snapshot()
+
+    def test_timed(self):
+        recorder = Recorder()
+        parse = recorder.timed("parse", parse_amount)
+        for _ in range(100):
+            text = f"{randint(0, 10 ** 6)},{randint(0, 99)}$"
+            assert parse_amount(text, separator=".", decimal=",") == parse(text, separator=".", decimal=",")
+
+        assert 100 == recorder.snapshot()["stages"]["parse"]["calls"]
+        assert parse_amount.__name__ == parse.__name__
+
+    def test_timed_error(self):
+        recorder = Recorder()
+        with pytest.raises(ZeroDivisionError): recorder.timed("divide", lambda: 1 / 0)()
+        assert 1 == recorder.snapshot()["stages"]["divide"]["calls"]
+
+    def test_sinks(self, tmp_path):
+        memory, stream, path = MemorySink(), io.StringIO(), tmp_path / "profile.jsonl"
+        called = []
+        recorder = Recorder(memory, JsonSink(stream), JsonSink(str(path)), called.append)
+        assert memory.last is None
+
+        recorder.count("amounts")
+        first = recorder.flush()
+        recorder.count("amounts")
+        second = recorder.flush()
+
+        assert [first, second] == memory.snapshots == called
+        assert second is memory.last
+        assert [first, second] == [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [first, second] == [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_bad_arguments(self):
+        with pytest.raises(TypeError): Recorder(1)
+        with pytest.raises(TypeError): Recorder().timed("parse", None)
+        with pytest.raises(TypeError): Recorder().add_gauge("gauge")
+        with pytest.raises(TypeError): JsonSink(1)
+
+
+class TestInstrumentedSpeller:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_same_output(self):
+        speller = InstrumentedSpeller(self.speller, Recorder())
+        amounts = [randint(-10 ** 20, 10 ** 20) / 100 for _ in range(1_000)]
+        assert self.speller.spell_many(amounts) == speller.spell_many(amounts)
+        for _ in range(1_000):
+            cents = randint(-10 ** 20, 10 ** 20)
+            assert self.speller.spell_cents(cents) == speller.spell_cents(cents)
+
+    def test_currency(self):
+        dinars = self.speller.with_currency(get_currency("KWD"))
+        speller = InstrumentedSpeller(dinars, Recorder())
+        amounts = [randint(-10 ** 20, 10 ** 20) / 1000 for _ in range(500)] + ["1.0005"]
+        assert dinars.spell_many(amounts) == speller.spell_many(amounts)
+
+    def test_stages(self):
+        recorder = Recorder()
+        speller = InstrumentedSpeller(self.speller, recorder)
+        report = SpellReport()
+        speller.spell_many(["1.005", "2", "3.5"], report=report)
+        speller.spell_cents(100)
+
+        snapshot = recorder.snapshot()
+        assert 3 == snapshot["stages"]["convert"]["calls"]
+        assert 4 == snapshot["stages"]["spell"]["calls"]
+        assert {"amounts": 4, "rounded": 1} == snapshot["counters"]
+        assert 1 == report.rounded
+
+    def test_rounding_policy(self):
+        speller = InstrumentedSpeller(Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="raise"),
+                                      Recorder())
+        with pytest.raises(ValueError): speller.spell("1.005")
+        assert {} == speller.recorder.snapshot()["counters"]
+
+    def test_cache_counters(self):
+        cached = CachedSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        cached.spell(1)
+        recorder = Recorder()
+        speller = InstrumentedSpeller(cached, recorder)
+        for amount in [1, 2, 1, 2, 3]:
+            speller.spell(amount)
+
+        counters = recorder.snapshot()["counters"]
+        assert 2 == counters["cache_misses"]
+        assert 3 == counters["cache_hits"]
+
+    def test_bad_arguments(self):
+        with pytest.raises(TypeError): InstrumentedSpeller(None, Recorder())
+        with pytest.raises(TypeError): InstrumentedSpeller(self.speller, None)
+        with pytest.raises(TypeError): InstrumentedSpeller(self.speller, Recorder()).spell_cents(1.5)
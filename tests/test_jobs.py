@@ -0,0 +1,219 @@
+import csv
+import io
+import mmap
+import os
+import subprocess
+import sys
+from random import randint
+import pytest
+from scripts.jobs import *
+from scripts.cli import main, stream
+from scripts.app import NUM_NAMES, POWER_NAMES, parse_amount
+from scripts.script import SpellReport, Speller
+
+
+def _amount():
+    return f"{randint(-10 ** 12, 10 ** 12)},{randint(0, 99):02}$"
+
+
+def _ledger(amounts, *, pad=30):
+    # account number, amount field of 24 bytes, memo
+    return "".join(f"ACC{index:08}|{amount:>24}|{'memo ' * (index % 7):<{pad}}\n"
+                   for index, amount in enumerate(amounts))
+
+
+class TestConvertFixed:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def _expected(self, amounts):
+        expected = io.StringIO()
+        stream([amount + "\n" for amount in amounts], expected, speller=self.speller)
+        return expected.getvalue().encode("utf-8")
+
+    def test_same_as_stream(self, tmp_path):
+        amounts = [_amount() for _ in range(3_000)] + ["bad", "", "1.2.3,4,5$"]
+        path = tmp_path / "ledger.txt"
+        path.write_text(_ledger(amounts), encoding="utf-8")
+
+        out = io.BytesIO()
+        invalid = convert_fixed(str(path), out, speller=self.speller, start=12, width=24)
+        assert 3 == invalid
+        assert self._expected(amounts) == out.getvalue()
+
+    def test_small_windows(self, tmp_path):
+        # lines that cross the window boundaries at every possible offset
+        amounts = [_amount() for _ in range(2_000)]
+        path = tmp_path / "ledger.txt"
+        path.write_text(_ledger(amounts, pad=randint(30, 200)), encoding="utf-8")
+
+        for window in (mmap.ALLOCATIONGRANULARITY, mmap.ALLOCATIONGRANULARITY * 3 + 17):
+            out = io.BytesIO()
+            convert_fixed(str(path), out, speller=self.speller, start=12, width=24, window=window)
+            assert self._expected(amounts) == out.getvalue()
+
+    def test_whole_line_and_line_ends(self, tmp_path):
+        path = tmp_path / "amounts.txt"
+        path.write_bytes(b"14$\r\n$-12\n1.234,52$")
+
+        out = io.BytesIO()
+        assert 0 == convert_fixed(str(path), out, speller=self.speller)
+        assert (b"Fourteen dollars\nMinus twelve dollars\n"
+                b"One thousand two hundred thirty-four dollars and fifty-two cents\n") == out.getvalue()
+
+    def test_empty_and_short_lines(self, tmp_path):
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        out = io.BytesIO()
+        assert 0 == convert_fixed(str(path), out, speller=self.speller)
+        assert b"" == out.getvalue()
+
+        path.write_bytes(b"short\n\n")
+        assert 2 == convert_fixed(str(path), out, speller=self.speller, start=10, width=5)
+        assert b"\n\n" == out.getvalue()
+
+    def test_out_of_range(self, tmp_path):
+        path = tmp_path / "huge.txt"
+        path.write_bytes(b"1$\n1" + b"0" * 27 + b"$\n2$\n")
+        out = io.BytesIO()
+        assert 1 == convert_fixed(str(path), out, speller=self.speller)
+        assert b"One dollar\n\nTwo dollars\n" == out.getvalue()
+
+    def test_line_longer_than_window(self, tmp_path):
+        path = tmp_path / "long.txt"
+        path.write_bytes(b"1$\n" + b" " * (3 * mmap.ALLOCATIONGRANULARITY) + b"2$\n3$\n")
+        with pytest.raises(ValueError):
+            convert_fixed(str(path), io.BytesIO(), speller=self.speller, window=mmap.ALLOCATIONGRANULARITY)
+
+    def test_bad_arguments(self, tmp_path):
+        path = tmp_path / "amounts.txt"
+        path.write_bytes(b"1$\n")
+        with pytest.raises(ValueError): convert_fixed(str(path), io.BytesIO(), speller=self.speller, start=-1)
+        with pytest.raises(ValueError): convert_fixed(str(path), io.BytesIO(), speller=self.speller, width=0)
+        with pytest.raises(TypeError): convert_fixed(str(path), io.BytesIO(), speller=self.speller, width=1.5)
+        with pytest.raises(ValueError): convert_fixed(str(path), io.BytesIO(), speller=self.speller, window=10)
+        with pytest.raises(ValueError):
+            convert_fixed(str(path), io.BytesIO(), speller=self.speller, separator=",", decimal=",")
+
+    def test_main(self, tmp_path, capsys):
+        src, dst = tmp_path / "ledger.txt", tmp_path / "words.txt"
+        src.write_text(_ledger(["1$", "123,456$", "bad"]), encoding="utf-8")
+
+        assert 0 == main(["convert", str(src), "-o", str(dst), "--start", "12", "--width", "24"])
+        assert "One dollar\nOne hundred twenty-three dollars and forty-six cents\n\n" == dst.read_text(encoding="utf-8")
+        captured = capsys.readouterr()
+        assert "1 line(s) could not be parsed" in captured.err
+        assert "1 amount(s) had more than 2 decimals and were rounded" in captured.err
+
+        assert 1 == main(["convert", str(tmp_path / "missing.txt")])
+        assert 1 == main(["convert", str(tmp_path / "missing.txt"), "-o", str(dst)])
+        assert "One dollar\nOne hundred twenty-three dollars and forty-six cents\n\n" == dst.read_text(encoding="utf-8")
+        assert 1 == main(["convert", str(src), "-o", str(tmp_path / "missing" / "words.txt")])
+        assert "run convert: " in capsys.readouterr().err
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="reads the peak memory from /proc")
+    def test_flat_memory(self, tmp_path):
+        # the peak memory of converting a file 8 times as big grows by much less than the file,
+        # VmHWM is the peak of the process itself, ru_maxrss would include the peak of pytest before the exec
+        code = ("import sys\n"
+                "from scripts.jobs import convert_fixed\n"
+                "from scripts.app import NUM_NAMES, POWER_NAMES\n"
+                "from scripts.script import Speller\n"
+                "speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)\n"
+                "with open(sys.argv[2], 'wb') as out:\n"
+                "    convert_fixed(sys.argv[1], out, speller=speller, start=12, width=24, window=1 << 20)\n"
+                "print([line for line in open('/proc/self/status') if line.startswith('VmHWM')][0].split()[1])\n")
+        line = f"ACC00000001|{'1.234,52$':>24}|{'memo' * 200}\n"
+
+        peaks = []
+        for lines in (2_000, 16_000):
+            src = tmp_path / f"ledger-{lines}.txt"
+            src.write_text(line * lines, encoding="utf-8")
+            got = subprocess.run([sys.executable, "-c", code, str(src), str(tmp_path / "words.txt")],
+                                 capture_output=True, text=True, check=True)
+            peaks.append(int(got.stdout) * 1024)
+
+        grown = len(line) * 14_000
+        assert peaks[1] - peaks[0] < grown / 4
+
+
+class TestConvertCsv:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_spelled_column(self):
+        amounts = [_amount() for _ in range(1_000)]
+        infile = io.StringIO("id,amount,memo\n" + "".join(f'{index},"{amount}",note {index}\n'
+                                                            for index, amount in enumerate(amounts)))
+        outfile = io.StringIO()
+
+        stats = convert_csv(infile, outfile, speller=self.speller, column="amount", chunk_rows=64)
+        assert 1_000 == stats.rows
+        assert 0 == stats.invalid
+        assert stats.rows_per_sec > 0
+
+        rows = list(csv.reader(io.StringIO(outfile.getvalue())))
+        assert ["id", "amount", "memo", "spelled"] == rows[0]
+        assert [[str(index), amount, f"note {index}"] for index, amount in enumerate(amounts)] == \
+               [row[:3] for row in rows[1:]]
+        assert self.speller.spell_many([parse_amount(amount, separator=".", decimal=",") for amount in amounts]) == \
+               [row[3] for row in rows[1:]]
+
+    def test_invalid_and_short_rows(self):
+        infile = io.StringIO("amount;memo\n1.234,52$;a\nbad;b\n\n12$\n")
+        outfile = io.StringIO()
+        report = SpellReport()
+
+        stats = convert_csv(infile, outfile, speller=self.speller, column="amount", delimiter=";",
+                            spelled_column="words", report=report)
+        assert (4, 2) == (stats.rows, stats.invalid)
+        assert ("amount;memo;words\n"
+                "1.234,52$;a;One thousand two hundred thirty-four dollars and fifty-two cents\n"
+                "bad;b;\n"
+                ";;\n"
+                "12$;;Twelve dollars\n") == outfile.getvalue()
+
+    def test_long_rows(self):
+        infile = io.StringIO("id,amount\n1,1$,extra\n2,2$,extra,more\n3,3$\n")
+        outfile = io.StringIO()
+        stats = convert_csv(infile, outfile, speller=self.speller, column="amount")
+        assert (3, 0) == (stats.rows, stats.invalid)
+        assert "id,amount,spelled\n1,1$,One dollar\n2,2$,Two dollars\n3,3$,Three dollars\n" == outfile.getvalue()
+
+    def test_out_of_range(self):
+        huge = "1" + "0" * 27 + "$"
+        outfile = io.StringIO()
+        stats = convert_csv(io.StringIO(f"amount\n1$\n{huge}\n2$\n"), outfile, speller=self.speller, column="amount",
+                            chunk_rows=1)
+        assert (3, 1) == (stats.rows, stats.invalid)
+        assert f"amount,spelled\n1$,One dollar\n{huge},\n2$,Two dollars\n" == outfile.getvalue()
+
+    def test_separators(self):
+        outfile = io.StringIO()
+        convert_csv(io.StringIO('amount\n"1,234.525$"\n'), outfile, speller=self.speller, column="amount",
+                    separator=",", decimal=".")
+        assert outfile.getvalue().endswith(",One thousand two hundred thirty-four dollars and fifty-two cents\n")
+
+    def test_bad_input(self):
+        with pytest.raises(ValueError): convert_csv(io.StringIO(""), io.StringIO(), speller=self.speller, column="a")
+        with pytest.raises(ValueError): convert_csv(io.StringIO("b\n"), io.StringIO(), speller=self.speller, column="a")
+        with pytest.raises(ValueError):
+            convert_csv(io.StringIO("a,spelled\n"), io.StringIO(), speller=self.speller, column="a")
+        with pytest.raises(ValueError):
+            convert_csv(io.StringIO("a\n"), io.StringIO(), speller=self.speller, column="a", chunk_rows=0)
+
+    def test_main(self, tmp_path, capsys):
+        src, dst = tmp_path / "payments.csv", tmp_path / "checks.csv"
+        src.write_text('id,amount\n1,1$\n2,"123,456$"\n3,bad\n', encoding="utf-8")
+
+        assert 0 == main(["csv", str(src), "-o", str(dst), "--column", "amount"])
+        assert ('id,amount,spelled\n1,1$,One dollar\n2,"123,456$",One hundred twenty-three dollars and forty-six cents\n'
+                '3,bad,\n') == dst.read_text(encoding="utf-8")
+        captured = capsys.readouterr()
+        assert "3 row(s) in" in captured.err and "rows/s" in captured.err
+        assert "1 row(s) could not be parsed" in captured.err
+        assert "1 amount(s) had more than 2 decimals and were rounded" in captured.err
+
+        assert 1 == main(["csv", str(src), "-o", str(dst), "--column", "missing"])
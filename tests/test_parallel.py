@@ -0,0 +1,36 @@
+from random import randint
+import pytest
+from scripts.parallel import *
+from scripts.script import spell_many
+from scripts.app import NUM_NAMES, POWER_NAMES
+
+
+class TestSpellParallel:
+    def test_same_as_spell_many(self):
+        amounts = [randint(-10 ** 12, 10 ** 12) / 100 for _ in range(5_000)]
+        expected = spell_many(amounts, power_names=POWER_NAMES, num_names=NUM_NAMES)
+        got = spell_parallel(amounts, power_names=POWER_NAMES, num_names=NUM_NAMES, workers=2, chunk_size=97)
+        assert expected == list(got)
+
+    def test_generator_input(self):
+        got = spell_parallel((i for i in range(3)), power_names=POWER_NAMES, num_names=NUM_NAMES, workers=2)
+        assert ["", "One dollar", "Two dollars"] == list(got)
+
+    def test_bad_input(self):
+        with pytest.raises(TypeError): spell_parallel(123, power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(ValueError): spell_parallel([1], power_names=POWER_NAMES, num_names=NUM_NAMES, workers=-1)
+        with pytest.raises(ValueError): spell_parallel([1], power_names=POWER_NAMES, num_names=NUM_NAMES, chunk_size=0)
+        with pytest.raises(ValueError): spell_parallel([1], power_names={}, num_names=NUM_NAMES)
+
+    def test_outside_of_pool(self):
+        with pytest.raises(RuntimeError): worker_speller()
+
+
+class TestImapOrdered:
+    def test_order_kept(self):
+        with make_pool(2, power_names=POWER_NAMES, num_names=NUM_NAMES) as pool:
+            assert list(range(50, 0, -1)) == list(imap_ordered(pool, abs, range(-50, 0), window=3))
+
+    def test_bad_window(self):
+        with make_pool(1, power_names=POWER_NAMES, num_names=NUM_NAMES) as pool:
+            with pytest.raises(ValueError): list(imap_ordered(pool, abs, [1], window=0))
@@ -0,0 +1,69 @@
+from decimal import Decimal
+from random import randint
+import pytest
+from scripts.reverse import *
+from scripts.script import Speller, currency_speller
+from scripts.vocab import NUM_NAMES, POWER_NAMES, LONG_SCALE_NAMES, SHORT_SCALE_NAMES
+
+
+class TestWordsParser:
+    parser = WordsParser(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_parse(self):
+        assert Decimal("1234.52") == self.parser.parse(
+            "One thousand two hundred thirty-four dollars and fifty-two cents")
+        assert Decimal("-1.01") == self.parser.parse("Minus one dollar and one cent")
+        assert Decimal("0.50") == self.parser.parse("And fifty cents")
+        assert Decimal("0") == self.parser.parse("")
+        assert Decimal("1000000000000000000000000") == self.parser.parse("One heptillion dollars")
+
+    def test_case_and_spaces(self):
+        assert 123452 == self.parser.parse_cents(
+            "  ONE thousand  Two hundred\tthirty-Four dollars and fifty-two cents ")
+        assert 100 == self.parser.parse_cents("one dollars")
+
+    def test_round_trip(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        for _ in range(5_000):
+            cents = randint(-10 ** 29 + 1, 10 ** 29 - 1) // 10 ** randint(0, 28)
+            assert cents == self.parser.parse_cents(speller.spell_cents(cents)), cents
+
+    def test_round_trip_small(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=False)
+        for cents in range(-200_000, 200_000, 7):
+            assert cents == self.parser.parse_cents(speller.spell_cents(cents))
+
+    def test_round_trip_other_vocabularies(self):
+        for power_names in (SHORT_SCALE_NAMES, LONG_SCALE_NAMES):
+            parser = WordsParser(power_names=power_names, num_names=NUM_NAMES)
+            speller = Speller(power_names=power_names, num_names=NUM_NAMES, hundred_and=True)
+            for _ in range(2_000):
+                cents = randint(-10 ** 29 + 1, 10 ** 29 - 1) // 10 ** randint(0, 28)
+                assert cents == parser.parse_cents(speller.spell_cents(cents)), cents
+
+    def test_parse_words(self):
+        for _ in range(200):
+            amount = Decimal(randint(-10 ** 14, 10 ** 14)).scaleb(-2)
+            spelled = currency_speller(amount, power_names=POWER_NAMES, num_names=NUM_NAMES)
+            assert amount == parse_words(spelled, power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_bad_text(self):
+        for text in ["One dollar dollar", "Two thousand three thousand dollars", "One million heptillion dollars",
+                     "Twenty five dollars", "Twelve hundred dollars", "One hundred", "Dollars", "And cents",
+                     "One dollar and one hundred cents", "One dollar and one", "Fourty dollars", "Minus minus",
+                     "One thousand dollars and", "Five cents"]:
+            with pytest.raises(ValueError): self.parser.parse_cents(text)
+
+    def test_parse_many(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        cents = [randint(-10 ** 15, 10 ** 15) for _ in range(1_000)]
+        texts = [speller.spell_cents(amount) for amount in cents]
+        assert cents + [None, None] == self.parser.parse_many(texts + ["One dollar dollar", None])
+        assert [] == self.parser.parse_many(iter([]))
+
+    def test_bad_arguments(self):
+        with pytest.raises(TypeError): self.parser.parse_cents(12)
+        with pytest.raises(TypeError): self.parser.parse_many(12)
+        with pytest.raises(ValueError): WordsParser(power_names=POWER_NAMES, num_names={**NUM_NAMES, 1: "a one"})
+        with pytest.raises(ValueError): WordsParser(power_names=POWER_NAMES, num_names={**NUM_NAMES, 2: "one"})
+        with pytest.raises(ValueError): WordsParser(power_names={3: "thousand"}, num_names=NUM_NAMES)
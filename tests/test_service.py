@@ -0,0 +1,201 @@
+import asyncio
+import json
+from random import randint
+import pytest
+from scripts.service import *
+from scripts.script import Speller
+from scripts.app import NUM_NAMES, POWER_NAMES
+
+
+async def _request(reader, writer, method, target, payload=None, *, headers=""):
+    # bytes are sent as they are, i.e. JSON that json.dumps does not write
+    body = b"" if payload is None else payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost\r\n{headers}"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    status = int(head.split(" ")[1])
+    length = int(head.lower().split("content-length: ")[1].split("\r\n")[0])
+    return status, json.loads(await reader.readexactly(length)), head
+
+
+def _run(test, **kwargs):
+    """Runs test(service, port) against a started service"""
+
+    async def _main():
+        kwargs.setdefault("speller", Speller(power_names=POWER_NAMES, num_names=NUM_NAMES))
+        service = SpellService(**kwargs)
+        server = await service.start("127.0.0.1", 0)
+        try:
+            return await test(service, server.sockets[0].getsockname()[1])
+        finally:
+            await service.close()
+
+    return asyncio.run(_main())
+
+
+class TestSpellService:
+    def test_single(self):
+        async def test(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            got = [
+                await _request(reader, writer, "POST", "/spell", {"amount": 1234.52}),
+                await _request(reader, writer, "GET", "/spell?amount=1.234,52$"),
+                await _request(reader, writer, "GET", "/spell?amount=1,234.52$&separator=,&decimal=."),
+                await _request(reader, writer, "POST", "/spell", {"amount": 10 ** 26}),
+            ]
+            writer.close()
+            return got
+
+        expected = "One thousand two hundred thirty-four dollars and fifty-two cents"
+        got = _run(test)
+        assert [(200, {"spelled": expected})] * 3 == [(status, data) for status, data, _ in got[:3]]
+        assert got[3][1]["spelled"].startswith("One hundred heptillion")
+        # all requests went over the same connection
+        assert all("Connection: keep-alive" in head for _, _, head in got)
+
+    def test_exact_decimals(self):
+        async def test(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            got = await _request(reader, writer, "POST", "/spell", {"amount": 2.675})
+            writer.close()
+            return got
+
+        _, data, _ = _run(test)
+        # the float 2.675 is 2.67499999... and would be rounded down to 2.67
+        assert "Two dollars and sixty-eight cents" == data["spelled"]
+
+    def test_bulk(self):
+        amounts = [randint(-10 ** 12, 10 ** 12) for _ in range(500)]
+
+        async def test(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            got = await _request(reader, writer, "POST", "/spell/bulk", {"amounts": amounts + ["1$", "bad", None]})
+            writer.close()
+            return got
+
+        status, data, _ = _run(test)
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        assert 200 == status
+        assert speller.spell_many(amounts) + ["One dollar", None, None] == data["spelled"]
+        assert 2 == data["invalid"]
+
+    def test_locale(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("MONEY_SPELLER_CACHE", str(tmp_path))
+
+        async def test(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            got = [
+                await _request(reader, writer, "POST", "/spell", {"amount": 105, "locale": "en_GB"}),
+                await _request(reader, writer, "GET", "/spell?amount=105$&locale=en_US"),
+                await _request(reader, writer, "POST", "/spell/bulk", {"amounts": [105], "locale": "en_GB"}),
+                await _request(reader, writer, "POST", "/spell", {"amount": 105, "locale": "xx_XX"}),
+                await _request(reader, writer, "POST", "/spell", {"amount": 105, "locale": ["en_GB"]}),
+            ]
+            writer.close()
+            return [data for _, data, _ in got]
+
+        british, american, bulk, unknown, not_string = _run(test)
+        assert "One hundred and five dollars" == british["spelled"]
+        assert "One hundred five dollars" == american["spelled"]
+        assert ["One hundred and five dollars"] == bulk["spelled"]
+        assert unknown["error"].startswith("Unknown locale 'xx_XX'")
+        assert "The locale must be a string" == not_string["error"]
+
+    def test_concurrent_requests_batched(self):
+        async def test(service, port):
+            async def client(amount):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                got = await _request(reader, writer, "POST", "/spell", {"amount": amount})
+                writer.close()
+                return got[1]["spelled"]
+
+            amounts = list(range(1, 101))
+            return amounts, await asyncio.gather(*(client(amount) for amount in amounts)), service.batches
+
+        amounts, got, batches = _run(test, batch_window=0.05)
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        assert speller.spell_many(amounts) == got
+        assert batches < len(amounts)
+
+    def test_full_queue(self):
+        async def test(service, port):
+            # all three run before the batcher takes the first amount off the queue
+            return await asyncio.gather(*(service.spell(amount) for amount in (1, 2, 3)), return_exceptions=True)
+
+        first, second, third = _run(test, max_queue=1)
+        assert "One dollar" == first
+        assert HTTPStatus.SERVICE_UNAVAILABLE == second.status == third.status
+
+    def test_errors(self):
+        async def test(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            got = [
+                await _request(reader, writer, "POST", "/spell", {"amount": "abc"}),
+                await _request(reader, writer, "POST", "/spell", {"amount": 10 ** 27}),
+                await _request(reader, writer, "POST", "/spell", {}),
+                await _request(reader, writer, "POST", "/spell", [1]),
+                await _request(reader, writer, "GET", "/spell?amount=1$&separator=,&decimal=,"),
+                await _request(reader, writer, "GET", "/nothing"),
+                await _request(reader, writer, "DELETE", "/spell"),
+                await _request(reader, writer, "GET", "/spell/bulk"),
+                await _request(reader, writer, "POST", "/spell/bulk", {"amounts": [1] * 11}),
+            ]
+            writer.close()
+            return [status for status, _, _ in got]
+
+        assert [400, 400, 400, 400, 400, 404, 405, 405, 413] == _run(test, max_bulk=10)
+
+    def test_out_of_range(self):
+        async def test(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            got = []
+            for body in (b'{"amount": 1e-100000000}', b'{"amount": 1e10000000}', b'{"amount": -1e27}',
+                         b'{"amount": "1000000000000000000000000000$"}', b'{"amount": 1000000000000000000000000000}',
+                         b'{"amounts": [1e-100000000, 1e10000000, 1]}', b'{"amount": 12}'):
+                got.append(await asyncio.wait_for(_request(reader, writer, "POST", "/spell/bulk" if b"amounts" in body
+                                                           else "/spell", body), 3))
+            writer.close()
+            return [(status, data) for status, data, _ in got]
+
+        got = _run(test)
+        assert [400] * 5 == [status for status, _ in got[:5]]
+        assert (200, {"spelled": [None, None, "One dollar"], "invalid": 2}) == got[5]
+        assert (200, {"spelled": "Twelve dollars"}) == got[6]
+
+    def test_batcher_survives_errors(self):
+        class FailingSpeller(Speller):
+            def spell(self, number, /, *, report=None):
+                if number == 13: raise MemoryError
+                return super().spell(number, report=report)
+
+        async def test(service, port):
+            unlucky = await asyncio.wait_for(asyncio.gather(service.spell(13), service.spell(14),
+                                                            return_exceptions=True), 3)
+            return unlucky, await asyncio.wait_for(service.spell(1), 3)
+
+        (error, fourteen), one = _run(test, speller=FailingSpeller(power_names=POWER_NAMES, num_names=NUM_NAMES))
+        assert HTTPStatus.INTERNAL_SERVER_ERROR == error.status
+        assert "Fourteen dollars" == fourteen
+        assert "One dollar" == one
+
+    def test_connection_close(self):
+        async def test(service, port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            status, _, head = await _request(reader, writer, "GET", "/health", headers="Connection: close\r\n")
+            closed = await reader.read() == b""
+            writer.close()
+            return status, head, closed
+
+        status, head, closed = _run(test)
+        assert 200 == status
+        assert "Connection: close" in head
+        assert closed
+
+    def test_bad_arguments(self):
+        speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        with pytest.raises(TypeError): SpellService(speller=None)
+        with pytest.raises(ValueError): SpellService(speller=speller, max_queue=0)
+        with pytest.raises(TypeError): SpellService(speller=speller, max_batch=1.5)
+        with pytest.raises(ValueError): SpellService(speller=speller, batch_window=-1)
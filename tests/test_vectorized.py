@@ -0,0 +1,55 @@
+from random import randint
+import pytest
+from scripts.script import Currency, Speller
+from scripts.app import NUM_NAMES, POWER_NAMES
+
+np = pytest.importorskip("numpy")
+from scripts.vectorized import *
+
+
+class TestSpellArray:
+    @classmethod
+    def setup_class(cls):
+        cls.speller = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+
+    def test_cents(self):
+        cents = np.array([randint(-10 ** 15, 10 ** 15) for _ in range(5_000)] + [0, 1, -1, 100, -50], dtype=np.int64)
+        expected = [self.speller.spell_cents(int(c)) for c in cents]
+        assert expected == list(spell_array(cents, speller=self.speller, cents=True))
+
+    def test_float_dollars(self):
+        dollars = np.array([randint(-10 ** 9, 10 ** 9) / 10 ** randint(0, 4) for _ in range(5_000)]
+                           + [0.125, 0.135, 1.005, 2.675, -0.001, 499.999])
+        expected = self.speller.spell_many(dollars.tolist())
+        assert expected == list(spell_array(dollars, speller=self.speller))
+
+    def test_int_dollars_and_fallback(self):
+        dollars = np.array([0, 5, -1, 10 ** 18, -(2 ** 62), 2 ** 63 - 1], dtype=np.int64)
+        expected = self.speller.spell_many(dollars.tolist())
+        assert expected == list(spell_array(dollars, speller=self.speller))
+
+    def test_shape_and_chunks(self):
+        cents = np.arange(2 * CHUNK_ROWS + 3, dtype=np.int64).reshape(-1, 1)
+        got = spell_array(cents, speller=self.speller, cents=True)
+        assert cents.shape == got.shape
+        assert self.speller.spell_cents(CHUNK_ROWS + 1) == got[CHUNK_ROWS + 1, 0]
+
+    def test_speller_settings(self):
+        amounts = [1.5, -12, 1_000_001.01, 0]
+        spellers = (
+            Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, capitalize=False),
+            Speller(power_names={**POWER_NAMES, 6: "Million"}, num_names={**NUM_NAMES, 1: "One"}),
+            Speller(power_names=POWER_NAMES, num_names=NUM_NAMES, rounding="half_up"),
+            Speller(power_names=POWER_NAMES, num_names=NUM_NAMES,
+                    currency=Currency("EUR", "€", ("Euro", "Euros"), ("cent", "cents"))),
+            Speller(power_names=POWER_NAMES, num_names=NUM_NAMES,
+                    currency=Currency("JPY", "¥", ("yen", "yen"), ("", ""), digits=0)),
+        )
+        for speller in spellers:
+            assert speller.spell_many(amounts) == list(spell_array(amounts, speller=speller))
+
+    def test_bad_input(self):
+        with pytest.raises(TypeError): spell_array([1.5], speller=self.speller, cents=True)
+        with pytest.raises(TypeError): spell_array(["1"], speller=self.speller)
+        with pytest.raises(TypeError): spell_array([1], speller=None)
+        with pytest.raises(ValueError): spell_array([float("nan")], speller=self.speller)
@@ -0,0 +1,129 @@
+import os
+import threading
+from random import randint
+import pytest
+from scripts import vocab
+from scripts.vocab import *
+from scripts.script import Speller
+
+
+@pytest.fixture(autouse=True)
+def fresh_spellers():
+    # every test starts without the spellers compiled by the others
+    vocab._spellers.clear()
+    yield
+    vocab._spellers.clear()
+
+
+class TestPacks:
+    def test_default_same_as_names(self, tmp_path):
+        speller = get_speller(cache_dir=str(tmp_path))
+        expected = Speller(power_names=POWER_NAMES, num_names=NUM_NAMES)
+        for _ in range(1_000):
+            amount = randint(-10 ** 29, 10 ** 29) / 100
+            assert expected.spell(amount) == speller.spell(amount)
+
+    def test_predefined(self, tmp_path):
+        spell = {name: get_speller(name, cache_dir=str(tmp_path)).spell for name in PACKS}
+
+        assert "One hundred five dollars" == spell["en_US"](105)
+        assert "One hundred and five dollars" == spell["en_GB"](105)
+        assert "One hundred dollars" == spell["en_GB"](100)
+        assert "Two hundred and one thousand three hundred and twelve dollars" == spell["en_GB"](201_312)
+        assert "One hexillion dollars" == spell["en_US"](10 ** 21)
+        assert "One sextillion dollars" == spell["en_US_standard"](10 ** 21)
+        assert "Two septillion dollars" == spell["en_GB"](2 * 10 ** 24)
+        assert "One milliard dollars" == spell["en_GB_long"](10 ** 9)
+        assert "Three billion two milliard dollars" == spell["en_GB_long"](3 * 10 ** 12 + 2 * 10 ** 9)
+
+    def test_shared_speller(self, tmp_path):
+        first = get_speller("en_GB", cache_dir=str(tmp_path))
+        assert first is get_speller("en_GB", cache_dir=str(tmp_path))
+        assert first is not get_speller("en_GB", capitalize=False, cache_dir=str(tmp_path))
+        assert "one hundred and one dollars" == get_speller("en_GB", capitalize=False).spell(101)
+
+    def test_register_pack(self, tmp_path):
+        register_pack(VocabPack("test_upper", {key: name.upper() for key, name in NUM_NAMES.items()}, POWER_NAMES))
+        try:
+            assert "One dollar" == get_speller("test_upper", capitalize=True, cache_dir=str(tmp_path)).spell(1)
+            assert "ONE dollar" == get_speller("test_upper", capitalize=False, cache_dir=str(tmp_path)).spell(1)
+        finally:
+            del PACKS["test_upper"]
+
+    def test_bad_pack(self):
+        with pytest.raises(TypeError): register_pack(("en_XX", NUM_NAMES, POWER_NAMES))
+        with pytest.raises(ValueError): register_pack(VocabPack("", NUM_NAMES, POWER_NAMES))
+        with pytest.raises(ValueError): register_pack(VocabPack("en_XX", {1: "one"}, POWER_NAMES))
+        with pytest.raises(TypeError): register_pack(VocabPack("en_XX", NUM_NAMES, POWER_NAMES, hundred_and=1))
+        assert "en_XX" not in PACKS
+
+    def test_bad_arguments(self, tmp_path):
+        with pytest.raises(ValueError): get_speller("xx_XX", cache_dir=str(tmp_path))
+        with pytest.raises(TypeError): get_speller("en_US", capitalize="yes", cache_dir=str(tmp_path))
+        with pytest.raises(ValueError): get_speller("en_US", rounding="up", cache_dir=str(tmp_path))
+
+
+class TestDiskCache:
+    def test_saved_and_loaded(self, tmp_path):
+        compiled = get_speller("en_GB", cache_dir=str(tmp_path))
+        files = os.listdir(tmp_path)
+        assert 1 == len(files) and files[0].startswith("en_GB-")
+
+        vocab._spellers.clear()
+        loaded = get_speller("en_GB", cache_dir=str(tmp_path))
+        assert loaded is not compiled
+        assert compiled.triplets == loaded.triplets
+        assert compiled.spell(123_456.78) == loaded.spell(123_456.78)
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        get_speller("en_US", cache_dir=str(tmp_path))
+        (path,) = tmp_path.iterdir()
+        path.write_bytes(b"not a pickle")
+
+        vocab._spellers.clear()
+        assert "One dollar" == get_speller("en_US", cache_dir=str(tmp_path)).spell(1)
+
+    def test_unwritable_dir(self, tmp_path):
+        # a file where the directory should be
+        blocked = tmp_path / "blocked"
+        blocked.write_text("")
+        assert "One dollar" == get_speller("en_US", cache_dir=str(blocked / "cache")).spell(1)
+
+    def test_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("MONEY_SPELLER_CACHE", str(tmp_path))
+        assert str(tmp_path) == default_cache_dir()
+        get_speller("en_US")
+        assert 1 == len(os.listdir(tmp_path))
+
+
+
+class TestThreads:
+    def test_compiled_once(self, tmp_path):
+        got = []
+        barrier = threading.Barrier(8)
+
+        def _get():
+            barrier.wait()
+            got.append(get_speller("en_GB", cache_dir=str(tmp_path)))
+
+        workers = [threading.Thread(target=_get) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert 8 == len(got)
+        assert all(speller is got[0] for speller in got)
+
+    def test_frozen_pack(self):
+        names = dict(NUM_NAMES)
+        register_pack(VocabPack("test_frozen", names, POWER_NAMES))
+        names[1] = "uno"
+        try:
+            assert "one" == PACKS["test_frozen"].num_names[1]
+            with pytest.raises(TypeError): PACKS["test_frozen"].num_names[1] = "uno"
+            # a registered pack can be registered again under a new name
+            register_pack(PACKS["test_frozen"]._replace(name="test_frozen_copy"))
+        finally:
+            PACKS.pop("test_frozen", None)
+            PACKS.pop("test_frozen_copy", None)